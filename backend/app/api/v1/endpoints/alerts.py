@@ -1,49 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime
 import structlog
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import keyset_paginate, keyset_page
 from app.core.security import get_current_active_user, require_roles
 from app.models.user import User
 from app.models.alert import Alert
-from app.schemas.alert import Alert as AlertSchema, AlertCreate, AlertUpdate
+from app.schemas.alert import Alert as AlertSchema, AlertCreate, AlertUpdate, AlertBulkResolve, AlertBulkResolveResult
+from app.services.open_alerts import open_alert_index
+from app.services.realtime import realtime_publisher
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 @router.get("/", response_model=List[AlertSchema])
 async def read_alerts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     severity: Optional[str] = None,
     is_resolved: Optional[bool] = None,
     silo_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Retrieve alerts with optional filtering
+    Retrieve alerts with optional filtering, newest first.
+    Pass the X-Next-Cursor response header back as cursor for the next page.
     """
-    query = db.query(Alert)
+    query = select(Alert)
     
     if severity:
-        query = query.filter(Alert.severity == severity)
+        query = query.where(Alert.severity == severity)
     if is_resolved is not None:
-        query = query.filter(Alert.is_resolved == is_resolved)
+        query = query.where(Alert.is_resolved == is_resolved)
     if silo_id:
-        query = query.filter(Alert.silo_id == silo_id)
+        query = query.where(Alert.silo_id == silo_id)
     
-    alerts = query.order_by(desc(Alert.created_at)).offset(skip).limit(limit).all()
+    result = await db.execute(
+        keyset_paginate(query, Alert.created_at, Alert.id, cursor, limit, skip)
+    )
+    alerts = result.scalars().all()
     
-    return alerts
+    return keyset_page(alerts, limit, "created_at", response)
+
+async def _commit_alert(db: AsyncSession):
+    """Commit an alert write; a second open alert for the same key is a conflict"""
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="An open alert with this silo, type and severity already exists"
+        )
 
 @router.post("/", response_model=AlertSchema)
 async def create_alert(
     alert: AlertCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -51,8 +72,10 @@ async def create_alert(
     """
     db_alert = Alert(**alert.model_dump())
     db.add(db_alert)
-    db.commit()
-    db.refresh(db_alert)
+    await _commit_alert(db)
+    await db.refresh(db_alert)
+    open_alert_index.invalidate()
+    realtime_publisher.alerts_changed([AlertSchema.model_validate(db_alert).model_dump()])
     
     logger.info("Alert created", 
                 alert_id=str(db_alert.id),
@@ -63,16 +86,66 @@ async def create_alert(
     
     return db_alert
 
+@router.post("/resolve", response_model=AlertBulkResolveResult)
+async def resolve_alerts(
+    criteria: AlertBulkResolve,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Resolve many alerts at once, by ids and/or filters (silo, type, severity,
+    created before). Matching open alerts are resolved with a single UPDATE
+    and announced in the next alerts_resolved WebSocket frame.
+    """
+    conditions = [Alert.is_resolved == False]
+    if criteria.ids is not None:
+        if not criteria.ids:
+            return AlertBulkResolveResult(resolved=0, alert_ids=[])
+        conditions.append(Alert.id.in_(criteria.ids))
+    if criteria.silo_id is not None:
+        conditions.append(Alert.silo_id == criteria.silo_id)
+    if criteria.alert_type:
+        conditions.append(Alert.alert_type == criteria.alert_type)
+    if criteria.severity:
+        conditions.append(Alert.severity == criteria.severity)
+    if criteria.created_before:
+        conditions.append(Alert.created_at < criteria.created_before)
+    
+    if len(conditions) == 1:
+        raise HTTPException(status_code=400, detail="Provide alert ids or at least one filter")
+    
+    result = await db.execute(
+        update(Alert).where(and_(*conditions)).values(
+            is_resolved=True,
+            resolved_at=func.now(),
+            resolved_by=current_user.id
+        ).returning(Alert.id, Alert.silo_id, Alert.severity, Alert.resolved_at)
+    )
+    resolved = result.all()
+    await db.commit()
+    
+    alert_ids = [row.id for row in resolved]
+    resolved_at = resolved[0].resolved_at if resolved else None
+    if alert_ids:
+        open_alert_index.discard_ids(alert_ids)
+        realtime_publisher.alerts_resolved([(row.id, row.silo_id, row.severity) for row in resolved])
+    
+    logger.info("Alerts resolved in bulk",
+                resolved=len(alert_ids),
+                resolved_by=str(current_user.id))
+    
+    return AlertBulkResolveResult(resolved=len(alert_ids), alert_ids=alert_ids, resolved_at=resolved_at)
+
 @router.get("/{alert_id}", response_model=AlertSchema)
 async def read_alert(
     alert_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get alert by ID
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
@@ -82,13 +155,13 @@ async def read_alert(
 async def update_alert(
     alert_id: str,
     alert_update: AlertUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Update alert
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
@@ -96,8 +169,10 @@ async def update_alert(
     for field, value in update_data.items():
         setattr(alert, field, value)
     
-    db.commit()
-    db.refresh(alert)
+    await _commit_alert(db)
+    await db.refresh(alert)
+    open_alert_index.invalidate()
+    realtime_publisher.alerts_changed([AlertSchema.model_validate(alert).model_dump()])
     
     logger.info("Alert updated", alert_id=alert_id, updated_by=str(current_user.id))
     
@@ -106,13 +181,13 @@ async def update_alert(
 @router.post("/{alert_id}/resolve")
 async def resolve_alert(
     alert_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Mark alert as resolved
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
@@ -123,8 +198,10 @@ async def resolve_alert(
     alert.resolved_at = datetime.utcnow()
     alert.resolved_by = current_user.id
     
-    db.commit()
-    db.refresh(alert)
+    await db.commit()
+    await db.refresh(alert)
+    open_alert_index.discard_ids([alert.id])
+    realtime_publisher.alerts_resolved([(alert.id, alert.silo_id, alert.severity)])
     
     logger.info("Alert resolved", alert_id=alert_id, resolved_by=str(current_user.id))
     
@@ -133,18 +210,19 @@ async def resolve_alert(
 @router.delete("/{alert_id}")
 async def delete_alert(
     alert_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin"]))
 ):
     """
     Delete alert (admin only)
     """
-    alert = db.query(Alert).filter(Alert.id == alert_id).first()
+    alert = await db.get(Alert, alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    db.delete(alert)
-    db.commit()
+    await db.delete(alert)
+    await db.commit()
+    open_alert_index.discard_ids([alert.id])
     
     logger.info("Alert deleted", alert_id=alert_id, deleted_by=str(current_user.id))
     
@@ -153,20 +231,25 @@ async def delete_alert(
 @router.get("/silo/{silo_id}", response_model=List[AlertSchema])
 async def read_silo_alerts(
     silo_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     is_resolved: Optional[bool] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get all alerts for a specific silo
+    Get all alerts for a specific silo, newest first (cursor paginated)
     """
-    query = db.query(Alert).filter(Alert.silo_id == silo_id)
+    query = select(Alert).where(Alert.silo_id == silo_id)
     
     if is_resolved is not None:
-        query = query.filter(Alert.is_resolved == is_resolved)
+        query = query.where(Alert.is_resolved == is_resolved)
     
-    alerts = query.order_by(desc(Alert.created_at)).offset(skip).limit(limit).all()
+    result = await db.execute(
+        keyset_paginate(query, Alert.created_at, Alert.id, cursor, limit, skip)
+    )
+    alerts = result.scalars().all()
     
-    return alerts 
\ No newline at end of file
+    return keyset_page(alerts, limit, "created_at", response) 
\ No newline at end of file
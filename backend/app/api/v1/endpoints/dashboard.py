@@ -1,142 +1,111 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, desc, and_, select
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 import structlog
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.negotiation import JSON, negotiate_format, columnar_response
 from app.core.security import get_current_active_user
 from app.models.user import User
-from app.models.silo import Silo, SiloReading
+from app.models.silo import Silo, SiloReadingRollup, SiloLatestReading
 from app.models.alert import Alert
 from app.models.logistics import Logistics
+from app.services.silo_registry import silo_registry
+from app.services.reading_rollups import bucket_start, rollup_stats_columns
+from app.services.kpi_snapshot import kpi_snapshot
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 @router.get("/kpis")
 async def get_dashboard_kpis(
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Dict[str, Any]:
     """
-    Get key performance indicators for the dashboard
+    Get key performance indicators for the dashboard (shared snapshot)
     """
-    now = datetime.utcnow()
-    yesterday = now - timedelta(days=1)
-    week_ago = now - timedelta(days=7)
-    
-    # Total silos
-    total_silos = db.query(func.count(Silo.id)).scalar()
-    active_silos = db.query(func.count(Silo.id)).filter(Silo.status == 'active').scalar()
-    
-    # Total capacity and current volume
-    total_capacity = db.query(func.sum(Silo.capacity_tons)).scalar() or 0
-    
-    # Current volume from latest readings
-    latest_readings_subquery = db.query(
-        SiloReading.silo_id,
-        func.max(SiloReading.timestamp).label('latest_timestamp')
-    ).group_by(SiloReading.silo_id).subquery()
-    
-    current_volume = db.query(func.sum(SiloReading.volume_tons)).join(
-        latest_readings_subquery,
-        and_(
-            SiloReading.silo_id == latest_readings_subquery.c.silo_id,
-            SiloReading.timestamp == latest_readings_subquery.c.latest_timestamp
-        )
-    ).scalar() or 0
-    
-    # Average temperature and humidity from last 24 hours
-    recent_stats = db.query(
-        func.avg(SiloReading.temperature).label('avg_temperature'),
-        func.avg(SiloReading.humidity).label('avg_humidity'),
-        func.count(SiloReading.id).label('total_readings')
-    ).filter(SiloReading.timestamp >= yesterday).first()
-    
-    # Active alerts
-    active_alerts = db.query(func.count(Alert.id)).filter(Alert.is_resolved == False).scalar()
-    critical_alerts = db.query(func.count(Alert.id)).filter(
-        and_(Alert.is_resolved == False, Alert.severity == 'critical')
-    ).scalar()
-    
-    # Logistics statistics
-    total_logistics = db.query(func.count(Logistics.id)).scalar()
-    in_transit = db.query(func.count(Logistics.id)).filter(Logistics.status == 'in_transit').scalar()
-    delivered_today = db.query(func.count(Logistics.id)).filter(
-        and_(
-            Logistics.status == 'delivered',
-            Logistics.actual_arrival >= yesterday
-        )
-    ).scalar()
-    
-    # Recent alerts (last 7 days)
-    recent_alerts = db.query(func.count(Alert.id)).filter(Alert.created_at >= week_ago).scalar()
+    snapshot, age = await kpi_snapshot.get()
     
     return {
-        "silos": {
-            "total": total_silos,
-            "active": active_silos,
-            "capacity_utilization": round((current_volume / total_capacity * 100), 2) if total_capacity > 0 else 0,
-            "total_capacity_tons": float(total_capacity),
-            "current_volume_tons": float(current_volume)
-        },
-        "readings": {
-            "average_temperature": round(float(recent_stats.avg_temperature), 2) if recent_stats.avg_temperature else 0,
-            "average_humidity": round(float(recent_stats.avg_humidity), 2) if recent_stats.avg_humidity else 0,
-            "total_readings_24h": recent_stats.total_readings or 0
-        },
-        "alerts": {
-            "active": active_alerts,
-            "critical": critical_alerts,
-            "recent_7_days": recent_alerts
-        },
-        "logistics": {
-            "total": total_logistics,
-            "in_transit": in_transit,
-            "delivered_today": delivered_today
-        },
-        "timestamp": now.isoformat()
+        **snapshot,
+        "snapshot_age_seconds": round(age, 3)
     }
 
+def _trend_columns(daily_trends, daily_alerts) -> Dict[str, List[Any]]:
+    """Reading and alert trends outer-joined on date, one list per field"""
+    trends_by_date = {trend.date: trend for trend in daily_trends}
+    alerts_by_date = {alert.date: alert for alert in daily_alerts}
+    dates = sorted(trends_by_date.keys() | alerts_by_date.keys())
+    
+    columns = {field: [] for field in (
+        "date", "temperature", "humidity", "volume_percent", "total_alerts", "critical_alerts"
+    )}
+    for day in dates:
+        trend = trends_by_date.get(day)
+        alert = alerts_by_date.get(day)
+        columns["date"].append(day)
+        columns["temperature"].append(round(float(trend.avg_temperature), 2) if trend else None)
+        columns["humidity"].append(round(float(trend.avg_humidity), 2) if trend else None)
+        columns["volume_percent"].append(round(float(trend.avg_volume_percent), 2) if trend else None)
+        columns["total_alerts"].append(alert.alert_count if alert else 0)
+        columns["critical_alerts"].append((alert.critical_count or 0) if alert else 0)
+    
+    return columns
+
 @router.get("/trends")
 async def get_dashboard_trends(
+    request: Request,
     days: int = 7,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Dict[str, Any]:
     """
-    Get trend data for charts
+    Get trend data for charts.
+    Columnar formats (via Accept) return both series merged into one table by date.
     """
+    media_type = negotiate_format(request)
     start_date = datetime.utcnow() - timedelta(days=days)
     
-    # Daily temperature and humidity trends
-    daily_trends = db.query(
-        func.date(SiloReading.timestamp).label('date'),
-        func.avg(SiloReading.temperature).label('avg_temperature'),
-        func.avg(SiloReading.humidity).label('avg_humidity'),
-        func.avg(SiloReading.volume_percent).label('avg_volume_percent')
-    ).filter(
-        SiloReading.timestamp >= start_date
-    ).group_by(
-        func.date(SiloReading.timestamp)
-    ).order_by(
-        func.date(SiloReading.timestamp)
-    ).all()
+    # Daily temperature and humidity trends (daily rollups)
+    daily_trends = (await db.execute(
+        select(
+            func.date(SiloReadingRollup.bucket_start).label('date'),
+            *rollup_stats_columns()
+        ).where(
+            and_(
+                SiloReadingRollup.resolution == "day",
+                SiloReadingRollup.bucket_start >= bucket_start(start_date, "day")
+            )
+        ).group_by(
+            SiloReadingRollup.bucket_start
+        ).order_by(
+            SiloReadingRollup.bucket_start
+        )
+    )).all()
     
     # Daily alert counts
-    daily_alerts = db.query(
-        func.date(Alert.created_at).label('date'),
-        func.count(Alert.id).label('alert_count'),
-        func.count(func.nullif(Alert.severity == 'critical', False)).label('critical_count')
-    ).filter(
-        Alert.created_at >= start_date
-    ).group_by(
-        func.date(Alert.created_at)
-    ).order_by(
-        func.date(Alert.created_at)
-    ).all()
+    daily_alerts = (await db.execute(
+        select(
+            func.date(Alert.created_at).label('date'),
+            func.count(Alert.id).label('alert_count'),
+            func.count(func.nullif(Alert.severity == 'critical', False)).label('critical_count')
+        ).where(
+            Alert.created_at >= start_date
+        ).group_by(
+            func.date(Alert.created_at)
+        ).order_by(
+            func.date(Alert.created_at)
+        )
+    )).all()
+    
+    if media_type != JSON:
+        return columnar_response(
+            _trend_columns(daily_trends, daily_alerts),
+            media_type,
+            metadata={"period_days": days}
+        )
     
     # Format trends data
     temperature_trend = [
@@ -166,28 +135,44 @@ async def get_dashboard_trends(
 
 @router.get("/silo-status")
 async def get_silo_status_summary(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ) -> List[Dict[str, Any]]:
     """
     Get status summary for all silos
     """
-    silos = db.query(Silo).filter(Silo.status == 'active').all()
+    silos = await silo_registry.active(db)
+    if not silos:
+        return []
+    
+    # Unresolved alert counts per silo, split by severity
+    alert_counts = select(
+        Alert.silo_id,
+        func.count(Alert.id).label('active_alerts'),
+        func.count(Alert.id).filter(Alert.severity == 'critical').label('critical_alerts')
+    ).where(Alert.is_resolved == False).group_by(Alert.silo_id).subquery()
+    
+    # Latest reading and alert counts for every active silo in one query
+    silo_states = await db.execute(
+        select(
+            Silo.id.label('silo_id'),
+            SiloLatestReading,
+            func.coalesce(alert_counts.c.active_alerts, 0).label('active_alerts'),
+            func.coalesce(alert_counts.c.critical_alerts, 0).label('critical_alerts')
+        ).select_from(Silo).outerjoin(
+            SiloLatestReading, SiloLatestReading.silo_id == Silo.id
+        ).outerjoin(
+            alert_counts, alert_counts.c.silo_id == Silo.id
+        ).where(Silo.id.in_([silo.id for silo in silos]))
+    )
+    state_by_silo = {state.silo_id: state for state in silo_states}
     
     result = []
     for silo in silos:
-        # Get latest reading
-        latest_reading = db.query(SiloReading).filter(
-            SiloReading.silo_id == silo.id
-        ).order_by(desc(SiloReading.timestamp)).first()
-        
-        # Get active alerts count
-        active_alerts_count = db.query(func.count(Alert.id)).filter(
-            and_(
-                Alert.silo_id == silo.id,
-                Alert.is_resolved == False
-            )
-        ).scalar()
+        state = state_by_silo.get(silo.id)
+        latest_reading = state.SiloLatestReading if state else None
+        active_alerts_count = state.active_alerts if state else 0
+        critical_alerts = state.critical_alerts if state else 0
         
         # Determine status based on thresholds
         status = "normal"
@@ -196,14 +181,6 @@ async def get_silo_status_summary(
                 latest_reading.humidity > silo.max_humidity):
                 status = "warning"
             if active_alerts_count > 0:
-                # Check if any critical alerts
-                critical_alerts = db.query(func.count(Alert.id)).filter(
-                    and_(
-                        Alert.silo_id == silo.id,
-                        Alert.is_resolved == False,
-                        Alert.severity == 'critical'
-                    )
-                ).scalar()
                 if critical_alerts > 0:
                     status = "critical"
                 elif status != "critical":
@@ -228,17 +205,21 @@ async def get_silo_status_summary(
 @router.get("/recent-activity")
 async def get_recent_activity(
     limit: int = 20,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Get recent system activity
     """
     # Recent alerts
-    recent_alerts = db.query(Alert).order_by(desc(Alert.created_at)).limit(limit).all()
+    recent_alerts = (await db.execute(
+        select(Alert).order_by(desc(Alert.created_at)).limit(limit)
+    )).scalars().all()
     
     # Recent logistics updates
-    recent_logistics = db.query(Logistics).order_by(desc(Logistics.updated_at)).limit(limit).all()
+    recent_logistics = (await db.execute(
+        select(Logistics).order_by(desc(Logistics.updated_at)).limit(limit)
+    )).scalars().all()
     
     # Format activity data
     alerts_activity = [
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
 from typing import List, Optional
 from datetime import datetime
 import structlog
 
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.pagination import keyset_paginate, keyset_page
+from app.core.negotiation import JSON, negotiate_format, rows_to_columns, columnar_response
 from app.core.security import get_current_active_user, require_roles
 from app.models.user import User
 from app.models.logistics import Logistics, LogisticsTracking
@@ -17,34 +19,41 @@ from app.schemas.logistics import (
     LogisticsTrackingCreate,
     LogisticsWithTracking
 )
+from app.services.realtime import realtime_publisher
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Field order of the columnar tracking formats
+TRACKING_FIELDS = ("id", "logistics_id", "latitude", "longitude", "speed", "heading", "timestamp")
+
 @router.get("/", response_model=List[LogisticsWithTracking])
 async def read_logistics(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Retrieve logistics entries with tracking data
     """
-    query = db.query(Logistics)
+    query = select(Logistics)
     
     if status:
-        query = query.filter(Logistics.status == status)
+        query = query.where(Logistics.status == status)
     
-    logistics_entries = query.order_by(desc(Logistics.created_at)).offset(skip).limit(limit).all()
+    result = await db.execute(query.order_by(desc(Logistics.created_at)).offset(skip).limit(limit))
+    logistics_entries = result.scalars().all()
     
     result = []
     for logistics in logistics_entries:
         # Get all tracking data
-        tracking_data = db.query(LogisticsTracking).filter(
-            LogisticsTracking.logistics_id == logistics.id
-        ).order_by(desc(LogisticsTracking.timestamp)).all()
+        tracking_data = (await db.execute(
+            select(LogisticsTracking).where(
+                LogisticsTracking.logistics_id == logistics.id
+            ).order_by(desc(LogisticsTracking.timestamp))
+        )).scalars().all()
         
         # Get latest tracking
         latest_tracking = tracking_data[0] if tracking_data else None
@@ -62,7 +71,7 @@ async def read_logistics(
 @router.post("/", response_model=LogisticsSchema)
 async def create_logistics(
     logistics: LogisticsCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin", "logistics"]))
 ):
     """
@@ -70,8 +79,8 @@ async def create_logistics(
     """
     db_logistics = Logistics(**logistics.model_dump())
     db.add(db_logistics)
-    db.commit()
-    db.refresh(db_logistics)
+    await db.commit()
+    await db.refresh(db_logistics)
     
     logger.info("Logistics entry created", 
                 logistics_id=str(db_logistics.id),
@@ -84,20 +93,22 @@ async def create_logistics(
 @router.get("/{logistics_id}", response_model=LogisticsWithTracking)
 async def read_logistics_entry(
     logistics_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get logistics entry by ID with tracking data
     """
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
     # Get all tracking data
-    tracking_data = db.query(LogisticsTracking).filter(
-        LogisticsTracking.logistics_id == logistics_id
-    ).order_by(desc(LogisticsTracking.timestamp)).all()
+    tracking_data = (await db.execute(
+        select(LogisticsTracking).where(
+            LogisticsTracking.logistics_id == logistics_id
+        ).order_by(desc(LogisticsTracking.timestamp))
+    )).scalars().all()
     
     # Get latest tracking
     latest_tracking = tracking_data[0] if tracking_data else None
@@ -114,13 +125,13 @@ async def read_logistics_entry(
 async def update_logistics(
     logistics_id: str,
     logistics_update: LogisticsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin", "logistics"]))
 ):
     """
     Update logistics entry
     """
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
@@ -128,8 +139,9 @@ async def update_logistics(
     for field, value in update_data.items():
         setattr(logistics, field, value)
     
-    db.commit()
-    db.refresh(logistics)
+    await db.commit()
+    await db.refresh(logistics)
+    realtime_publisher.logistics_changed(logistics.id, update_data)
     
     logger.info("Logistics entry updated", logistics_id=logistics_id, updated_by=str(current_user.id))
     
@@ -138,18 +150,18 @@ async def update_logistics(
 @router.delete("/{logistics_id}")
 async def delete_logistics(
     logistics_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin"]))
 ):
     """
     Delete logistics entry (admin only)
     """
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
-    db.delete(logistics)
-    db.commit()
+    await db.delete(logistics)
+    await db.commit()
     
     logger.info("Logistics entry deleted", logistics_id=logistics_id, deleted_by=str(current_user.id))
     
@@ -159,14 +171,14 @@ async def delete_logistics(
 async def create_tracking_update(
     logistics_id: str,
     tracking: LogisticsTrackingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Add tracking update for logistics entry
     """
     # Verify logistics entry exists
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
@@ -176,8 +188,14 @@ async def create_tracking_update(
     )
     
     db.add(db_tracking)
-    db.commit()
-    db.refresh(db_tracking)
+    await db.commit()
+    await db.refresh(db_tracking)
+    realtime_publisher.logistics_changed(logistics.id, {
+        "position": {
+            **tracking.model_dump(),
+            "timestamp": db_tracking.timestamp
+        }
+    })
     
     logger.info("Tracking update created", 
                 logistics_id=logistics_id,
@@ -189,30 +207,51 @@ async def create_tracking_update(
 @router.get("/{logistics_id}/tracking", response_model=List[LogisticsTrackingSchema])
 async def read_tracking_updates(
     logistics_id: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get tracking updates for logistics entry
+    Get tracking updates for logistics entry, newest first (cursor paginated).
+    Columnar JSON, MessagePack and Arrow are served on request via Accept.
     """
+    media_type = negotiate_format(request)
+    
     # Verify logistics entry exists
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
-    tracking_updates = db.query(LogisticsTracking).filter(
-        LogisticsTracking.logistics_id == logistics_id
-    ).order_by(desc(LogisticsTracking.timestamp)).offset(skip).limit(limit).all()
+    if media_type == JSON:
+        query = select(LogisticsTracking)
+    else:
+        query = select(*[LogisticsTracking.__table__.c[field] for field in TRACKING_FIELDS])
+    query = query.where(LogisticsTracking.logistics_id == logistics_id)
     
-    return tracking_updates
+    result = await db.execute(
+        keyset_paginate(query, LogisticsTracking.timestamp, LogisticsTracking.id, cursor, limit, skip)
+    )
+    
+    if media_type == JSON:
+        return keyset_page(result.scalars().all(), limit, "timestamp", response)
+    
+    tracking_updates = keyset_page(result.all(), limit, "timestamp", response)
+    return columnar_response(
+        rows_to_columns(tracking_updates, TRACKING_FIELDS),
+        media_type,
+        metadata={"logistics_id": logistics_id},
+        headers=response.headers
+    )
 
 @router.put("/{logistics_id}/status")
 async def update_logistics_status(
     logistics_id: str,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin", "logistics"]))
 ):
     """
@@ -224,7 +263,7 @@ async def update_logistics_status(
             detail="Invalid status. Must be one of: pending, in_transit, delivered, cancelled"
         )
     
-    logistics = db.query(Logistics).filter(Logistics.id == logistics_id).first()
+    logistics = await db.get(Logistics, logistics_id)
     if not logistics:
         raise HTTPException(status_code=404, detail="Logistics entry not found")
     
@@ -234,8 +273,12 @@ async def update_logistics_status(
     if status == "delivered":
         logistics.actual_arrival = datetime.utcnow()
     
-    db.commit()
-    db.refresh(logistics)
+    await db.commit()
+    await db.refresh(logistics)
+    realtime_publisher.logistics_changed(logistics.id, {
+        "status": logistics.status,
+        "actual_arrival": logistics.actual_arrival
+    })
     
     logger.info("Logistics status updated", 
                 logistics_id=logistics_id,
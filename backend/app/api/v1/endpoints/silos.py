@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 from typing import List, Optional
+from collections import namedtuple
+from dataclasses import asdict
 from datetime import datetime, timedelta
 import structlog
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.pagination import keyset_paginate, keyset_page
+from app.core.negotiation import JSON, negotiate_format, rows_to_columns, columnar_response
 from app.core.security import get_current_active_user, require_roles
 from app.models.user import User
-from app.models.silo import Silo, SiloReading
+from app.models.silo import Silo, SiloReading, SiloReadingRollup, SiloLatestReading
 from app.schemas.silo import (
     Silo as SiloSchema, 
     SiloCreate, 
@@ -16,67 +22,126 @@ from app.schemas.silo import (
     SiloReading as SiloReadingSchema,
     SiloReadingCreate,
     SiloReadingInput,
+    SiloReadingBatch,
+    SiloReadingBatchResult,
+    SiloReadingAccepted,
     SiloWithLatestReading
 )
+from app.services.reading_ingest import (
+    prepare_reading_batch,
+    insert_readings,
+    build_reading_row,
+    update_reading_aggregates
+)
+from app.services.ingest_buffer import ingest_buffer
+from app.services.silo_registry import SiloInfo, silo_registry
+from app.services.recent_readings import recent_readings
+from app.services.reading_rollups import as_utc, bucket_start, rollup_stats_columns
+from app.services.downsampling import (
+    bucket_width,
+    envelope_series,
+    lttb_series,
+    envelope_from_samples,
+    lttb_from_samples
+)
+from app.services.mqtt_ingest import mqtt_ingest_worker
+from app.services.reading_export import EXPORT_FORMATS, export_readings
+from app.services.archive import ARCHIVE_FIELDS, reading_archive
+from app.services.realtime import realtime_publisher
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Field order of the columnar readings formats
+READING_FIELDS = ARCHIVE_FIELDS
+ArchivedReading = namedtuple("ArchivedReading", READING_FIELDS)
+
+async def _silos_with_latest_reading(db: AsyncSession, query) -> List[dict]:
+    """
+    Run a Silo select and attach each silo's latest reading and 24 h stats.
+    Costs two queries however many silos the select returns.
+    """
+    result = await db.execute(
+        query.add_columns(SiloLatestReading).outerjoin(
+            SiloLatestReading, SiloLatestReading.silo_id == Silo.id
+        )
+    )
+    rows = result.all()
+    if not rows:
+        return []
+    
+    # Get aggregated data from last 24 hours (hourly rollups), grouped per silo
+    since = bucket_start(datetime.utcnow() - timedelta(days=1), "hour")
+    stats_result = await db.execute(
+        select(SiloReadingRollup.silo_id, *rollup_stats_columns()).where(
+            and_(
+                SiloReadingRollup.silo_id.in_([silo.id for silo, _ in rows]),
+                SiloReadingRollup.resolution == "hour",
+                SiloReadingRollup.bucket_start >= since
+            )
+        ).group_by(SiloReadingRollup.silo_id)
+    )
+    stats_by_silo = {stats.silo_id: stats for stats in stats_result}
+    
+    silos = []
+    for silo, latest_reading in rows:
+        stats = stats_by_silo.get(silo.id)
+        silos.append({
+            **silo.__dict__,
+            "latest_reading": latest_reading,
+            "readings_count": stats.readings_count if stats else 0,
+            "average_temperature": stats.avg_temperature if stats else None,
+            "average_humidity": stats.avg_humidity if stats else None,
+            "current_volume_tons": latest_reading.volume_tons if latest_reading else None
+        })
+    
+    return silos
+
+def _silos_from_recent_readings(silos: List[SiloInfo]) -> List[dict]:
+    """Same payload as _silos_with_latest_reading, served from memory"""
+    result = []
+    for silo in silos:
+        latest_reading = recent_readings.latest(silo.id)
+        readings_count, average_temperature, average_humidity = recent_readings.stats_24h(silo.id)
+        result.append({
+            **asdict(silo),
+            "latest_reading": latest_reading,
+            "readings_count": readings_count,
+            "average_temperature": average_temperature,
+            "average_humidity": average_humidity,
+            "current_volume_tons": latest_reading["volume_tons"] if latest_reading else None
+        })
+    
+    return result
+
 @router.get("/", response_model=List[SiloWithLatestReading])
 async def read_silos(
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Retrieve silos with latest readings
     """
-    query = db.query(Silo)
+    if recent_readings.ready:
+        silos = await silo_registry.all(db)
+        if status:
+            silos = [silo for silo in silos if silo.status == status]
+        return _silos_from_recent_readings(silos[skip:skip + limit])
     
-    if status:
-        query = query.filter(Silo.status == status)
+    query = select(Silo)
     
-    silos = query.offset(skip).limit(limit).all()
-    
-    result = []
-    for silo in silos:
-        # Get latest reading
-        latest_reading = db.query(SiloReading).filter(
-            SiloReading.silo_id == silo.id
-        ).order_by(desc(SiloReading.timestamp)).first()
-        
-        # Get aggregated data from last 24 hours
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        stats = db.query(
-            func.count(SiloReading.id).label('readings_count'),
-            func.avg(SiloReading.temperature).label('avg_temperature'),
-            func.avg(SiloReading.humidity).label('avg_humidity')
-        ).filter(
-            and_(
-                SiloReading.silo_id == silo.id,
-                SiloReading.timestamp >= yesterday
-            )
-        ).first()
-        
-        silo_dict = {
-            **silo.__dict__,
-            "latest_reading": latest_reading,
-            "readings_count": stats.readings_count or 0,
-            "average_temperature": stats.avg_temperature,
-            "average_humidity": stats.avg_humidity,
-            "current_volume_tons": latest_reading.volume_tons if latest_reading else None
-        }
-        
-        result.append(silo_dict)
+    if status:
+        query = query.where(Silo.status == status)
     
-    return result
+    return await _silos_with_latest_reading(db, query.offset(skip).limit(limit))
 
 @router.post("/", response_model=SiloSchema)
 async def create_silo(
     silo: SiloCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin", "operator"]))
 ):
     """
@@ -84,8 +149,9 @@ async def create_silo(
     """
     db_silo = Silo(**silo.model_dump())
     db.add(db_silo)
-    db.commit()
-    db.refresh(db_silo)
+    await db.commit()
+    await db.refresh(db_silo)
+    silo_registry.invalidate()
     
     logger.info("Silo created", silo_id=db_silo.id, name=db_silo.name, created_by=str(current_user.id))
     
@@ -94,56 +160,33 @@ async def create_silo(
 @router.get("/{silo_id}", response_model=SiloWithLatestReading)
 async def read_silo(
     silo_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Get silo by ID with latest reading
     """
-    silo = db.query(Silo).filter(Silo.id == silo_id).first()
-    if not silo:
+    if recent_readings.ready:
+        silo = await silo_registry.get(db, silo_id)
+        silos = _silos_from_recent_readings([silo]) if silo else []
+    else:
+        silos = await _silos_with_latest_reading(db, select(Silo).where(Silo.id == silo_id))
+    if not silos:
         raise HTTPException(status_code=404, detail="Silo not found")
     
-    # Get latest reading
-    latest_reading = db.query(SiloReading).filter(
-        SiloReading.silo_id == silo_id
-    ).order_by(desc(SiloReading.timestamp)).first()
-    
-    # Get aggregated data from last 24 hours
-    yesterday = datetime.utcnow() - timedelta(days=1)
-    stats = db.query(
-        func.count(SiloReading.id).label('readings_count'),
-        func.avg(SiloReading.temperature).label('avg_temperature'),
-        func.avg(SiloReading.humidity).label('avg_humidity')
-    ).filter(
-        and_(
-            SiloReading.silo_id == silo_id,
-            SiloReading.timestamp >= yesterday
-        )
-    ).first()
-    
-    silo_dict = {
-        **silo.__dict__,
-        "latest_reading": latest_reading,
-        "readings_count": stats.readings_count or 0,
-        "average_temperature": stats.avg_temperature,
-        "average_humidity": stats.avg_humidity,
-        "current_volume_tons": latest_reading.volume_tons if latest_reading else None
-    }
-    
-    return silo_dict
+    return silos[0]
 
 @router.put("/{silo_id}", response_model=SiloSchema)
 async def update_silo(
     silo_id: int,
     silo_update: SiloUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin", "operator"]))
 ):
     """
     Update silo
     """
-    silo = db.query(Silo).filter(Silo.id == silo_id).first()
+    silo = await db.get(Silo, silo_id)
     if not silo:
         raise HTTPException(status_code=404, detail="Silo not found")
     
@@ -151,8 +194,10 @@ async def update_silo(
     for field, value in update_data.items():
         setattr(silo, field, value)
     
-    db.commit()
-    db.refresh(silo)
+    await db.commit()
+    await db.refresh(silo)
+    silo_registry.invalidate()
+    realtime_publisher.silo_changed(silo_id, update_data)
     
     logger.info("Silo updated", silo_id=silo_id, updated_by=str(current_user.id))
     
@@ -161,18 +206,19 @@ async def update_silo(
 @router.delete("/{silo_id}")
 async def delete_silo(
     silo_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_roles(["admin"]))
 ):
     """
     Delete silo (admin only)
     """
-    silo = db.query(Silo).filter(Silo.id == silo_id).first()
+    silo = await db.get(Silo, silo_id)
     if not silo:
         raise HTTPException(status_code=404, detail="Silo not found")
     
-    db.delete(silo)
-    db.commit()
+    await db.delete(silo)
+    await db.commit()
+    silo_registry.invalidate()
     
     logger.info("Silo deleted", silo_id=silo_id, deleted_by=str(current_user.id))
     
@@ -181,60 +227,148 @@ async def delete_silo(
 @router.get("/{silo_id}/readings", response_model=List[SiloReadingSchema])
 async def read_silo_readings(
     silo_id: int,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
-    Get silo readings with optional date filtering
+    Get silo readings with optional date filtering, newest first.
+    Pass the X-Next-Cursor response header back as cursor for the next page.
+    Columnar JSON, MessagePack and Arrow are served on request via Accept.
     """
+    media_type = negotiate_format(request)
+    
     # Verify silo exists
-    silo = db.query(Silo).filter(Silo.id == silo_id).first()
-    if not silo:
+    if not await silo_registry.get(db, silo_id):
         raise HTTPException(status_code=404, detail="Silo not found")
     
-    query = db.query(SiloReading).filter(SiloReading.silo_id == silo_id)
+    if media_type == JSON:
+        query = select(SiloReading)
+    else:
+        # Plain column rows, no ORM objects for the binary formats
+        query = select(*[SiloReading.__table__.c[field] for field in READING_FIELDS])
+    query = query.where(SiloReading.silo_id == silo_id)
     
     if start_date:
-        query = query.filter(SiloReading.timestamp >= start_date)
+        query = query.where(SiloReading.timestamp >= start_date)
     if end_date:
-        query = query.filter(SiloReading.timestamp <= end_date)
+        query = query.where(SiloReading.timestamp <= end_date)
+    
+    # Ranges reaching into the Parquet archive merge archived rows into the
+    # page, so a legacy offset is applied after the merge instead of in SQL
+    from_archive = reading_archive.covers(silo_id, start_date)
+    offset = 0 if cursor else skip
+    
+    result = await db.execute(
+        keyset_paginate(
+            query, SiloReading.timestamp, SiloReading.id, cursor,
+            limit + offset if from_archive else limit,
+            0 if from_archive else skip
+        )
+    )
+    readings = result.scalars().all() if media_type == JSON else result.all()
+    
+    if from_archive:
+        make_row = (lambda row: SiloReading(**row)) if media_type == JSON else (lambda row: ArchivedReading(**row))
+        readings = await reading_archive.merge_newest(
+            readings, silo_id, limit + offset + 1, start_date, end_date, cursor, make_row
+        )
+        readings = readings[offset:]
     
-    readings = query.order_by(desc(SiloReading.timestamp)).offset(skip).limit(limit).all()
+    readings = keyset_page(readings, limit, "timestamp", response)
+    if media_type == JSON:
+        return readings
     
-    return readings
+    return columnar_response(
+        rows_to_columns(readings, READING_FIELDS),
+        media_type,
+        metadata={"silo_id": silo_id},
+        headers=response.headers
+    )
+
+@router.get("/{silo_id}/readings/downsampled")
+async def read_silo_readings_downsampled(
+    silo_id: int,
+    metric: str = Query("temperature", pattern="^(temperature|humidity|volume_percent)$"),
+    method: str = Query("lttb", pattern="^(lttb|envelope)$"),
+    max_points: int = Query(1500, ge=3, le=10000),
+    bucket_seconds: Optional[int] = Query(None, ge=1),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get a chart-ready series of one metric, bounded to max_points whatever the range.
+    lttb returns shape-preserving (timestamp, value) points; envelope returns
+    min/max/avg per bucket (bucket_seconds, or sized to fit max_points).
+    The range defaults to the last 24 hours.
+    """
+    if not await silo_registry.get(db, silo_id):
+        raise HTTPException(status_code=404, detail="Silo not found")
+    
+    end = as_utc(end_date or datetime.utcnow())
+    start = as_utc(start_date) if start_date else end - timedelta(days=1)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    
+    # Short windows are usually held by the in-memory recent readings
+    samples = recent_readings.window(silo_id, metric, start, end)
+    
+    if method == "lttb":
+        bucket = None
+        if samples is not None:
+            points = lttb_from_samples(*samples, max_points)
+        else:
+            points = await lttb_series(db, silo_id, metric, start, end, max_points)
+    else:
+        # An explicit bucket may not exceed the point budget either
+        bucket = max(bucket_seconds or 0, bucket_width(start, end, max_points))
+        if samples is not None:
+            points = envelope_from_samples(*samples, bucket)
+        else:
+            bucket, points = await envelope_series(db, silo_id, metric, start, end, bucket)
+    
+    return {
+        "silo_id": silo_id,
+        "metric": metric,
+        "method": method,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "bucket_seconds": bucket,
+        "points": points
+    }
 
 @router.post("/{silo_id}/readings", response_model=SiloReadingSchema)
 async def create_silo_reading(
     silo_id: int,
     reading: SiloReadingInput,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Create new silo reading (typically called by IoT devices or simulators)
     """
     # Verify silo exists
-    silo = db.query(Silo).filter(Silo.id == silo_id).first()
+    silo = await silo_registry.get(db, silo_id)
     if not silo:
         raise HTTPException(status_code=404, detail="Silo not found")
     
     # Calculate volume in tons if not provided
-    reading_data = reading.model_dump()
-    if not reading_data.get('volume_tons') and silo.capacity_tons:
-        reading_data['volume_tons'] = (silo.capacity_tons * reading.volume_percent) / 100
+    reading_row = build_reading_row(silo_id, reading.model_dump(), silo.capacity_tons)
     
-    db_reading = SiloReading(
-        silo_id=silo_id,
-        **reading_data
-    )
+    db_reading = SiloReading(**reading_row)
     
     db.add(db_reading)
-    db.commit()
-    db.refresh(db_reading)
+    await update_reading_aggregates(db, [reading_row])
+    await db.commit()
+    await db.refresh(db_reading)
     
     logger.info("Silo reading created", 
                 silo_id=silo_id, 
@@ -242,4 +376,150 @@ async def create_silo_reading(
                 humidity=float(reading.humidity),
                 volume_percent=float(reading.volume_percent))
     
-    return db_reading 
\ No newline at end of file
+    return db_reading 
+
+@router.post("/readings/bulk", response_model=SiloReadingBatchResult)
+async def create_silo_readings_bulk(
+    batch: SiloReadingBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Create readings for many silos in one request (gateways and batch uploads).
+    Valid items are written in a single transaction; invalid ones are reported per index.
+    """
+    if len(batch.readings) > settings.READINGS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large. Maximum is {settings.READINGS_BATCH_MAX_SIZE} readings"
+        )
+    
+    rows, errors = await prepare_reading_batch(db, batch.readings)
+    
+    accepted = await insert_readings(db, rows)
+    await db.commit()
+    
+    logger.info("Silo readings batch created",
+                accepted=accepted,
+                rejected=len(errors),
+                silos=len({row["silo_id"] for row in rows}),
+                created_by=str(current_user.id))
+    
+    return {
+        "accepted": accepted,
+        "rejected": len(errors),
+        "errors": errors
+    }
+
+@router.post("/{silo_id}/readings/async", response_model=SiloReadingAccepted, status_code=202)
+async def enqueue_silo_reading(
+    silo_id: int,
+    reading: SiloReadingInput,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Queue a silo reading in the write-behind buffer.
+    The reading is persisted by the next group commit; the returned sequence
+    number can be compared with last_flushed_sequence in the buffer stats
+    (last_failed_sequence is the newest row that could not be written).
+    """
+    if not settings.INGEST_BUFFER_ENABLED or not ingest_buffer.running:
+        raise HTTPException(status_code=503, detail="Buffered ingestion is disabled")
+    
+    silo = await silo_registry.get(db, silo_id)
+    if not silo:
+        raise HTTPException(status_code=404, detail="Silo not found")
+    
+    # Timestamp at acceptance, not at flush time
+    row = build_reading_row(silo_id, reading.model_dump(), silo.capacity_tons, datetime.utcnow())
+    
+    sequence = ingest_buffer.submit(row)
+    if sequence is None:
+        logger.warning("Ingest buffer full, reading dropped", silo_id=silo_id)
+        raise HTTPException(status_code=503, detail="Ingest buffer is full, retry later")
+    
+    return {"sequence": sequence, "queue_depth": ingest_buffer.queue.qsize()}
+
+@router.get("/readings/buffer")
+async def read_ingest_buffer_stats(
+    current_user: User = Depends(require_roles(["admin", "operator"]))
+):
+    """
+    Get write-behind buffer metrics (queue depth, flush latency, dropped rows)
+    """
+    return {
+        "enabled": settings.INGEST_BUFFER_ENABLED,
+        **ingest_buffer.stats()
+    }
+
+@router.get("/readings/mqtt")
+async def read_mqtt_ingest_stats(
+    current_user: User = Depends(require_roles(["admin", "operator"]))
+):
+    """
+    Get MQTT ingestion metrics (connection state, message counts, buffer)
+    """
+    return {
+        "enabled": settings.MQTT_INGEST_ENABLED,
+        **mqtt_ingest_worker.stats()
+    }
+
+def _export_response(silo_ids: List[int], export_format: str, start_date, end_date, gzip: bool, filename: str):
+    # gzip exports are served as .gz files rather than with Content-Encoding,
+    # so clients keep the compressed file instead of inflating it on download
+    filename = f"{filename}.{export_format}{'.gz' if gzip else ''}"
+    
+    return StreamingResponse(
+        export_readings(silo_ids, export_format, start_date, end_date, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/readings/export")
+async def export_readings_multi(
+    silo_ids: Optional[List[int]] = Query(None),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream the readings of several silos (all silos if silo_ids is omitted)
+    as CSV or NDJSON, ordered by silo then time
+    """
+    if silo_ids:
+        known = await silo_registry.get_many(db, silo_ids)
+        missing = sorted(set(silo_ids) - set(known))
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Silos not found: {missing}")
+        silo_ids = sorted(set(silo_ids))
+    else:
+        silo_ids = [silo.id for silo in await silo_registry.all(db)]
+    
+    logger.info("Readings export started", silos=len(silo_ids), format=format, requested_by=str(current_user.id))
+    
+    return _export_response(silo_ids, format, start_date, end_date, gzip, "silo_readings")
+
+@router.get("/{silo_id}/readings/export")
+async def export_silo_readings(
+    silo_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream a silo's full reading history (or a date range) as CSV or NDJSON
+    with constant memory use
+    """
+    if not await silo_registry.get(db, silo_id):
+        raise HTTPException(status_code=404, detail="Silo not found")
+    
+    logger.info("Readings export started", silo_id=silo_id, format=format, requested_by=str(current_user.id))
+    
+    return _export_response([silo_id], format, start_date, end_date, gzip, f"silo_{silo_id}_readings")
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 import logging
 
-from ....core.database import get_db
+from ....core.database import get_async_db
 from ....core.security import get_current_user
 from ....models.user import User
-from ....models.silo import Silo
 from ....services.weather_service import weather_service
+from ....services.silo_registry import silo_registry
 
 logger = logging.getLogger(__name__)
 
@@ -16,27 +16,18 @@ router = APIRouter()
 @router.get("/current")
 async def get_all_silos_current_weather(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current weather for all silo locations"""
     try:
         # Get all active silos
-        silos = db.query(Silo).filter(Silo.status == 'active').all()
+        silos = await silo_registry.active(db)
         
         if not silos:
             return {"message": "No active silos found", "weather_data": []}
         
         # Prepare silo data for weather service (coordinates and location name)
-        silo_data = []
-        for silo in silos:
-            silo_info = {
-                "id": silo.id,
-                "name": silo.name,
-                "location": silo.location,
-                "latitude": float(silo.latitude) if silo.latitude else None,
-                "longitude": float(silo.longitude) if silo.longitude else None
-            }
-            silo_data.append(silo_info)
+        silo_data = [silo.weather_data() for silo in silos]
         
         # Get weather data for all silos (with coordinate/location fallback)
         weather_data = await weather_service.get_multiple_silos_weather(silo_data)
@@ -64,12 +55,12 @@ async def get_all_silos_current_weather(
 async def get_silo_current_weather(
     silo_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current weather for a specific silo (uses coordinates or location name fallback)"""
     try:
         # Get the silo
-        silo = db.query(Silo).filter(Silo.id == silo_id).first()
+        silo = await silo_registry.get(db, silo_id)
         
         if not silo:
             raise HTTPException(status_code=404, detail="Silo not found")
@@ -79,13 +70,7 @@ async def get_silo_current_weather(
             raise HTTPException(status_code=400, detail="Silo has no location data (coordinates or location name)")
         
         # Prepare silo data
-        silo_data = {
-            "id": silo.id,
-            "name": silo.name,
-            "location": silo.location,
-            "latitude": float(silo.latitude) if silo.latitude else None,
-            "longitude": float(silo.longitude) if silo.longitude else None
-        }
+        silo_data = silo.weather_data()
         
         # Get weather data using coordinate/location fallback
         weather_data = await weather_service.get_silo_weather(silo_data)
@@ -105,12 +90,12 @@ async def get_silo_current_weather(
 async def get_silo_weather_forecast(
     silo_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get 5-day weather forecast for a specific silo (uses coordinates or location name fallback)"""
     try:
         # Get the silo
-        silo = db.query(Silo).filter(Silo.id == silo_id).first()
+        silo = await silo_registry.get(db, silo_id)
         
         if not silo:
             raise HTTPException(status_code=404, detail="Silo not found")
@@ -120,13 +105,7 @@ async def get_silo_weather_forecast(
             raise HTTPException(status_code=400, detail="Silo has no location data (coordinates or location name)")
         
         # Prepare silo data
-        silo_data = {
-            "id": silo.id,
-            "name": silo.name,
-            "location": silo.location,
-            "latitude": float(silo.latitude) if silo.latitude else None,
-            "longitude": float(silo.longitude) if silo.longitude else None
-        }
+        silo_data = silo.weather_data()
         
         # Get forecast data using coordinate/location fallback
         forecast_data = await weather_service.get_silo_weather_forecast(silo_data)
@@ -229,27 +208,18 @@ async def search_locations(
 @router.get("/agricultural-summary")
 async def get_agricultural_weather_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get agricultural weather summary for all silo locations"""
     try:
         # Get all active silos
-        silos = db.query(Silo).filter(Silo.status == 'active').all()
+        silos = await silo_registry.active(db)
         
         if not silos:
             return {"message": "No active silos found", "summary": []}
         
         # Prepare silo data for weather service (coordinates and location name)
-        silo_data = []
-        for silo in silos:
-            silo_info = {
-                "id": silo.id,
-                "name": silo.name,
-                "location": silo.location,
-                "latitude": float(silo.latitude) if silo.latitude else None,
-                "longitude": float(silo.longitude) if silo.longitude else None
-            }
-            silo_data.append(silo_info)
+        silo_data = [silo.weather_data() for silo in silos]
         
         # Get weather data for all silos
         weather_data = await weather_service.get_multiple_silos_weather(silo_data)
@@ -19,6 +19,13 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
     
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
+    DB_ASYNC_POOL_SIZE: int = int(os.getenv("DB_ASYNC_POOL_SIZE", "10"))
+    DB_ASYNC_MAX_OVERFLOW: int = int(os.getenv("DB_ASYNC_MAX_OVERFLOW", "10"))
+    
     # JWT Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "agrotrack-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
@@ -37,8 +44,72 @@ class Settings(BaseSettings):
     MQTT_BROKER_PORT: int = int(os.getenv("MQTT_BROKER_PORT", "1883"))
     MQTT_USERNAME: Optional[str] = os.getenv("MQTT_USERNAME")
     MQTT_PASSWORD: Optional[str] = os.getenv("MQTT_PASSWORD")
+    MQTT_INGEST_ENABLED: bool = os.getenv("MQTT_INGEST_ENABLED", "false").lower() == "true"
+    MQTT_CLIENT_ID: str = os.getenv("MQTT_CLIENT_ID", "agrotrack-backend")
+    MQTT_READINGS_TOPIC: str = os.getenv("MQTT_READINGS_TOPIC", "agrotrack/silos/+/readings")
+    MQTT_QOS: int = int(os.getenv("MQTT_QOS", "1"))
+    MQTT_RECONNECT_INTERVAL_SECONDS: int = int(os.getenv("MQTT_RECONNECT_INTERVAL_SECONDS", "5"))
+    MQTT_INGEST_MAX_QUEUE: int = int(os.getenv("MQTT_INGEST_MAX_QUEUE", "10000"))
+    MQTT_MESSAGE_QUEUE_SIZE: int = int(os.getenv("MQTT_MESSAGE_QUEUE_SIZE", "1000"))
+    
+    # Reading Ingestion
+    READINGS_BATCH_MAX_SIZE: int = int(os.getenv("READINGS_BATCH_MAX_SIZE", "10000"))
+    
+    # Silo metadata cache
+    SILO_REGISTRY_TTL_SECONDS: int = int(os.getenv("SILO_REGISTRY_TTL_SECONDS", "300"))
+    
+    # Write-behind ingestion buffer (opt-in, POST /silos/{id}/readings/async)
+    INGEST_BUFFER_ENABLED: bool = os.getenv("INGEST_BUFFER_ENABLED", "false").lower() == "true"
+    INGEST_BUFFER_MAX_QUEUE: int = int(os.getenv("INGEST_BUFFER_MAX_QUEUE", "50000"))
+    INGEST_BUFFER_FLUSH_SIZE: int = int(os.getenv("INGEST_BUFFER_FLUSH_SIZE", "500"))
+    INGEST_BUFFER_FLUSH_INTERVAL_MS: int = int(os.getenv("INGEST_BUFFER_FLUSH_INTERVAL_MS", "200"))
+    INGEST_BUFFER_FLUSH_RETRIES: int = int(os.getenv("INGEST_BUFFER_FLUSH_RETRIES", "3"))
+    INGEST_BUFFER_RETRY_BACKOFF_MS: int = int(os.getenv("INGEST_BUFFER_RETRY_BACKOFF_MS", "100"))
+    
+    # silo_readings partitioning (interval: day, week or month)
+    PARTITION_MANAGER_ENABLED: bool = os.getenv("PARTITION_MANAGER_ENABLED", "true").lower() == "true"
+    PARTITION_MANAGER_INTERVAL_SECONDS: int = int(os.getenv("PARTITION_MANAGER_INTERVAL_SECONDS", "3600"))
+    READINGS_PARTITION_INTERVAL: str = os.getenv("READINGS_PARTITION_INTERVAL", "month")
+    READINGS_PARTITION_PREMAKE: int = int(os.getenv("READINGS_PARTITION_PREMAKE", "3"))
+    # 0 keeps every partition; expired partitions are detached, and dropped if RETENTION_DROP
+    READINGS_RETENTION_DAYS: int = int(os.getenv("READINGS_RETENTION_DAYS", "0"))
+    READINGS_RETENTION_DROP: bool = os.getenv("READINGS_RETENTION_DROP", "false").lower() == "true"
+    
+    # Streaming readings export (rows fetched per server-side cursor round trip)
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+    
+    # Parquet cold storage for old readings (one file per silo per month)
+    ARCHIVE_ENABLED: bool = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+    ARCHIVE_DIR: Path = Path(os.getenv("ARCHIVE_DIR", "archive/readings"))
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+    ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "86400"))
+    ARCHIVE_INDEX_REFRESH_SECONDS: int = int(os.getenv("ARCHIVE_INDEX_REFRESH_SECONDS", "60"))
+    ARCHIVE_ROW_GROUP_SIZE: int = int(os.getenv("ARCHIVE_ROW_GROUP_SIZE", "10000"))
+    
+    # In-memory recent readings per silo (single API worker only)
+    RECENT_READINGS_ENABLED: bool = os.getenv("RECENT_READINGS_ENABLED", "false").lower() == "true"
+    RECENT_READINGS_CAPACITY: int = int(os.getenv("RECENT_READINGS_CAPACITY", "1024"))
+    RECENT_READINGS_WARM_HOURS: int = int(os.getenv("RECENT_READINGS_WARM_HOURS", "24"))
+    
+    # Dashboard KPI snapshot (shared by every dashboard poller)
+    DASHBOARD_KPI_TTL_SECONDS: int = int(os.getenv("DASHBOARD_KPI_TTL_SECONDS", "10"))
+    DASHBOARD_KPI_BACKGROUND_REFRESH: bool = os.getenv("DASHBOARD_KPI_BACKGROUND_REFRESH", "true").lower() == "true"
+    
+    # WebSocket fan-out: bounded send queue per client and what to do when it is full
+    # (drop_oldest, coalesce: keep only the newest queued update per silo/shipment, disconnect)
+    WEBSOCKET_SEND_QUEUE_SIZE: int = int(os.getenv("WEBSOCKET_SEND_QUEUE_SIZE", "256"))
+    WEBSOCKET_OVERFLOW_POLICY: str = os.getenv("WEBSOCKET_OVERFLOW_POLICY", "coalesce")
+    WEBSOCKET_SEND_TIMEOUT_SECONDS: int = int(os.getenv("WEBSOCKET_SEND_TIMEOUT_SECONDS", "10"))
+    
+    # Real-time push: committed writes are coalesced per silo/shipment into one frame per tick
+    REALTIME_ENABLED: bool = os.getenv("REALTIME_ENABLED", "true").lower() == "true"
+    REALTIME_TICK_MS: int = int(os.getenv("REALTIME_TICK_MS", "250"))
     
     # Alert Thresholds
+    # Threshold rules evaluated by the backend on every ingested reading
+    ALERT_RULES_ENABLED: bool = os.getenv("ALERT_RULES_ENABLED", "true").lower() == "true"
+    # Consecutive clear readings before an open alert auto-resolves (0 disables)
+    ALERT_AUTO_RESOLVE_SAMPLES: int = int(os.getenv("ALERT_AUTO_RESOLVE_SAMPLES", "3"))
     DEFAULT_MAX_TEMPERATURE: float = 30.0
     DEFAULT_MAX_HUMIDITY: float = 75.0
     CRITICAL_TEMPERATURE: float = 35.0
@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+import io
+import json
+from fastapi import HTTPException, Request, Response
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+# Media types for time-series endpoints. JSON keeps the regular
+# row-per-object response; the others are columnar (one array per field).
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.agrotrack.columnar+json"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+def available_formats() -> List[str]:
+    formats = [JSON, COLUMNAR_JSON]
+    if msgpack is not None:
+        formats.append(MSGPACK)
+    if pa is not None:
+        formats.append(ARROW_STREAM)
+    return formats
+
+def negotiate_format(request: Request) -> str:
+    """
+    Pick the response format from the Accept header (q-values honoured,
+    ties resolved in header order). Missing or wildcard Accept means JSON;
+    an Accept header naming only unavailable formats is a 406.
+    """
+    accept = request.headers.get("accept")
+    if not accept:
+        return JSON
+
+    formats = available_formats()
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *params = [piece.strip() for piece in part.split(";")]
+        media_type = _ALIASES.get(media_type.lower(), media_type.lower())
+        quality = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type))
+
+    for _, _, media_type in sorted(candidates):
+        if media_type in ("*/*", "application/*"):
+            return JSON
+        if media_type in formats:
+            return media_type
+
+    raise HTTPException(
+        status_code=406,
+        detail=f"Not acceptable. Supported formats: {', '.join(formats)}"
+    )
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+def rows_to_columns(rows: Sequence[Any], fields: Sequence[str]) -> Dict[str, List[Any]]:
+    """
+    Transpose DB rows (Core Row tuples in field order) into one list per
+    field, with Decimal as float and UUID as str
+    """
+    columns = {field: [] for field in fields}
+    appenders = [columns[field].append for field in fields]
+    for row in rows:
+        for append, value in zip(appenders, row):
+            append(_plain(value))
+    return columns
+
+def _iso(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def columnar_response(
+    columns: Dict[str, List[Any]],
+    media_type: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Encode columns in the negotiated columnar format. JSON and MessagePack
+    carry timestamps as ISO strings; Arrow keeps native timestamp types and
+    puts metadata in the schema metadata.
+    """
+    metadata = metadata or {}
+    count = len(next(iter(columns.values()), []))
+
+    if media_type == ARROW_STREAM:
+        table = pa.table(columns)
+        table = table.replace_schema_metadata({key: str(value) for key, value in metadata.items()})
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        content = sink.getvalue()
+    else:
+        payload = {**metadata, "count": count, "fields": list(columns), "data": columns}
+        if media_type == MSGPACK:
+            content = msgpack.packb(payload, default=_iso)
+        else:
+            content = json.dumps(payload, default=_iso, separators=(",", ":"))
+
+    response_headers = dict(headers or {})
+    response_headers["Vary"] = "Accept"
+    return Response(content=content, media_type=media_type, headers=response_headers)
@@ -0,0 +1,54 @@
+from typing import Any, List, Optional, Tuple
+from datetime import datetime
+from uuid import UUID
+import base64
+import json
+from fastapi import HTTPException, Response
+from sqlalchemy import desc, literal, tuple_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(timestamp: datetime, row_id: Any) -> str:
+    """Opaque token for the position just after (timestamp, id)"""
+    payload = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Inverse of encode_cursor; malformed tokens (including bad ids) are a 400"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (ValueError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def keyset_paginate(query, timestamp_column, id_column, cursor: Optional[str], limit: int, skip: int = 0):
+    """
+    Order query newest first by (timestamp, id) and seek past cursor.
+    A legacy skip offset is only honoured without a cursor. One extra row is
+    fetched so keyset_page can tell whether a next page exists.
+    """
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        # Bind the cursor with the column types so Postgres compares uuid with uuid
+        query = query.where(
+            tuple_(timestamp_column, id_column) < tuple_(
+                literal(timestamp, timestamp_column.type),
+                literal(row_id, id_column.type)
+            )
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    return query.order_by(desc(timestamp_column), desc(id_column)).limit(limit + 1)
+
+def keyset_page(rows: List[Any], limit: int, timestamp_attr: str, response: Response) -> List[Any]:
+    """Trim the look-ahead row and set the next-page cursor header"""
+    if len(rows) <= limit:
+        return rows
+
+    rows = rows[:limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, timestamp_attr), last.id)
+    return rows
@@ -4,10 +4,11 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models.user import User
 
 # Password hashing
@@ -52,11 +53,15 @@ def decode_token(token: str) -> Optional[str]:
     except JWTError:
         return None
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """Get current authenticated user"""
+    """
+    Get current authenticated user. Shares the request's async session with
+    endpoints using get_async_db, so authenticating neither blocks the event
+    loop nor holds a second connection.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -71,13 +76,14 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
     
     return user
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
     """Get current active user"""
@@ -87,7 +93,7 @@ def get_current_active_user(
 
 def require_role(required_role: str):
     """Dependency to require specific user role"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
         if current_user.role != required_role and current_user.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -98,7 +104,7 @@ def require_role(required_role: str):
 
 def require_roles(allowed_roles: list):
     """Dependency to require one of multiple roles"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    async def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
         if current_user.role not in allowed_roles and current_user.role != "admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
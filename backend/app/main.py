@@ -7,9 +7,20 @@ from typing import List
 import structlog
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import async_engine, AsyncSessionLocal
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.router import api_router
-from app.services.websocket_manager import WebSocketManager
+from app.services.websocket_manager import websocket_manager
+from app.services.ingest_buffer import ingest_buffer
+from app.services.silo_registry import silo_registry
+from app.services.mqtt_ingest import mqtt_ingest_worker
+from app.services.partition_manager import partition_manager
+from app.services.kpi_snapshot import kpi_snapshot
+from app.services.archive import reading_archive
+from app.services.recent_readings import recent_readings
+from app.services.reading_ingest import add_committed_readings_hook
+from app.services.open_alerts import open_alert_index
+from app.services.realtime import realtime_publisher
 
 # Configure structured logging
 structlog.configure(
@@ -32,9 +43,6 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="AgroTrack API",
     description="Smart Agricultural Monitoring Platform API",
@@ -43,9 +51,6 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# WebSocket manager for real-time updates
-websocket_manager = WebSocketManager()
-
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -53,6 +58,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Add trusted host middleware
@@ -71,9 +77,12 @@ async def websocket_endpoint(websocket: WebSocket):
     try:
         while True:
             data = await websocket.receive_text()
-            # Handle incoming messages if needed
-            logger.info("Received WebSocket message", data=data)
+            # Subscribe/unsubscribe requests
+            await websocket_manager.handle_message(websocket, data)
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also on errors, e.g. receiving after the writer closed a slow client
         websocket_manager.disconnect(websocket)
 
 @app.get("/")
@@ -98,12 +107,45 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("AgroTrack API starting up...")
+    # Warm the silo metadata cache used by the ingest hot path
+    async with AsyncSessionLocal() as db:
+        await silo_registry.load(db)
+        await open_alert_index.ensure_loaded(db)
+        if settings.RECENT_READINGS_ENABLED:
+            await recent_readings.warm(db)
+            add_committed_readings_hook(recent_readings.extend)
+    if settings.REALTIME_ENABLED:
+        add_committed_readings_hook(realtime_publisher.readings_committed)
+    # Archived months are looked up in memory on the readings paths
+    await reading_archive.refresh_index()
+    
     # Start background tasks here if needed
+    if settings.INGEST_BUFFER_ENABLED:
+        ingest_buffer.start()
+    if settings.MQTT_INGEST_ENABLED:
+        mqtt_ingest_worker.start()
+    if settings.PARTITION_MANAGER_ENABLED:
+        partition_manager.start()
+    if settings.ARCHIVE_ENABLED:
+        reading_archive.start()
+    if settings.DASHBOARD_KPI_BACKGROUND_REFRESH:
+        kpi_snapshot.start()
+    if settings.REALTIME_ENABLED:
+        realtime_publisher.start()
     
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("AgroTrack API shutting down...")
+    await realtime_publisher.stop()
+    await websocket_manager.close_all()
+    await kpi_snapshot.stop()
+    await reading_archive.stop()
+    await partition_manager.stop()
+    # Flush readings still waiting in the write-behind buffers
+    await mqtt_ingest_worker.stop()
+    await ingest_buffer.stop()
+    await async_engine.dispose()
 
 if __name__ == "__main__":
     import uvicorn
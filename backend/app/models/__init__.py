@@ -1,5 +1,5 @@
 from .user import User
-from .silo import Silo, SiloReading
+from .silo import Silo, SiloReading, SiloReadingRollup, SiloLatestReading
 from .alert import Alert
 from .logistics import Logistics, LogisticsTracking
 
@@ -7,6 +7,8 @@ __all__ = [
     "User",
     "Silo", 
     "SiloReading",
+    "SiloReadingRollup",
+    "SiloLatestReading",
     "Alert",
     "Logistics",
     "LogisticsTracking"
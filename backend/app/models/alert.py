@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, Boolean, ForeignKey, Text, text
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, Boolean, ForeignKey, Index, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -15,11 +15,25 @@ class Alert(Base):
     description = Column(Text)
     value = Column(DECIMAL(10, 2))
     threshold = Column(DECIMAL(10, 2))
+    # Repeat breaches of an open alert are coalesced into the row
+    last_seen = Column(DateTime(timezone=True), server_default=func.now())
+    occurrence_count = Column(Integer, nullable=False, default=1, server_default=text("1"))
+    peak_value = Column(DECIMAL(10, 2))
     is_resolved = Column(Boolean, default=False)
     resolved_at = Column(DateTime(timezone=True))
     resolved_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("idx_alerts_silo_id_created_at", silo_id, created_at.desc(), id.desc()),
+        # Newest-first listings and created_at ranges across silos
+        Index("idx_alerts_created_at", created_at.desc(), id.desc()),
+        # Open alerts are a small slice of the table
+        Index("idx_alerts_open_severity", severity, created_at, postgresql_where=text("NOT is_resolved")),
+        # At most one open alert per key; reading alerts upsert against it
+        Index("uq_alerts_open_key", silo_id, alert_type, severity, unique=True, postgresql_where=text("NOT is_resolved")),
+    )
+    
     # Relationships
     silo = relationship("Silo", back_populates="alerts")
     resolver = relationship("User", foreign_keys=[resolved_by])
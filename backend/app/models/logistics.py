@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, text
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -23,7 +23,7 @@ class Logistics(Base):
     
     # Relationships
     silo = relationship("Silo", back_populates="logistics")
-    tracking = relationship("LogisticsTracking", back_populates="logistics", cascade="all, delete-orphan")
+    tracking = relationship("LogisticsTracking", back_populates="logistics", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Logistics(truck_id={self.truck_id}, status={self.status})>"
@@ -39,6 +39,11 @@ class LogisticsTracking(Base):
     heading = Column(DECIMAL(5, 2))
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Latest position and tracking history per shipment
+        Index("idx_logistics_tracking_logistics_id_timestamp", logistics_id, timestamp.desc(), id.desc()),
+    )
+    
     # Relationships
     logistics = relationship("Logistics", back_populates="tracking")
     
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, text
+from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, synonym
 from app.core.database import Base
 
 class Silo(Base):
@@ -20,14 +20,17 @@ class Silo(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    readings = relationship("SiloReading", back_populates="silo", cascade="all, delete-orphan")
-    alerts = relationship("Alert", back_populates="silo", cascade="all, delete-orphan")
+    # passive_deletes: rely on ON DELETE CASCADE instead of loading every child row
+    readings = relationship("SiloReading", back_populates="silo", cascade="all, delete-orphan", passive_deletes=True)
+    alerts = relationship("Alert", back_populates="silo", cascade="all, delete-orphan", passive_deletes=True)
     logistics = relationship("Logistics", back_populates="silo")
     
     def __repr__(self):
         return f"<Silo(name={self.name}, location={self.location})>"
 
 class SiloReading(Base):
+    # Range partitioned by timestamp (see migrations/versions); the table's primary
+    # key is (id, timestamp), the ORM only needs id to identify a row.
     __tablename__ = "silo_readings"
     
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v4()"))
@@ -36,11 +39,68 @@ class SiloReading(Base):
     humidity = Column(DECIMAL(5, 2), nullable=False)
     volume_percent = Column(DECIMAL(5, 2), nullable=False)
     volume_tons = Column(DECIMAL(10, 2))
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        # Per-silo history in keyset order
+        Index("idx_silo_readings_silo_id_timestamp", silo_id, timestamp.desc(), id.desc()),
+        # Cross-silo time ranges; readings arrive in time order
+        Index("idx_silo_readings_timestamp_brin", timestamp, postgresql_using="brin"),
+    )
+    
     # Relationships
     silo = relationship("Silo", back_populates="readings")
     
     def __repr__(self):
-        return f"<SiloReading(silo_id={self.silo_id}, temp={self.temperature}, humidity={self.humidity})>" 
\ No newline at end of file
+        return f"<SiloReading(silo_id={self.silo_id}, temp={self.temperature}, humidity={self.humidity})>"
+
+class SiloReadingRollup(Base):
+    # Per-silo aggregates of silo_readings, maintained incrementally on ingest
+    __tablename__ = "silo_reading_rollups"
+    
+    silo_id = Column(Integer, ForeignKey("silos.id", ondelete="CASCADE"), primary_key=True)
+    resolution = Column(String(10), primary_key=True)  # minute, hour, day
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    readings_count = Column(Integer, nullable=False)
+    temperature_sum = Column(DECIMAL(16, 2), nullable=False)
+    temperature_min = Column(DECIMAL(5, 2), nullable=False)
+    temperature_max = Column(DECIMAL(5, 2), nullable=False)
+    humidity_sum = Column(DECIMAL(16, 2), nullable=False)
+    humidity_min = Column(DECIMAL(5, 2), nullable=False)
+    humidity_max = Column(DECIMAL(5, 2), nullable=False)
+    volume_percent_sum = Column(DECIMAL(16, 2), nullable=False)
+    volume_percent_min = Column(DECIMAL(5, 2), nullable=False)
+    volume_percent_max = Column(DECIMAL(5, 2), nullable=False)
+    last_temperature = Column(DECIMAL(5, 2), nullable=False)
+    last_humidity = Column(DECIMAL(5, 2), nullable=False)
+    last_volume_percent = Column(DECIMAL(5, 2), nullable=False)
+    last_volume_tons = Column(DECIMAL(10, 2))
+    last_timestamp = Column(DateTime(timezone=True), nullable=False)
+    
+    __table_args__ = (
+        # Cross-silo bucket ranges (dashboard trends and KPIs)
+        Index("idx_silo_reading_rollups_bucket", resolution, bucket_start),
+    )
+    
+    def __repr__(self):
+        return f"<SiloReadingRollup(silo_id={self.silo_id}, resolution={self.resolution}, bucket={self.bucket_start})>"
+
+class SiloLatestReading(Base):
+    # One row per silo mirroring its newest reading, upserted with every insert
+    __tablename__ = "silo_latest_reading"
+    
+    silo_id = Column(Integer, ForeignKey("silos.id", ondelete="CASCADE"), primary_key=True)
+    reading_id = Column(UUID(as_uuid=True), nullable=False)
+    temperature = Column(DECIMAL(5, 2), nullable=False)
+    humidity = Column(DECIMAL(5, 2), nullable=False)
+    volume_percent = Column(DECIMAL(5, 2), nullable=False)
+    volume_tons = Column(DECIMAL(10, 2))
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Lets the row serialize as a SiloReading
+    id = synonym("reading_id")
+    
+    def __repr__(self):
+        return f"<SiloLatestReading(silo_id={self.silo_id}, timestamp={self.timestamp})>"
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
@@ -24,12 +24,28 @@ class AlertUpdate(BaseModel):
     threshold: Optional[Decimal] = None
     is_resolved: Optional[bool] = None
 
+class AlertBulkResolve(BaseModel):
+    """Alerts to resolve: explicit ids and/or filters, combined with AND"""
+    ids: Optional[List[UUID]] = None
+    silo_id: Optional[int] = None
+    alert_type: Optional[str] = None
+    severity: Optional[str] = None
+    created_before: Optional[datetime] = None
+
+class AlertBulkResolveResult(BaseModel):
+    resolved: int
+    alert_ids: List[UUID]
+    resolved_at: Optional[datetime] = None
+
 class Alert(AlertBase):
     id: UUID
     silo_id: int
     is_resolved: bool
     resolved_at: Optional[datetime] = None
     resolved_by: Optional[UUID] = None
+    last_seen: Optional[datetime] = None
+    occurrence_count: int = 1
+    peak_value: Optional[Decimal] = None
     created_at: datetime
     
     model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
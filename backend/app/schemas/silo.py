@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
@@ -47,6 +47,31 @@ class SiloReadingInput(SiloReadingBase):
     """Schema for API input when silo_id is in URL path"""
     pass
 
+class SiloReadingBatchItem(SiloReadingInput):
+    """Single reading inside a bulk upload, silo_id travels with each row"""
+    silo_id: int
+    timestamp: Optional[datetime] = None
+
+class SiloReadingBatch(BaseModel):
+    """Bulk upload payload; items are validated one by one so a bad row
+    does not reject the whole batch"""
+    readings: List[Dict[str, Any]]
+
+class SiloReadingBatchError(BaseModel):
+    index: int
+    silo_id: Optional[int] = None
+    detail: str
+
+class SiloReadingBatchResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: List[SiloReadingBatchError] = []
+
+class SiloReadingAccepted(BaseModel):
+    """Receipt for a reading queued in the write-behind buffer"""
+    sequence: int
+    queue_depth: int
+
 class SiloReading(SiloReadingBase):
     id: UUID
     silo_id: int
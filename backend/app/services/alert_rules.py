@@ -0,0 +1,274 @@
+from typing import Any, Dict, List, Set, Tuple
+from datetime import datetime
+from uuid import UUID
+import uuid
+import numpy as np
+from sqlalchemy import and_, case, func, literal_column, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.config import settings
+from app.models.alert import Alert
+from app.services.silo_registry import SiloInfo, silo_registry
+from app.services.open_alerts import AlertKey, lower_is_worse, open_alert_index
+from app.services.reading_rollups import as_utc
+from app.services.realtime import publish_after_commit, realtime_publisher
+
+logger = structlog.get_logger()
+
+# Volume bands (percent of capacity)
+VOLUME_LOW = 10.0
+VOLUME_LOW_CRITICAL = 5.0
+VOLUME_HIGH = 90.0
+VOLUME_HIGH_CRITICAL = 95.0
+VOLUME_WARNING = 75.0
+
+# Alert types raised (and auto-resolved) by the rule engine
+RULE_ALERT_TYPES = ("temperature", "humidity", "volume")
+
+# Margins above the silo threshold that make a breach critical
+TEMPERATURE_CRITICAL_MARGIN = 5.0
+HUMIDITY_CRITICAL_MARGIN = 10.0
+
+def _alert(row: Dict[str, Any], silo: SiloInfo, alert_type: str, severity: str,
+           title: str, description: str, value: Any, threshold: float) -> Dict[str, Any]:
+    return {
+        "id": uuid.uuid4(),
+        "silo_id": row["silo_id"],
+        "alert_type": alert_type,
+        "severity": severity,
+        "title": f"{title} in {silo.name}",
+        "description": description,
+        "value": value,
+        "threshold": float(threshold),
+        "peak_value": value,
+        "occurrence_count": 1,
+        "last_seen": row["timestamp"],
+        "is_resolved": False
+    }
+
+def evaluate_alert_rules(rows: List[Dict[str, Any]], silos: Dict[int, SiloInfo]) -> List[Dict[str, Any]]:
+    """
+    Evaluate the threshold rules over a chunk of reading rows at once and
+    return the alert rows to insert. Per reading, at most one temperature,
+    one humidity and one volume alert is raised:
+
+    - temperature above max_temperature: high, critical above max + 5
+    - humidity above max_humidity: high, critical above max + 10
+    - volume below 10%: medium, critical below 5%
+    - volume at or above 90%: high, critical at or above 95%
+    - volume at or above 75%: medium
+    """
+    rows = [row for row in rows if row["silo_id"] in silos]
+    if not rows:
+        return []
+
+    temperature = np.array([float(row["temperature"]) for row in rows])
+    humidity = np.array([float(row["humidity"]) for row in rows])
+    volume = np.array([float(row["volume_percent"]) for row in rows])
+    max_temperature = np.array([
+        float(silos[row["silo_id"]].max_temperature or settings.DEFAULT_MAX_TEMPERATURE) for row in rows
+    ])
+    max_humidity = np.array([
+        float(silos[row["silo_id"]].max_humidity or settings.DEFAULT_MAX_HUMIDITY) for row in rows
+    ])
+
+    temperature_high = temperature > max_temperature
+    temperature_critical = temperature > max_temperature + TEMPERATURE_CRITICAL_MARGIN
+    humidity_high = humidity > max_humidity
+    humidity_critical = humidity > max_humidity + HUMIDITY_CRITICAL_MARGIN
+    volume_low = volume < VOLUME_LOW
+    volume_high = ~volume_low & (volume >= VOLUME_HIGH)
+    volume_warning = ~volume_low & ~volume_high & (volume >= VOLUME_WARNING)
+
+    alerts = []
+    for i in np.flatnonzero(temperature_high | humidity_high | volume_low | volume_high | volume_warning):
+        row = rows[i]
+        silo = silos[row["silo_id"]]
+
+        if temperature_high[i]:
+            alerts.append(_alert(
+                row, silo, "temperature",
+                "critical" if temperature_critical[i] else "high",
+                "High Temperature",
+                f"Temperature {row['temperature']}°C exceeds threshold {max_temperature[i]}°C",
+                row["temperature"], max_temperature[i]
+            ))
+        if humidity_high[i]:
+            alerts.append(_alert(
+                row, silo, "humidity",
+                "critical" if humidity_critical[i] else "high",
+                "High Humidity",
+                f"Humidity {row['humidity']}% exceeds threshold {max_humidity[i]}%",
+                row["humidity"], max_humidity[i]
+            ))
+        if volume_low[i]:
+            alerts.append(_alert(
+                row, silo, "volume",
+                "critical" if volume[i] < VOLUME_LOW_CRITICAL else "medium",
+                "Low Volume",
+                f"Volume {row['volume_percent']}% is critically low - refill needed",
+                row["volume_percent"], VOLUME_LOW
+            ))
+        elif volume_high[i]:
+            alerts.append(_alert(
+                row, silo, "volume",
+                "critical" if volume[i] >= VOLUME_HIGH_CRITICAL else "high",
+                "High Capacity",
+                f"Volume {row['volume_percent']}% is very high - shipment needed",
+                row["volume_percent"], VOLUME_HIGH
+            ))
+        elif volume_warning[i]:
+            alerts.append(_alert(
+                row, silo, "volume", "medium",
+                "High Capacity Warning",
+                f"Volume {row['volume_percent']}% is getting high - plan shipments",
+                row["volume_percent"], VOLUME_WARNING
+            ))
+
+    return alerts
+
+async def create_reading_alerts(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Raise alerts for freshly ingested readings. Runs in the caller's
+    transaction.
+
+    Breaches are coalesced per (silo_id, alert_type, severity): while an
+    alert with that key is open, repeats bump its occurrence_count,
+    last_seen and peak_value instead of inserting a row. The partial unique
+    index on open alert keys makes this one INSERT ... ON CONFLICT, which
+    also holds across processes. An open rule alert whose type stays clear
+    for ALERT_AUTO_RESOLVE_SAMPLES consecutive readings is resolved.
+    Returns the inserted alert rows.
+    """
+    if not settings.ALERT_RULES_ENABLED or not rows:
+        return []
+
+    await open_alert_index.ensure_loaded(db)
+    silos = await silo_registry.get_many(db, {row["silo_id"] for row in rows})
+    candidates = evaluate_alert_rules(rows, silos)
+
+    # Fold the chunk's breaches into one entry per key
+    breaches: Dict[AlertKey, Dict[str, Any]] = {}
+    triggered: Dict[Tuple[int, datetime], Set[str]] = {}
+    for alert in sorted(candidates, key=lambda alert: as_utc(alert["last_seen"])):
+        key = (alert["silo_id"], alert["alert_type"], alert["severity"])
+        triggered.setdefault((alert["silo_id"], as_utc(alert["last_seen"])), set()).add(alert["alert_type"])
+        breach = breaches.get(key)
+        if breach is None:
+            breaches[key] = dict(alert)
+            continue
+        breach["occurrence_count"] += 1
+        breach["last_seen"] = alert["last_seen"]
+        low = lower_is_worse(alert["alert_type"], alert["value"], alert["threshold"])
+        if (alert["value"] < breach["peak_value"]) if low else (alert["value"] > breach["peak_value"]):
+            breach["peak_value"] = alert["value"]
+
+    open_alert_index.mark_dirty(db)
+
+    inserted = []
+    coalesced = 0
+    for row in await _upsert_breaches(db, breaches):
+        key = (row.silo_id, row.alert_type, row.severity)
+        breach = breaches[key]
+        if row.inserted:
+            inserted.append(breach)
+        else:
+            coalesced += 1
+        open_alert_index.stage(db, key, row.id, as_utc(row.last_seen))
+
+    resolved = await _auto_resolve(db, rows, triggered)
+    if inserted:
+        publish_after_commit(db, realtime_publisher.alerts_changed, inserted)
+    if resolved:
+        publish_after_commit(
+            db, realtime_publisher.alerts_resolved,
+            [(alert_id, key[0], key[2]) for alert_id, key in resolved.items()]
+        )
+
+    if candidates or resolved:
+        logger.info("Reading alerts evaluated",
+                    readings=len(rows),
+                    breaches=len(candidates),
+                    created=len(inserted),
+                    coalesced=coalesced,
+                    auto_resolved=len(resolved))
+    return inserted
+
+async def _upsert_breaches(db: AsyncSession, breaches: Dict[AlertKey, Dict[str, Any]]) -> List[Any]:
+    """
+    Insert one alert per breached key, or fold the breach into the key's
+    open alert, with a single INSERT ... ON CONFLICT on uq_alerts_open_key
+    """
+    if not breaches:
+        return []
+
+    statement = pg_insert(Alert).values([breaches[key] for key in sorted(breaches)])
+    excluded = statement.excluded
+    # Low-volume alerts get worse as the value drops, every other rule as it rises
+    low = and_(excluded.alert_type == "volume", excluded.value < excluded.threshold)
+    current_peak = func.coalesce(Alert.peak_value, Alert.value)
+
+    result = await db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[Alert.silo_id, Alert.alert_type, Alert.severity],
+            index_where=text("NOT is_resolved"),
+            set_={
+                "occurrence_count": Alert.occurrence_count + excluded.occurrence_count,
+                "last_seen": func.greatest(Alert.last_seen, excluded.last_seen),
+                "peak_value": case(
+                    (low, func.least(current_peak, excluded.peak_value)),
+                    else_=func.greatest(current_peak, excluded.peak_value)
+                )
+            }
+        ).returning(
+            Alert.id, Alert.silo_id, Alert.alert_type, Alert.severity, Alert.last_seen,
+            # xmax is 0 only on a freshly inserted row version
+            literal_column("xmax = 0").label("inserted")
+        )
+    )
+    return result.all()
+
+async def _auto_resolve(
+    db: AsyncSession,
+    rows: List[Dict[str, Any]],
+    triggered: Dict[Tuple[int, datetime], Set[str]]
+) -> Dict[UUID, AlertKey]:
+    """
+    Count consecutive clear readings per open rule alert (hysteresis) and
+    resolve the alerts that reached ALERT_AUTO_RESOLVE_SAMPLES. A reading
+    is clear for an alert only when it breaches no rule of the alert's
+    type at any severity; alerts of other types (system or created through
+    the API) are never auto-resolved.
+    """
+    required = settings.ALERT_AUTO_RESOLVE_SAMPLES
+    if required <= 0:
+        return {}
+
+    # Streaks are read and updated without awaiting, so ingests running
+    # concurrently on this event loop cannot interleave here
+    resolved: Dict[UUID, AlertKey] = {}
+    for row in sorted(rows, key=lambda row: as_utc(row["timestamp"])):
+        timestamp = as_utc(row["timestamp"])
+        breached = triggered.get((row["silo_id"], timestamp), set())
+        for key, open_alert in open_alert_index.for_silo(row["silo_id"]):
+            if key[1] not in RULE_ALERT_TYPES:
+                continue
+            if key[1] in breached:
+                open_alert.clear_streak = 0
+            elif open_alert.last_seen is None or timestamp > open_alert.last_seen:
+                open_alert.clear_streak += 1
+                if open_alert.clear_streak >= required:
+                    open_alert_index.remove(key)
+                    resolved[open_alert.id] = key
+
+    if not resolved:
+        return {}
+    # Report only the alerts this statement resolved, not ones closed meanwhile
+    result = await db.execute(
+        update(Alert).where(
+            and_(Alert.id.in_(list(resolved)), Alert.is_resolved == False)
+        ).values(is_resolved=True, resolved_at=func.now()).returning(Alert.id)
+    )
+    return {alert_id: resolved[alert_id] for alert_id in result.scalars()}
@@ -0,0 +1,323 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID
+import asyncio
+import os
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+import structlog
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.core.pagination import decode_cursor
+from app.models.silo import SiloReading
+from app.services.partition_manager import floor_to_interval, next_interval
+from app.services.periodic import PeriodicTask
+from app.services.reading_rollups import as_utc
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+logger = structlog.get_logger()
+
+# Column order of archive files, matching the readings column formats
+ARCHIVE_FIELDS = ("id", "silo_id", "temperature", "humidity", "volume_percent", "volume_tons", "timestamp", "created_at")
+
+# Serializes archive runs across worker processes
+ARCHIVE_LOCK_ID = 740_120_002
+
+def _archive_schema():
+    return pa.schema([
+        ("id", pa.string()),
+        ("silo_id", pa.int32()),
+        ("temperature", pa.decimal128(5, 2)),
+        ("humidity", pa.decimal128(5, 2)),
+        ("volume_percent", pa.decimal128(5, 2)),
+        ("volume_tons", pa.decimal128(10, 2)),
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+def _row_key(row: Dict[str, Any]) -> Tuple[datetime, str]:
+    return row["timestamp"], str(row["id"])
+
+class ReadingArchive:
+    """
+    Parquet cold storage for old silo readings.
+
+    Readings older than ARCHIVE_AFTER_DAYS are moved, a whole calendar month
+    at a time, to ARCHIVE_DIR/silo_id={id}/{YYYY-MM}.parquet and deleted from
+    silo_readings. Files are sorted by timestamp and written in row groups of
+    ARCHIVE_ROW_GROUP_SIZE, so timestamp filters skip whole row groups using
+    the Parquet statistics. Rollups and latest readings are left untouched.
+
+    Archiving a month is idempotent: rows still in the database are merged
+    into an existing file (deduplicated by id), and only the rows written to
+    the file are deleted.
+
+    Request paths never touch the filesystem to find out what is archived:
+    they read an in-memory index of archived months, updated as this process
+    archives and rescanned every ARCHIVE_INDEX_REFRESH_SECONDS to pick up
+    months archived by other workers.
+    """
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or settings.ARCHIVE_DIR)
+        self._loop = PeriodicTask("Readings archive run", self.run_once, settings.ARCHIVE_INTERVAL_SECONDS)
+        self._index_loop = PeriodicTask(
+            "Readings archive index refresh", self.refresh_index, settings.ARCHIVE_INDEX_REFRESH_SECONDS
+        )
+        self._months: Dict[int, List[datetime]] = {}
+        self.last_run_at: Optional[datetime] = None
+        self.archived_rows = 0
+
+    @property
+    def available(self) -> bool:
+        return pa is not None
+
+    def _silo_dir(self, silo_id: int) -> Path:
+        return self.root / f"silo_id={silo_id}"
+
+    def month_path(self, silo_id: int, month: datetime) -> Path:
+        return self._silo_dir(silo_id) / f"{month:%Y-%m}.parquet"
+
+    def scan_months(self) -> Dict[int, List[datetime]]:
+        """Archived months of every silo, oldest first, read from the archive directory (blocking)"""
+        if not self.available or not self.root.is_dir():
+            return {}
+
+        index: Dict[int, List[datetime]] = {}
+        for directory in self.root.glob("silo_id=*"):
+            try:
+                silo_id = int(directory.name.split("=", 1)[1])
+            except ValueError:
+                continue
+            months = []
+            for path in directory.glob("*.parquet"):
+                try:
+                    months.append(datetime.strptime(path.stem, "%Y-%m").replace(tzinfo=timezone.utc))
+                except ValueError:
+                    continue
+            if months:
+                index[silo_id] = sorted(months)
+        return index
+
+    async def refresh_index(self):
+        """Rescan the archive directory into the archived months index"""
+        self._months = await asyncio.to_thread(self.scan_months)
+
+    def _index_month(self, silo_id: int, month: datetime):
+        months = self._months.get(silo_id, [])
+        if month not in months:
+            # Replaced, not mutated: readers may be iterating the old list in a thread
+            self._months[silo_id] = sorted(months + [month])
+
+    def archived_months(self, silo_id: int) -> List[datetime]:
+        """Start of every archived month of a silo, oldest first"""
+        return self._months.get(silo_id, [])
+
+    def watermark(self, silo_id: int) -> Optional[datetime]:
+        """Every archived reading of the silo is older than this"""
+        months = self.archived_months(silo_id)
+        return next_interval(months[-1], "month") if months else None
+
+    def covers(self, silo_id: int, start: Optional[datetime]) -> bool:
+        """Whether a range starting at start (None: unbounded) reaches into the archive"""
+        watermark = self.watermark(silo_id)
+        return watermark is not None and (start is None or as_utc(start) < watermark)
+
+    def _months_in_range(self, silo_id: int, start: Optional[datetime], end: Optional[datetime]) -> List[datetime]:
+        start = as_utc(start) if start else None
+        end = as_utc(end) if end else None
+        return [
+            month for month in self.archived_months(silo_id)
+            if (end is None or month <= end) and (start is None or next_interval(month, "month") > start)
+        ]
+
+    def _read_month(
+        self,
+        silo_id: int,
+        month: datetime,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        columns: Sequence[str] = ARCHIVE_FIELDS
+    ):
+        # Filters are pushed down to row-group statistics before any data is read
+        filters = []
+        if start:
+            filters.append(("timestamp", ">=", as_utc(start)))
+        if end:
+            filters.append(("timestamp", "<=", as_utc(end)))
+        return pq.read_table(self.month_path(silo_id, month), columns=list(columns), filters=filters or None)
+
+    def read_newest(
+        self,
+        silo_id: int,
+        limit: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to limit archived readings, newest first, strictly after cursor in that order"""
+        before = None
+        if cursor:
+            timestamp, row_id = decode_cursor(cursor)
+            before = (as_utc(timestamp), str(row_id))
+            end = min(as_utc(end), before[0]) if end else before[0]
+
+        rows: List[Dict[str, Any]] = []
+        for month in reversed(self._months_in_range(silo_id, start, end)):
+            month_rows = sorted(self._read_month(silo_id, month, start, end).to_pylist(), key=_row_key, reverse=True)
+            if before:
+                month_rows = [row for row in month_rows if _row_key(row) < before]
+            rows.extend(month_rows)
+            # Older months only hold older rows
+            if len(rows) >= limit:
+                break
+
+        rows = rows[:limit]
+        for row in rows:
+            row["id"] = UUID(row["id"])
+        return rows
+
+    def iter_oldest(
+        self,
+        silo_id: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        fields: Sequence[str],
+        batch_size: int
+    ) -> Iterator[List[Tuple]]:
+        """Archived readings oldest first, as tuples of fields in batches of batch_size"""
+        for month in self._months_in_range(silo_id, start, end):
+            table = self._read_month(silo_id, month, start, end, fields)
+            for batch in table.to_batches(max_chunksize=batch_size):
+                yield list(zip(*[column.to_pylist() for column in batch.columns]))
+
+    async def merge_newest(
+        self,
+        rows: Sequence[Any],
+        silo_id: int,
+        count: int,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        cursor: Optional[str],
+        make_row: Callable[[Dict[str, Any]], Any]
+    ) -> List[Any]:
+        """
+        Merge a newest-first page of database rows with archived rows and
+        return the newest count rows. make_row converts an archived row to the
+        type of the database rows.
+        """
+        watermark = self.watermark(silo_id)
+        # A full page ending at or after the watermark cannot contain archived rows
+        if watermark is None or (len(rows) >= count and as_utc(rows[count - 1].timestamp) >= watermark):
+            return list(rows)
+
+        archived = await asyncio.to_thread(self.read_newest, silo_id, count, start, end, cursor)
+        known_ids = {row.id for row in rows}
+        merged = list(rows) + [make_row(row) for row in archived if row["id"] not in known_ids]
+        merged.sort(key=lambda row: (as_utc(row.timestamp), str(row.id)), reverse=True)
+        return merged[:count]
+
+    def start(self):
+        """Start the periodic archive job and index refresh"""
+        self._loop.start()
+        self._index_loop.start()
+
+    async def stop(self):
+        await self._loop.stop()
+        await self._index_loop.stop()
+
+    async def run_once(self, now: datetime = None):
+        """Archive every whole month older than ARCHIVE_AFTER_DAYS"""
+        if not self.available:
+            logger.warning("Readings archive needs pyarrow, skipping run")
+            return
+
+        now = now or datetime.now(timezone.utc)
+        cutoff = floor_to_interval(now - timedelta(days=settings.ARCHIVE_AFTER_DAYS), "month")
+        month = func.date_trunc("month", func.timezone("UTC", SiloReading.timestamp))
+
+        async with async_engine.connect() as conn:
+            locked = await conn.scalar(text("SELECT pg_try_advisory_lock(:id)"), {"id": ARCHIVE_LOCK_ID})
+            await conn.commit()
+            if not locked:
+                return
+
+            try:
+                pending = (await conn.execute(
+                    select(SiloReading.silo_id, month.label("month")).where(
+                        SiloReading.timestamp < cutoff
+                    ).group_by(SiloReading.silo_id, month).order_by(SiloReading.silo_id, month)
+                )).all()
+                await conn.commit()
+
+                for silo_id, month_start in pending:
+                    await self._archive_month(conn, silo_id, month_start.replace(tzinfo=timezone.utc))
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": ARCHIVE_LOCK_ID})
+                await conn.commit()
+
+        self.last_run_at = now
+
+    async def _archive_month(self, conn: AsyncConnection, silo_id: int, month: datetime):
+        in_month = and_(
+            SiloReading.silo_id == silo_id,
+            SiloReading.timestamp >= month,
+            SiloReading.timestamp < next_interval(month, "month")
+        )
+
+        # The file is written from exactly the deleted rows and the delete only
+        # commits once it is in place: rows arriving meanwhile stay in the
+        # table, and a failed write rolls the delete back. A commit failing
+        # after the write leaves the rows in both places; the next run merges
+        # them into the file again by id.
+        rows = (await conn.execute(
+            delete(SiloReading).where(in_month).returning(
+                *[SiloReading.__table__.c[field] for field in ARCHIVE_FIELDS]
+            )
+        )).all()
+        try:
+            if rows:
+                await asyncio.to_thread(self._write_month, silo_id, month, rows)
+        except BaseException:
+            await conn.rollback()
+            raise
+        if rows:
+            # Before the commit: readers must look in the file once the rows leave the table
+            self._index_month(silo_id, month)
+        await conn.commit()
+
+        self.archived_rows += len(rows)
+        logger.info("Readings archived", silo_id=silo_id, month=f"{month:%Y-%m}", rows=len(rows))
+
+    def _write_month(self, silo_id: int, month: datetime, rows: Sequence[Any]):
+        schema = _archive_schema()
+        columns = [list(column) for column in zip(*rows)]
+        columns[0] = [str(row_id) for row_id in columns[0]]
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+            schema=schema
+        )
+
+        path = self.month_path(silo_id, month)
+        if path.exists():
+            existing = pq.read_table(path, schema=schema)
+            keep = pc.invert(pc.is_in(existing["id"], value_set=table["id"]))
+            table = pa.concat_tables([existing.filter(keep), table])
+
+        table = table.sort_by([("timestamp", "ascending"), ("id", "ascending")])
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, temporary, row_group_size=settings.ARCHIVE_ROW_GROUP_SIZE, compression="zstd")
+        os.replace(temporary, path)
+
+# Global archive instance, the periodic job runs when ARCHIVE_ENABLED is set
+reading_archive = ReadingArchive()
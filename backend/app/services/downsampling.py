@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+import math
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.silo import SiloReading, SiloReadingRollup
+
+# Rollup tables usable as a pre-aggregated source, coarsest first
+ROLLUP_SECONDS = (("day", 86400), ("hour", 3600), ("minute", 60))
+
+# LTTB runs over this many SQL-averaged buckets per output point, so the
+# rows pulled from the database stay bounded however long the range is
+LTTB_OVERSAMPLE = 4
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of threshold points of (x, y)
+    that best preserve the visual shape of the series. x must be sorted.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        # Average of the next bucket is the third triangle vertex
+        if end < next_end:
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+def bucket_width(start: datetime, end: datetime, max_points: int) -> int:
+    """
+    Whole-second bucket width for which the epoch-aligned buckets touched by
+    [start, end] number at most max_points (at least 2). The range spans at
+    most max_points - 1 widths, and so touches at most max_points aligned
+    buckets wherever it starts; this holds for any wider bucket too, so
+    rounding up to a rollup resolution keeps the bound.
+    """
+    span = max((end - start).total_seconds(), 1)
+    return max(int(math.ceil(span / max(max_points - 1, 1))), 1)
+
+def _rollup_resolution(width: int) -> Tuple[Optional[str], int]:
+    """
+    Coarsest rollup that fits in a bucket of width seconds, with the width
+    rounded up to a whole number of rollup buckets so none straddles two
+    """
+    for resolution, seconds in ROLLUP_SECONDS:
+        if width >= seconds:
+            return resolution, int(math.ceil(width / seconds)) * seconds
+    return None, width
+
+async def bucketed_series(
+    db: AsyncSession,
+    silo_id: int,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    width: int
+) -> Tuple[int, List[Any]]:
+    """
+    Aggregate metric into fixed buckets of width seconds (epoch aligned).
+    Buckets of a minute or more are computed from the rollup tables,
+    finer ones from silo_readings. Returns the effective width and rows of
+    (bucket, first_timestamp, count, min, max, avg).
+    """
+    resolution, width = _rollup_resolution(width)
+
+    if resolution:
+        timestamp = SiloReadingRollup.bucket_start
+        count = func.sum(SiloReadingRollup.readings_count)
+        columns = (
+            count,
+            func.min(SiloReadingRollup.__table__.c[f"{metric}_min"]),
+            func.max(SiloReadingRollup.__table__.c[f"{metric}_max"]),
+            func.sum(SiloReadingRollup.__table__.c[f"{metric}_sum"]) / func.nullif(count, 0)
+        )
+        conditions = [SiloReadingRollup.silo_id == silo_id, SiloReadingRollup.resolution == resolution]
+    else:
+        timestamp = SiloReading.timestamp
+        value = SiloReading.__table__.c[metric]
+        columns = (func.count(), func.min(value), func.max(value), func.avg(value))
+        conditions = [SiloReading.silo_id == silo_id]
+
+    bucket = func.floor(func.extract("epoch", timestamp) / width).label("bucket")
+    result = await db.execute(
+        select(
+            bucket,
+            func.min(timestamp).label("first_timestamp"),
+            columns[0].label("count"),
+            columns[1].label("min"),
+            columns[2].label("max"),
+            columns[3].label("avg")
+        ).where(
+            and_(*conditions, timestamp >= start, timestamp <= end)
+        ).group_by(bucket).order_by(bucket)
+    )
+    return width, result.all()
+
+async def envelope_series(
+    db: AsyncSession,
+    silo_id: int,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    width: int
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """min/max/avg per bucket, for band charts"""
+    width, rows = await bucketed_series(db, silo_id, metric, start, end, width)
+    return width, [
+        {
+            "timestamp": datetime.fromtimestamp(int(row.bucket) * width, tz=timezone.utc).isoformat(),
+            "count": int(row.count),
+            "min": float(row.min),
+            "max": float(row.max),
+            "avg": round(float(row.avg), 3)
+        }
+        for row in rows
+    ]
+
+async def lttb_series(
+    db: AsyncSession,
+    silo_id: int,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    max_points: int
+) -> List[Dict[str, Any]]:
+    """Shape-preserving series of at most max_points (timestamp, value) points"""
+    width = bucket_width(start, end, max_points * LTTB_OVERSAMPLE)
+    _, rows = await bucketed_series(db, silo_id, metric, start, end, width)
+    if not rows:
+        return []
+
+    x = np.fromiter((row.first_timestamp.timestamp() for row in rows), dtype=np.float64, count=len(rows))
+    y = np.fromiter((float(row.avg) for row in rows), dtype=np.float64, count=len(rows))
+    indices = lttb_indices(x, y, max_points)
+
+    return [
+        {
+            "timestamp": rows[i].first_timestamp.isoformat(),
+            "value": round(float(y[i]), 3)
+        }
+        for i in indices
+    ]
+
+def lttb_from_samples(timestamps_ms: np.ndarray, values: np.ndarray, max_points: int) -> List[Dict[str, Any]]:
+    """LTTB over in-memory samples (epoch ms timestamps, as from recent readings)"""
+    indices = lttb_indices(timestamps_ms.astype(np.float64), values.astype(np.float64), max_points)
+    return [
+        {
+            "timestamp": datetime.fromtimestamp(int(timestamps_ms[i]) / 1000, tz=timezone.utc).isoformat(),
+            "value": round(float(values[i]), 3)
+        }
+        for i in indices
+    ]
+
+def envelope_from_samples(timestamps_ms: np.ndarray, values: np.ndarray, width: int) -> List[Dict[str, Any]]:
+    """min/max/avg per epoch-aligned bucket of width seconds over in-memory samples"""
+    if not len(timestamps_ms):
+        return []
+
+    buckets = timestamps_ms // (width * 1000)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(buckets)])
+    mins = np.minimum.reduceat(values, starts)
+    maxs = np.maximum.reduceat(values, starts)
+    averages = np.add.reduceat(values.astype(np.float64), starts) / counts
+
+    return [
+        {
+            "timestamp": datetime.fromtimestamp(int(buckets[start]) * width, tz=timezone.utc).isoformat(),
+            "count": int(count),
+            "min": round(float(low), 2),
+            "max": round(float(high), 2),
+            "avg": round(float(average), 3)
+        }
+        for start, count, low, high, average in zip(starts, counts, mins, maxs, averages)
+    ]
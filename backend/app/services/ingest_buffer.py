@@ -0,0 +1,209 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import itertools
+import time
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.reading_ingest import insert_readings
+
+logger = structlog.get_logger()
+
+class ReadingIngestBuffer:
+    """
+    Write-behind buffer for silo readings.
+
+    Accepted rows are queued in-process and a background flusher writes them
+    in groups, committing once per group instead of once per reading. A group
+    is flushed when it reaches flush_size rows or when flush_interval_ms has
+    passed since its first row was taken off the queue.
+
+    A group whose write fails is retried flush_retries times with doubling
+    backoff, then written row by row so one bad row only loses itself.
+    last_flushed_sequence only moves past rows that were committed.
+    """
+
+    def __init__(
+        self,
+        name: str = "http",
+        max_queue_size: int = settings.INGEST_BUFFER_MAX_QUEUE,
+        flush_size: int = settings.INGEST_BUFFER_FLUSH_SIZE,
+        flush_interval_ms: int = settings.INGEST_BUFFER_FLUSH_INTERVAL_MS,
+        flush_retries: int = settings.INGEST_BUFFER_FLUSH_RETRIES,
+        retry_backoff_ms: int = settings.INGEST_BUFFER_RETRY_BACKOFF_MS
+    ):
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_retries = flush_retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._sequence = itertools.count(1)
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._accepting = False
+
+        # Metrics
+        self.accepted = 0
+        self.dropped = 0
+        self.flushed_rows = 0
+        self.failed_rows = 0
+        self.retried_flushes = 0
+        self.flush_count = 0
+        self.last_flush_rows = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+        self.last_flushed_sequence = 0
+        self.last_failed_sequence = 0
+
+    @property
+    def running(self) -> bool:
+        return self._flusher_task is not None and not self._flusher_task.done()
+
+    def start(self):
+        """Start the background flusher"""
+        if self.running:
+            return
+        self._accepting = True
+        self._flusher_task = asyncio.create_task(self._run())
+        logger.info("Ingest buffer started",
+                    buffer=self.name,
+                    flush_size=self.flush_size,
+                    flush_interval_ms=int(self.flush_interval * 1000))
+
+    async def stop(self):
+        """Stop accepting rows, drain the queue and stop the flusher"""
+        if not self.running:
+            return
+        self._accepting = False
+        await self.queue.join()
+        self._flusher_task.cancel()
+        try:
+            await self._flusher_task
+        except asyncio.CancelledError:
+            pass
+        self._flusher_task = None
+        logger.info("Ingest buffer drained", buffer=self.name, **self.stats())
+
+    def submit(self, row: Dict[str, Any]) -> Optional[int]:
+        """
+        Queue a row without waiting. Returns its sequence number,
+        or None when the buffer is full or stopped and the row was dropped.
+        """
+        if not self._accepting:
+            self.dropped += 1
+            return None
+
+        sequence = next(self._sequence)
+        try:
+            self.queue.put_nowait((sequence, row))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return None
+
+        self.accepted += 1
+        return sequence
+
+    async def put(self, row: Dict[str, Any]) -> int:
+        """Queue a row, waiting for space when the buffer is full (backpressure)"""
+        sequence = next(self._sequence)
+        await self.queue.put((sequence, row))
+        self.accepted += 1
+        return sequence
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.flush_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[int, Dict[str, Any]]]):
+        rows = [row for _, row in batch]
+        started = time.perf_counter()
+
+        for attempt in range(self.flush_retries + 1):
+            try:
+                await self._write(rows)
+                written = batch
+                break
+            except Exception as e:
+                if attempt == self.flush_retries:
+                    logger.error("Ingest buffer flush failed, writing rows one by one",
+                                 buffer=self.name, rows=len(rows), error=str(e))
+                    written = await self._write_each(batch)
+                    break
+                delay = self.retry_backoff * 2 ** attempt
+                self.retried_flushes += 1
+                logger.warning("Ingest buffer flush failed, retrying",
+                               buffer=self.name, rows=len(rows), retry_in=delay, error=str(e))
+                await asyncio.sleep(delay)
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.flush_count += 1
+        self.flushed_rows += len(written)
+        self.last_flush_rows = len(written)
+        self.last_flush_latency_ms = round(latency_ms, 2)
+        self.max_flush_latency_ms = max(self.max_flush_latency_ms, self.last_flush_latency_ms)
+        if written:
+            self.last_flushed_sequence = max(self.last_flushed_sequence, written[-1][0])
+
+    async def _write_each(self, batch: List[Tuple[int, Dict[str, Any]]]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Write rows in their own transactions, returning the ones committed"""
+        written = []
+        for sequence, row in batch:
+            try:
+                await self._write([row])
+            except Exception as e:
+                self.failed_rows += 1
+                self.last_failed_sequence = sequence
+                logger.error("Ingest buffer row dropped", buffer=self.name, sequence=sequence,
+                             silo_id=row.get("silo_id"), error=str(e))
+                continue
+            written.append((sequence, row))
+        return written
+
+    async def _write(self, rows: List[Dict[str, Any]]):
+        async with AsyncSessionLocal() as db:
+            await insert_readings(db, rows)
+            await db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer metrics"""
+        return {
+            "running": self.running,
+            "queue_depth": self.queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "flushed_rows": self.flushed_rows,
+            "failed_rows": self.failed_rows,
+            "retried_flushes": self.retried_flushes,
+            "flush_count": self.flush_count,
+            "last_flush_rows": self.last_flush_rows,
+            "last_flush_latency_ms": self.last_flush_latency_ms,
+            "max_flush_latency_ms": self.max_flush_latency_ms,
+            "last_flushed_sequence": self.last_flushed_sequence,
+            "last_failed_sequence": self.last_failed_sequence
+        }
+
+# Global buffer used by the HTTP async ingest endpoint
+ingest_buffer = ReadingIngestBuffer()
@@ -0,0 +1,176 @@
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import time
+from sqlalchemy import and_, func, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.silo import Silo, SiloReadingRollup, SiloLatestReading
+from app.models.alert import Alert
+from app.models.logistics import Logistics
+from app.services.periodic import PeriodicTask
+from app.services.reading_rollups import bucket_start, rollup_stats_columns
+from app.services.websocket_manager import websocket_manager
+
+logger = structlog.get_logger()
+
+def kpi_statement(now: datetime):
+    """
+    Every dashboard KPI in one statement: one single-row CTE per source
+    table, joined into one result row
+    """
+    yesterday = now - timedelta(days=1)
+    week_ago = now - timedelta(days=7)
+
+    silo_stats = select(
+        func.count(Silo.id).label("total_silos"),
+        func.count(Silo.id).filter(Silo.status == "active").label("active_silos"),
+        func.coalesce(func.sum(Silo.capacity_tons), 0).label("total_capacity")
+    ).cte("silo_stats")
+
+    volume_stats = select(
+        func.coalesce(func.sum(SiloLatestReading.volume_tons), 0).label("current_volume")
+    ).cte("volume_stats")
+
+    # Average temperature and humidity from last 24 hours (hourly rollups)
+    reading_stats = select(*rollup_stats_columns()).where(
+        and_(
+            SiloReadingRollup.resolution == "hour",
+            SiloReadingRollup.bucket_start >= bucket_start(yesterday, "hour")
+        )
+    ).cte("reading_stats")
+
+    # One pass over the open and recent alerts; the WHERE lets the open-alert
+    # and created_at indexes serve it instead of scanning the whole table
+    open_alert = Alert.is_resolved == False
+    recent_alert = Alert.created_at >= week_ago
+    alert_stats = select(
+        func.count().filter(open_alert).label("active_alerts"),
+        func.count().filter(and_(open_alert, Alert.severity == "critical")).label("critical_alerts"),
+        func.count().filter(recent_alert).label("recent_alerts")
+    ).where(or_(open_alert, recent_alert)).cte("alert_stats")
+
+    logistics_stats = select(
+        func.count(Logistics.id).label("total_logistics"),
+        func.count(Logistics.id).filter(Logistics.status == "in_transit").label("in_transit"),
+        func.count(Logistics.id).filter(
+            and_(Logistics.status == "delivered", Logistics.actual_arrival >= yesterday)
+        ).label("delivered_today")
+    ).cte("logistics_stats")
+
+    # Each CTE is exactly one row
+    return select(silo_stats, volume_stats, reading_stats, alert_stats, logistics_stats).select_from(
+        silo_stats
+        .join(volume_stats, true())
+        .join(reading_stats, true())
+        .join(alert_stats, true())
+        .join(logistics_stats, true())
+    )
+
+async def compute_kpis(db: AsyncSession) -> Dict[str, Any]:
+    """Run the KPI statement and shape the dashboard payload"""
+    now = datetime.utcnow()
+    stats = (await db.execute(kpi_statement(now))).one()
+
+    total_capacity = stats.total_capacity
+    current_volume = stats.current_volume
+
+    return {
+        "silos": {
+            "total": stats.total_silos,
+            "active": stats.active_silos,
+            "capacity_utilization": round((current_volume / total_capacity * 100), 2) if total_capacity > 0 else 0,
+            "total_capacity_tons": float(total_capacity),
+            "current_volume_tons": float(current_volume)
+        },
+        "readings": {
+            "average_temperature": round(float(stats.avg_temperature), 2) if stats.avg_temperature else 0,
+            "average_humidity": round(float(stats.avg_humidity), 2) if stats.avg_humidity else 0,
+            "total_readings_24h": stats.readings_count or 0
+        },
+        "alerts": {
+            "active": stats.active_alerts,
+            "critical": stats.critical_alerts,
+            "recent_7_days": stats.recent_alerts
+        },
+        "logistics": {
+            "total": stats.total_logistics,
+            "in_transit": stats.in_transit,
+            "delivered_today": stats.delivered_today
+        },
+        "timestamp": now.isoformat()
+    }
+
+class KPISnapshotCache:
+    """
+    Shared dashboard KPI snapshot.
+
+    The snapshot is recomputed at most once per DASHBOARD_KPI_TTL_SECONDS
+    however many dashboards poll. A background task refreshes it ahead of
+    expiry; without it, the first request after expiry recomputes while
+    concurrent requests wait on the same lock instead of querying too.
+    The cache is per process.
+    """
+
+    def __init__(self, ttl_seconds: int = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.DASHBOARD_KPI_TTL_SECONDS
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self._lock = asyncio.Lock()
+        # Refresh a little before expiry so pollers never see a stale snapshot
+        self._loop = PeriodicTask("KPI snapshot refresh", self.refresh, max(self.ttl_seconds * 0.8, 0.5))
+
+        # Metrics
+        self.refreshes = 0
+
+    @property
+    def refresh_failures(self) -> int:
+        return self._loop.failures
+
+    def age(self) -> Optional[float]:
+        if self._snapshot is None:
+            return None
+        return time.monotonic() - self._computed_at
+
+    def _is_fresh(self) -> bool:
+        age = self.age()
+        return age is not None and age < self.ttl_seconds
+
+    async def get(self) -> Tuple[Dict[str, Any], float]:
+        """Current snapshot and its age in seconds"""
+        if not self._is_fresh():
+            async with self._lock:
+                # Another request may have refreshed while we waited
+                if not self._is_fresh():
+                    await self._refresh()
+        return self._snapshot, self.age()
+
+    async def refresh(self):
+        """Recompute the snapshot now"""
+        async with self._lock:
+            await self._refresh()
+
+    async def _refresh(self):
+        async with AsyncSessionLocal() as db:
+            snapshot = await compute_kpis(db)
+        previous = self._snapshot
+        self._snapshot = snapshot
+        self._computed_at = time.monotonic()
+        self.refreshes += 1
+
+        # Push to dashboard subscribers only when a figure changed
+        if previous is None or {**previous, "timestamp": None} != {**snapshot, "timestamp": None}:
+            await websocket_manager.broadcast_dashboard_kpis(snapshot)
+
+    def start(self):
+        """Start the background refresh loop"""
+        self._loop.start()
+
+    async def stop(self):
+        await self._loop.stop()
+
+# Global snapshot cache, refreshed in the background when DASHBOARD_KPI_BACKGROUND_REFRESH is set
+kpi_snapshot = KPISnapshotCache()
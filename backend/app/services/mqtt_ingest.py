@@ -0,0 +1,204 @@
+from typing import Any, Dict, Optional
+import asyncio
+import json
+from asyncio_mqtt import Client, MqttError
+from pydantic import ValidationError
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.schemas.silo import SiloReadingBatchItem
+from app.services.ingest_buffer import ReadingIngestBuffer
+from app.services.reading_ingest import build_reading_row
+from app.services.silo_registry import silo_registry
+
+logger = structlog.get_logger()
+
+class MQTTIngestWorker:
+    """
+    MQTT subscriber that ingests silo readings published by gateways.
+
+    Devices publish to MQTT_READINGS_TOPIC (agrotrack/silos/{id}/readings by
+    default) either a single SiloReadingInput object or a list of them, each
+    with an optional ISO timestamp. Valid readings are handed to a dedicated
+    write-behind buffer that batch-inserts them.
+
+    The MQTT client acknowledges a message as soon as it is read off the
+    socket, so publishers cannot be slowed down from here. Received messages
+    wait in a bounded queue (MQTT_MESSAGE_QUEUE_SIZE) for the handler task,
+    which pauses while the write-behind buffer is full; once that queue is
+    full too, new messages are dropped and counted in dropped_messages
+    instead of growing memory without bound. A message that fails to
+    process is logged and skipped, and the connection loop restarts on any
+    error.
+    """
+
+    def __init__(self, message_queue_size: int = settings.MQTT_MESSAGE_QUEUE_SIZE):
+        self.topic = settings.MQTT_READINGS_TOPIC
+        self.buffer = ReadingIngestBuffer(name="mqtt", max_queue_size=settings.MQTT_INGEST_MAX_QUEUE)
+        self.message_queue_size = message_queue_size
+        self._messages: asyncio.Queue = asyncio.Queue(maxsize=message_queue_size)
+        self._silo_segment = self.topic.split("/").index("+")
+        self._task: Optional[asyncio.Task] = None
+        self._handler: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.connected = False
+        self.reconnects = 0
+        self.messages_received = 0
+        self.dropped_messages = 0
+        self.failed_messages = 0
+        self.readings_received = 0
+        self.invalid_messages = 0
+        self.invalid_readings = 0
+        self.unknown_silo_readings = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the subscriber, its message handler and its flusher"""
+        if self.running:
+            return
+        self.buffer.start()
+        self._handler = asyncio.create_task(self._handle_messages())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Disconnect from the broker and drain buffered readings"""
+        for task in (self._task, self._handler):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._handler = None
+        self.connected = False
+        await self.buffer.stop()
+
+    async def _run(self):
+        while True:
+            try:
+                async with Client(
+                    hostname=settings.MQTT_BROKER_HOST,
+                    port=settings.MQTT_BROKER_PORT,
+                    username=settings.MQTT_USERNAME,
+                    password=settings.MQTT_PASSWORD,
+                    client_id=settings.MQTT_CLIENT_ID
+                ) as client:
+                    # Drained straight into self._messages, so it never holds more than a few
+                    async with client.unfiltered_messages(queue_maxsize=self.message_queue_size) as messages:
+                        await client.subscribe(self.topic, qos=settings.MQTT_QOS)
+                        self.connected = True
+                        logger.info("MQTT ingest subscribed",
+                                    broker=settings.MQTT_BROKER_HOST,
+                                    topic=self.topic)
+                        async for message in messages:
+                            self._enqueue(message.topic, message.payload)
+            except MqttError as e:
+                self.reconnects += 1
+                logger.warning("MQTT connection lost, reconnecting",
+                               error=str(e),
+                               retry_in=settings.MQTT_RECONNECT_INTERVAL_SECONDS)
+            except Exception as e:
+                self.reconnects += 1
+                logger.error("MQTT ingest loop failed, restarting",
+                             error=str(e),
+                             error_type=type(e).__name__,
+                             retry_in=settings.MQTT_RECONNECT_INTERVAL_SECONDS)
+            finally:
+                self.connected = False
+            await asyncio.sleep(settings.MQTT_RECONNECT_INTERVAL_SECONDS)
+
+    def _enqueue(self, topic: Any, payload: bytes):
+        self.messages_received += 1
+        try:
+            self._messages.put_nowait((str(topic), payload))
+        except asyncio.QueueFull:
+            self.dropped_messages += 1
+            if self.dropped_messages % 1000 == 1:
+                logger.warning("MQTT message queue full, dropping messages",
+                               dropped_messages=self.dropped_messages,
+                               queue_size=self.message_queue_size)
+
+    async def _handle_messages(self):
+        while True:
+            topic, payload = await self._messages.get()
+            try:
+                await self._handle_message(topic, payload)
+            except Exception as e:
+                self.failed_messages += 1
+                logger.error("MQTT message handling failed",
+                             topic=topic,
+                             error=str(e),
+                             error_type=type(e).__name__)
+
+    def _parse_silo_id(self, topic: str) -> Optional[int]:
+        parts = topic.split("/")
+        try:
+            return int(parts[self._silo_segment])
+        except (IndexError, ValueError):
+            return None
+
+    async def _handle_message(self, topic: str, payload: bytes):
+        silo_id = self._parse_silo_id(topic)
+        try:
+            data = json.loads(payload)
+        except (ValueError, UnicodeDecodeError):
+            data = None
+        if silo_id is None or not isinstance(data, (dict, list)):
+            self.invalid_messages += 1
+            logger.debug("Invalid MQTT reading message", topic=topic)
+            return
+
+        async with AsyncSessionLocal() as db:
+            silo = await silo_registry.get(db, silo_id)
+
+        items = data if isinstance(data, list) else [data]
+        self.readings_received += len(items)
+        if not silo:
+            self.unknown_silo_readings += len(items)
+            return
+
+        for item in items:
+            if not isinstance(item, dict):
+                self.invalid_readings += 1
+                continue
+            try:
+                reading = SiloReadingBatchItem.model_validate({**item, "silo_id": silo_id})
+            except ValidationError:
+                self.invalid_readings += 1
+                continue
+
+            row = build_reading_row(
+                silo_id,
+                reading.model_dump(exclude={"silo_id", "timestamp"}),
+                silo.capacity_tons,
+                reading.timestamp
+            )
+            # Waits while the buffer is full; received messages queue up meanwhile
+            await self.buffer.put(row)
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker and buffer metrics"""
+        return {
+            "running": self.running,
+            "connected": self.connected and self.running,
+            "topic": self.topic,
+            "reconnects": self.reconnects,
+            "messages_received": self.messages_received,
+            "queued_messages": self._messages.qsize(),
+            "dropped_messages": self.dropped_messages,
+            "failed_messages": self.failed_messages,
+            "readings_received": self.readings_received,
+            "invalid_messages": self.invalid_messages,
+            "invalid_readings": self.invalid_readings,
+            "unknown_silo_readings": self.unknown_silo_readings,
+            "buffer": self.buffer.stats()
+        }
+
+# Global worker instance, started when MQTT_INGEST_ENABLED is set
+mqtt_ingest_worker = MQTTIngestWorker()
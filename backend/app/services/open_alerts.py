@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+import asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import structlog
+
+from app.models.alert import Alert
+
+logger = structlog.get_logger()
+
+AlertKey = Tuple[int, str, str]  # silo_id, alert_type, severity
+
+# Session.info flag set while a transaction has changed the index
+DIRTY_KEY = "open_alerts_dirty"
+
+# Session.info key collecting alerts upserted by the open transaction
+PENDING_ALERTS_KEY = "pending_open_alerts"
+
+@dataclass
+class OpenAlert:
+    """Auto-resolve state of one unresolved alert"""
+    id: UUID
+    last_seen: Optional[datetime]
+    clear_streak: int = 0
+
+def lower_is_worse(alert_type: str, value, threshold) -> bool:
+    """Low-volume alerts get worse as the value drops, every other rule as it rises"""
+    return alert_type == "volume" and value is not None and threshold is not None and value < threshold
+
+class OpenAlertIndex:
+    """
+    In-process index of unresolved alerts keyed by (silo_id, alert_type,
+    severity), holding the clear-reading streaks that drive auto-resolve.
+    Coalescing repeat breaches is left to the unique index on open alert
+    keys; the database stays the source of truth.
+
+    Only committed alerts enter the index: upserted alerts are queued on the
+    session with stage() and added once the transaction commits, so no other
+    coroutine can resolve an alert it cannot see yet. Nothing here is held
+    across database I/O. The index is loaded lazily (concurrent callers share
+    one load) and reloaded after invalidate(), which is called when a
+    transaction that changed it ends without committing and when alerts are
+    edited through the API.
+    """
+
+    def __init__(self):
+        self._alerts: Dict[AlertKey, OpenAlert] = {}
+        self._by_silo: Dict[int, Set[AlertKey]] = {}
+        self._loaded = False
+        self._loading: Optional[asyncio.Future] = None
+        self.version = 0
+
+    async def ensure_loaded(self, db: AsyncSession):
+        while not self._loaded:
+            if self._loading is not None:
+                # Another coroutine is loading; retry if its load was discarded or failed
+                await asyncio.shield(self._loading)
+                continue
+            self._loading = asyncio.get_running_loop().create_future()
+            try:
+                await self._load(db)
+            finally:
+                self._loading.set_result(None)
+                self._loading = None
+
+    async def _load(self, db: AsyncSession):
+        version = self.version
+        result = await db.execute(
+            select(
+                Alert.id, Alert.silo_id, Alert.alert_type, Alert.severity, Alert.last_seen, Alert.created_at
+            ).where(Alert.is_resolved == False).order_by(Alert.created_at)
+        )
+        rows = result.all()
+        if version != self.version:
+            # Invalidated while the query ran: the rows may be stale
+            return
+
+        self._alerts = {}
+        self._by_silo = {}
+        # Ordered oldest first so the newest of any legacy duplicates wins
+        for row in rows:
+            self.add(
+                (row.silo_id, row.alert_type, row.severity),
+                OpenAlert(id=row.id, last_seen=row.last_seen or row.created_at)
+            )
+        self._loaded = True
+        logger.info("Open alert index loaded", open_alerts=len(self._alerts))
+
+    def invalidate(self):
+        self.version += 1
+        self._loaded = False
+
+    def mark_dirty(self, db: AsyncSession):
+        """Reload the index if the caller's transaction rolls back"""
+        db.info[DIRTY_KEY] = True
+
+    def stage(self, db: AsyncSession, key: AlertKey, alert_id: UUID, last_seen: Optional[datetime]):
+        """Record an alert upserted by the caller's transaction, indexed once it commits"""
+        db.info.setdefault(PENDING_ALERTS_KEY, []).append((key, alert_id, last_seen))
+
+    def _apply(self, pending: Iterable[Tuple[AlertKey, UUID, Optional[datetime]]]):
+        for key, alert_id, last_seen in pending:
+            open_alert = self._alerts.get(key)
+            if open_alert is None or open_alert.id != alert_id:
+                self.add(key, OpenAlert(id=alert_id, last_seen=last_seen))
+            elif open_alert.last_seen is None or (last_seen is not None and last_seen > open_alert.last_seen):
+                open_alert.last_seen = last_seen
+
+    def get(self, key: AlertKey) -> Optional[OpenAlert]:
+        return self._alerts.get(key)
+
+    def add(self, key: AlertKey, alert: OpenAlert):
+        self._alerts[key] = alert
+        self._by_silo.setdefault(key[0], set()).add(key)
+
+    def remove(self, key: AlertKey) -> Optional[OpenAlert]:
+        alert = self._alerts.pop(key, None)
+        keys = self._by_silo.get(key[0])
+        if keys:
+            keys.discard(key)
+        return alert
+
+    def discard_ids(self, alert_ids: Iterable[UUID]):
+        """Forget alerts resolved or deleted elsewhere"""
+        alert_ids = {UUID(str(alert_id)) for alert_id in alert_ids}
+        for key in [key for key, alert in self._alerts.items() if alert.id in alert_ids]:
+            self.remove(key)
+
+    def for_silo(self, silo_id: int) -> List[Tuple[AlertKey, OpenAlert]]:
+        return [(key, self._alerts[key]) for key in self._by_silo.get(silo_id, ())]
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+@event.listens_for(Session, "after_commit")
+def _index_committed_alerts(session: Session):
+    session.info.pop(DIRTY_KEY, None)
+    open_alert_index._apply(session.info.pop(PENDING_ALERTS_KEY, ()))
+
+@event.listens_for(Session, "after_rollback")
+def _reload_after_rollback(session: Session):
+    session.info.pop(PENDING_ALERTS_KEY, None)
+    if session.info.pop(DIRTY_KEY, None):
+        open_alert_index.invalidate()
+
+@event.listens_for(Session, "after_transaction_end")
+def _reload_after_close(session: Session, transaction):
+    if transaction.parent is not None:
+        return
+    # Closed without commit or rollback: streaks may reflect uncommitted resolves
+    session.info.pop(PENDING_ALERTS_KEY, None)
+    if session.info.pop(DIRTY_KEY, None):
+        open_alert_index.invalidate()
+
+# Global open alert index
+open_alert_index = OpenAlertIndex()
@@ -0,0 +1,154 @@
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import re
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+import structlog
+
+from app.core.config import settings
+from app.core.database import async_engine
+from app.services.periodic import PeriodicTask
+
+logger = structlog.get_logger()
+
+PARENT_TABLE = "silo_readings"
+DEFAULT_PARTITION = "silo_readings_default"
+PARTITION_NAME_RE = re.compile(r"^silo_readings_p(\d{8})_(\d{8})$")
+
+# Serializes maintenance across worker processes
+ADVISORY_LOCK_ID = 740_120_001
+
+def floor_to_interval(moment: datetime, interval: str) -> datetime:
+    """Start of the partition interval containing moment (UTC)"""
+    day = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "day":
+        return day
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unsupported partition interval: {interval}")
+
+def next_interval(start: datetime, interval: str) -> datetime:
+    """Start of the partition interval following start"""
+    if interval == "day":
+        return start + timedelta(days=1)
+    if interval == "week":
+        return start + timedelta(weeks=1)
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    raise ValueError(f"Unsupported partition interval: {interval}")
+
+def partition_name(start: datetime, end: datetime) -> str:
+    return f"{PARENT_TABLE}_p{start:%Y%m%d}_{end:%Y%m%d}"
+
+class PartitionManager:
+    """
+    Maintains the time partitions of silo_readings.
+
+    Each run pre-creates the current partition plus READINGS_PARTITION_PREMAKE
+    future ones, and detaches (optionally drops) partitions whose whole range
+    is older than READINGS_RETENTION_DAYS. Rows that landed in the default
+    partition are moved into a new partition before it is attached.
+    """
+
+    def __init__(self):
+        self.interval = settings.READINGS_PARTITION_INTERVAL
+        self._loop = PeriodicTask(
+            "Partition maintenance", self.run_once, settings.PARTITION_MANAGER_INTERVAL_SECONDS
+        )
+        self.last_run_at: Optional[datetime] = None
+
+    def start(self):
+        """Start the periodic maintenance loop"""
+        self._loop.start()
+
+    async def stop(self):
+        await self._loop.stop()
+
+    async def run_once(self, now: datetime = None):
+        """Create upcoming partitions and expire old ones"""
+        now = now or datetime.now(timezone.utc)
+
+        async with async_engine.begin() as conn:
+            locked = await conn.scalar(text("SELECT pg_try_advisory_xact_lock(:id)"), {"id": ADVISORY_LOCK_ID})
+            if not locked:
+                return
+
+            relkind = await conn.scalar(
+                text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:parent)"),
+                {"parent": PARENT_TABLE}
+            )
+            if relkind != "p":
+                # Tables created before partitioning are converted by migration 0004
+                logger.error("Readings table is not partitioned, run 'alembic upgrade head'", table=PARENT_TABLE)
+                return
+
+            existing = await self._list_partitions(conn)
+            existing_names = {name for name, _, _ in existing}
+
+            start = floor_to_interval(now, self.interval)
+            for _ in range(settings.READINGS_PARTITION_PREMAKE + 1):
+                end = next_interval(start, self.interval)
+                if partition_name(start, end) not in existing_names and not self._overlaps(existing, start, end):
+                    await self._create_partition(conn, start, end)
+                start = end
+
+            if settings.READINGS_RETENTION_DAYS > 0:
+                cutoff = now - timedelta(days=settings.READINGS_RETENTION_DAYS)
+                for name, _, end in existing:
+                    if end <= cutoff:
+                        await self._expire_partition(conn, name)
+
+        self.last_run_at = now
+
+    async def _list_partitions(self, conn: AsyncConnection) -> List[Tuple[str, datetime, datetime]]:
+        result = await conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ), {"parent": PARENT_TABLE})
+
+        partitions = []
+        for (name,) in result:
+            match = PARTITION_NAME_RE.match(name)
+            if match:
+                start = datetime.strptime(match.group(1), "%Y%m%d").replace(tzinfo=timezone.utc)
+                end = datetime.strptime(match.group(2), "%Y%m%d").replace(tzinfo=timezone.utc)
+                partitions.append((name, start, end))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @staticmethod
+    def _overlaps(existing: List[Tuple[str, datetime, datetime]], start: datetime, end: datetime) -> bool:
+        # Partitions made under a previous interval setting keep their ranges
+        return any(other_start < end and start < other_end for _, other_start, other_end in existing)
+
+    async def _create_partition(self, conn: AsyncConnection, start: datetime, end: datetime):
+        name = partition_name(start, end)
+        bounds = {"start": start, "end": end}
+
+        await conn.execute(text(
+            f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        # Attaching fails while the default partition holds rows of this range
+        await conn.execute(text(
+            f"WITH moved AS ("
+            f"DELETE FROM {DEFAULT_PARTITION} WHERE timestamp >= :start AND timestamp < :end RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ), bounds)
+        await conn.execute(text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        ))
+        logger.info("Readings partition created", partition=name)
+
+    async def _expire_partition(self, conn: AsyncConnection, name: str):
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if settings.READINGS_RETENTION_DROP:
+            await conn.execute(text(f"DROP TABLE {name}"))
+            logger.info("Readings partition dropped", partition=name)
+        else:
+            logger.info("Readings partition detached", partition=name)
+
+# Global partition manager instance
+partition_manager = PartitionManager()
@@ -0,0 +1,58 @@
+from typing import Awaitable, Callable, Optional
+import asyncio
+import structlog
+
+logger = structlog.get_logger()
+
+class PeriodicTask:
+    """
+    Background loop calling run every interval seconds.
+
+    A failing run is logged as "{name} failed" and counted, and the loop
+    carries on. The first run happens on start unless delay_first is set.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[None]],
+        interval: float,
+        delay_first: bool = False
+    ):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        self.delay_first = delay_first
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.failures = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        if self.delay_first:
+            await asyncio.sleep(self.interval)
+        while True:
+            try:
+                await self.run()
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"{self.name} failed", error=str(e))
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,122 @@
+from typing import Any, AsyncIterator, List, Optional, Sequence
+from datetime import datetime
+from decimal import Decimal
+import asyncio
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+import structlog
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.silo import SiloReading
+from app.services.archive import reading_archive
+
+logger = structlog.get_logger()
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_FIELDS = ("silo_id", "timestamp", "temperature", "humidity", "volume_percent", "volume_tons", "id")
+
+def export_query(silo_id: int, start: Optional[datetime], end: Optional[datetime]):
+    query = select(*[SiloReading.__table__.c[field] for field in EXPORT_FIELDS]).where(
+        SiloReading.silo_id == silo_id
+    )
+    if start:
+        query = query.where(SiloReading.timestamp >= start)
+    if end:
+        query = query.where(SiloReading.timestamp <= end)
+    return query.order_by(SiloReading.timestamp, SiloReading.id)
+
+async def iter_reading_chunks(
+    silo_ids: Sequence[int],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> AsyncIterator[List[Any]]:
+    """
+    Readings of each silo in turn, oldest first, in chunks of
+    EXPORT_CHUNK_SIZE rows: archived months from Parquet, then the database
+    through a server-side cursor. The generator owns its session because it
+    outlives the request handler.
+    """
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    async with AsyncSessionLocal() as db:
+        for silo_id in silo_ids:
+            if reading_archive.covers(silo_id, start):
+                batches = reading_archive.iter_oldest(silo_id, start, end, EXPORT_FIELDS, chunk_size)
+                while True:
+                    rows = await asyncio.to_thread(next, batches, None)
+                    if rows is None:
+                        break
+                    yield rows
+
+            result = await db.stream(
+                export_query(silo_id, start, end).execution_options(yield_per=chunk_size)
+            )
+            async for rows in result.partitions(chunk_size):
+                yield rows
+
+def _csv_chunk(rows: List[Any], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else ("" if value is None else value)
+            for value in row
+        )
+    return buffer.getvalue()
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def _ndjson_chunk(rows: List[Any]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_value, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+async def export_readings(
+    silo_ids: Sequence[int],
+    export_format: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export body for StreamingResponse. Memory use is bounded by one
+    chunk whatever the size of the export.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+    exported = 0
+    header = export_format == "csv"
+
+    async for rows in iter_reading_chunks(silo_ids, start, end):
+        text = _csv_chunk(rows, header) if export_format == "csv" else _ndjson_chunk(rows)
+        header = False
+        exported += len(rows)
+
+        data = text.encode()
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+
+    if header:
+        # No rows at all, still emit the CSV header
+        data = _csv_chunk([], True).encode()
+        yield compressor.compress(data) if compressor else data
+    if compressor:
+        yield compressor.flush()
+
+    logger.info("Readings export finished", silos=len(silo_ids), rows=exported, format=export_format)
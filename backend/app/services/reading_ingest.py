@@ -0,0 +1,173 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from datetime import datetime
+import uuid
+from pydantic import ValidationError
+from sqlalchemy import event, insert, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import structlog
+
+from app.models.silo import SiloReading, SiloLatestReading
+from app.schemas.silo import SiloReadingBatchItem, SiloReadingBatchError
+from app.services.silo_registry import silo_registry
+from app.services.reading_rollups import update_rollups, as_utc
+from app.services.alert_rules import create_reading_alerts
+
+logger = structlog.get_logger()
+
+# Session.info key collecting the reading rows written in the open transaction
+PENDING_READINGS_KEY = "pending_readings"
+
+# Called with the rows of every committed transaction that inserted readings
+committed_readings_hooks: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+def add_committed_readings_hook(hook: Callable[[List[Dict[str, Any]]], None]):
+    """Register a synchronous callback for readings once their transaction commits"""
+    if hook not in committed_readings_hooks:
+        committed_readings_hooks.append(hook)
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed_readings(session: Session):
+    rows = session.info.pop(PENDING_READINGS_KEY, None)
+    if not rows:
+        return
+    for hook in committed_readings_hooks:
+        try:
+            hook(rows)
+        except Exception as e:
+            logger.error("Committed readings hook failed", hook=getattr(hook, "__qualname__", str(hook)), error=str(e))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_readings(session: Session):
+    session.info.pop(PENDING_READINGS_KEY, None)
+
+def build_reading_row(
+    silo_id: int,
+    reading_data: Dict[str, Any],
+    capacity_tons: int = None,
+    timestamp: datetime = None
+) -> Dict[str, Any]:
+    """Build an insertable silo_readings row, deriving volume_tons from capacity"""
+    volume_tons = reading_data.get("volume_tons")
+    if not volume_tons and capacity_tons:
+        volume_tons = (capacity_tons * reading_data["volume_percent"]) / 100
+
+    return {
+        # Generated here so derived tables can reference the row without RETURNING
+        "id": uuid.uuid4(),
+        "silo_id": silo_id,
+        "temperature": reading_data["temperature"],
+        "humidity": reading_data["humidity"],
+        "volume_percent": reading_data["volume_percent"],
+        "volume_tons": volume_tons,
+        # Every row carries the same keys so the batch compiles to one multi-row INSERT
+        "timestamp": timestamp or datetime.utcnow()
+    }
+
+async def prepare_reading_batch(
+    db: AsyncSession,
+    items: Iterable[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[SiloReadingBatchError]]:
+    """
+    Validate raw batch items and resolve their silos from the registry.
+    Returns the insertable rows and the per-item errors.
+    """
+    rows: List[Dict[str, Any]] = []
+    errors: List[SiloReadingBatchError] = []
+    validated: List[Tuple[int, SiloReadingBatchItem]] = []
+
+    for index, raw in enumerate(items):
+        try:
+            validated.append((index, SiloReadingBatchItem.model_validate(raw)))
+        except ValidationError as e:
+            silo_id = raw.get("silo_id") if isinstance(raw, dict) else None
+            errors.append(SiloReadingBatchError(
+                index=index,
+                silo_id=silo_id if isinstance(silo_id, int) else None,
+                detail="; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+                )
+            ))
+
+    silos = await silo_registry.get_many(db, {item.silo_id for _, item in validated})
+
+    for index, item in validated:
+        silo = silos.get(item.silo_id)
+        if not silo:
+            errors.append(SiloReadingBatchError(index=index, silo_id=item.silo_id, detail="Silo not found"))
+            continue
+
+        rows.append(build_reading_row(
+            item.silo_id,
+            item.model_dump(exclude={"silo_id", "timestamp"}),
+            silo.capacity_tons,
+            item.timestamp
+        ))
+
+    errors.sort(key=lambda error: error.index)
+    return rows, errors
+
+async def insert_readings(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert prepared reading rows with one executemany statement and fold
+    them into the rollups. The caller owns the transaction.
+    """
+    if not rows:
+        return 0
+
+    await db.execute(insert(SiloReading), rows)
+    await update_reading_aggregates(db, rows)
+    return len(rows)
+
+async def update_reading_aggregates(db: AsyncSession, rows: List[Dict[str, Any]]):
+    """
+    Refresh every table derived from silo_readings for newly inserted rows.
+    In-memory consumers get the rows through committed_readings_hooks once
+    the caller commits.
+    """
+    await update_rollups(db, rows)
+    await update_latest_readings(db, rows)
+    await create_reading_alerts(db, rows)
+    db.info.setdefault(PENDING_READINGS_KEY, []).extend(rows)
+
+async def update_latest_readings(db: AsyncSession, rows: List[Dict[str, Any]]):
+    """
+    Upsert the newest of rows per silo into silo_latest_reading.
+    Older (late or backfilled) readings never overwrite a newer one.
+    """
+    newest: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        current = newest.get(row["silo_id"])
+        if current is None or as_utc(row["timestamp"]) >= as_utc(current["timestamp"]):
+            newest[row["silo_id"]] = row
+    if not newest:
+        return
+
+    table = SiloLatestReading.__table__
+    stmt = pg_insert(table).values([
+        {
+            "silo_id": silo_id,
+            "reading_id": row["id"],
+            "temperature": row["temperature"],
+            "humidity": row["humidity"],
+            "volume_percent": row["volume_percent"],
+            "volume_tons": row["volume_tons"],
+            "timestamp": row["timestamp"]
+        }
+        for silo_id, row in sorted(newest.items())
+    ])
+    excluded = stmt.excluded
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.silo_id],
+        set_={
+            "reading_id": excluded.reading_id,
+            "temperature": excluded.temperature,
+            "humidity": excluded.humidity,
+            "volume_percent": excluded.volume_percent,
+            "volume_tons": excluded.volume_tons,
+            "timestamp": excluded.timestamp,
+            "created_at": func.now()
+        },
+        where=table.c.timestamp <= excluded.timestamp
+    ))
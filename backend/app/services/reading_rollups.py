@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Tuple
+from datetime import datetime, timezone
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.silo import SiloReadingRollup
+
+ROLLUP_RESOLUTIONS = ("minute", "hour", "day")
+
+METRICS = ("temperature", "humidity", "volume_percent")
+
+UPSERT_CHUNK_SIZE = 1000
+
+def as_utc(moment: datetime) -> datetime:
+    """Normalize a timestamp to aware UTC (naive values are already UTC here)"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+def bucket_start(moment: datetime, resolution: str) -> datetime:
+    """Start of the rollup bucket containing moment"""
+    moment = as_utc(moment)
+    if resolution == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if resolution == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if resolution == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unsupported rollup resolution: {resolution}")
+
+def rollup_stats_columns():
+    """
+    Aggregate columns over a set of rollup rows: readings_count plus the
+    reading-weighted avg_temperature, avg_humidity and avg_volume_percent
+    """
+    count = func.sum(SiloReadingRollup.readings_count)
+    return (
+        func.coalesce(count, 0).label("readings_count"),
+        (func.sum(SiloReadingRollup.temperature_sum) / func.nullif(count, 0)).label("avg_temperature"),
+        (func.sum(SiloReadingRollup.humidity_sum) / func.nullif(count, 0)).label("avg_humidity"),
+        (func.sum(SiloReadingRollup.volume_percent_sum) / func.nullif(count, 0)).label("avg_volume_percent")
+    )
+
+def aggregate_rollups(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fold reading rows into one rollup row per (silo, resolution, bucket)"""
+    buckets: Dict[Tuple[int, str, datetime], Dict[str, Any]] = {}
+
+    for row in rows:
+        timestamp = as_utc(row["timestamp"])
+        for resolution in ROLLUP_RESOLUTIONS:
+            key = (row["silo_id"], resolution, bucket_start(timestamp, resolution))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = {
+                    "silo_id": key[0],
+                    "resolution": resolution,
+                    "bucket_start": key[2],
+                    "readings_count": 0,
+                    "last_timestamp": timestamp
+                }
+                for metric in METRICS:
+                    bucket[f"{metric}_sum"] = 0
+                    bucket[f"{metric}_min"] = row[metric]
+                    bucket[f"{metric}_max"] = row[metric]
+                    bucket[f"last_{metric}"] = row[metric]
+                bucket["last_volume_tons"] = row["volume_tons"]
+                buckets[key] = bucket
+
+            bucket["readings_count"] += 1
+            for metric in METRICS:
+                value = row[metric]
+                bucket[f"{metric}_sum"] += value
+                bucket[f"{metric}_min"] = min(bucket[f"{metric}_min"], value)
+                bucket[f"{metric}_max"] = max(bucket[f"{metric}_max"], value)
+            if timestamp >= bucket["last_timestamp"]:
+                bucket["last_timestamp"] = timestamp
+                for metric in METRICS:
+                    bucket[f"last_{metric}"] = row[metric]
+                bucket["last_volume_tons"] = row["volume_tons"]
+
+    # Stable key order keeps concurrent upserts from deadlocking on each other
+    return [buckets[key] for key in sorted(buckets)]
+
+async def update_rollups(db: AsyncSession, rows: List[Dict[str, Any]]):
+    """
+    Merge freshly inserted reading rows into silo_reading_rollups with
+    INSERT ... ON CONFLICT DO UPDATE. Runs in the caller's transaction.
+    """
+    rollups = aggregate_rollups(rows)
+
+    # Chunked to stay under the driver's bind parameter limit
+    for offset in range(0, len(rollups), UPSERT_CHUNK_SIZE):
+        await db.execute(_upsert_statement(rollups[offset:offset + UPSERT_CHUNK_SIZE]))
+
+def _upsert_statement(rollups: List[Dict[str, Any]]):
+    table = SiloReadingRollup.__table__
+    stmt = pg_insert(table).values(rollups)
+    excluded = stmt.excluded
+    is_newer = excluded.last_timestamp >= table.c.last_timestamp
+
+    updates = {
+        "readings_count": table.c.readings_count + excluded.readings_count,
+        "last_timestamp": func.greatest(table.c.last_timestamp, excluded.last_timestamp),
+        "last_volume_tons": case((is_newer, excluded.last_volume_tons), else_=table.c.last_volume_tons)
+    }
+    for metric in METRICS:
+        updates[f"{metric}_sum"] = table.c[f"{metric}_sum"] + excluded[f"{metric}_sum"]
+        updates[f"{metric}_min"] = func.least(table.c[f"{metric}_min"], excluded[f"{metric}_min"])
+        updates[f"{metric}_max"] = func.greatest(table.c[f"{metric}_max"], excluded[f"{metric}_max"])
+        updates[f"last_{metric}"] = case((is_newer, excluded[f"last_{metric}"]), else_=table.c[f"last_{metric}"])
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.silo_id, table.c.resolution, table.c.bucket_start],
+        set_=updates
+    )
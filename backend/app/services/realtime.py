@@ -0,0 +1,156 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import structlog
+
+from app.core.config import settings
+from app.services.periodic import PeriodicTask
+from app.services.reading_rollups import as_utc
+from app.services.websocket_manager import websocket_manager
+
+logger = structlog.get_logger()
+
+# Session.info key collecting publish calls deferred until the open transaction commits
+PENDING_EVENTS_KEY = "pending_realtime_events"
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def publish_after_commit(db: AsyncSession, publish: Callable[..., None], *args: Any):
+    """Call publish(*args) once the caller's transaction commits; dropped on rollback"""
+    db.info.setdefault(PENDING_EVENTS_KEY, []).append((publish, args))
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending_events(session: Session):
+    for publish, args in session.info.pop(PENDING_EVENTS_KEY, ()):
+        try:
+            publish(*args)
+        except Exception as e:
+            logger.error("Realtime publish failed", publish=getattr(publish, "__qualname__", str(publish)), error=str(e))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+class RealtimePublisher:
+    """
+    Pushes committed writes to WebSocket subscribers, coalesced per tick.
+
+    Writes record their changes here without touching any socket. Every
+    REALTIME_TICK_MS the pending changes are flushed as one delta frame per
+    silo (newest reading, sample count and changed fields) and per shipment
+    (merged tracking and status fields), one frame per new or edited alert
+    and one alerts_resolved frame for the tick, so a burst of samples
+    becomes a single message. Only clients of this process are reached.
+    """
+
+    def __init__(self, tick_ms: int = settings.REALTIME_TICK_MS):
+        self.tick_seconds = tick_ms / 1000
+        self._silos: Dict[int, Dict[str, Any]] = {}
+        self._logistics: Dict[str, Dict[str, Any]] = {}
+        self._alerts: List[Dict[str, Any]] = []
+        self._resolved: Dict[str, Tuple[int, str]] = {}
+        self._loop = PeriodicTask("Realtime flush", self.flush, self.tick_seconds, delay_first=True)
+
+        # Metrics
+        self.events = 0
+        self.frames = 0
+
+    @property
+    def running(self) -> bool:
+        return self._loop.running
+
+    def _silo(self, silo_id: int) -> Dict[str, Any]:
+        delta = self._silos.get(silo_id)
+        if delta is None:
+            delta = self._silos[silo_id] = {"reading": None, "samples": 0, "changes": {}}
+        return delta
+
+    def readings_committed(self, rows: List[Dict[str, Any]]):
+        """Committed readings hook (rows as built by build_reading_row)"""
+        if not self.running:
+            return
+        for row in rows:
+            delta = self._silo(row["silo_id"])
+            delta["samples"] += 1
+            latest = delta["reading"]
+            if latest is None or as_utc(row["timestamp"]) >= as_utc(latest["timestamp"]):
+                delta["reading"] = row
+        self.events += len(rows)
+
+    def silo_changed(self, silo_id: int, changes: Dict[str, Any]):
+        if not self.running:
+            return
+        self._silo(silo_id)["changes"].update(changes)
+        self.events += 1
+
+    def logistics_changed(self, logistics_id: Any, changes: Dict[str, Any]):
+        if not self.running:
+            return
+        self._logistics.setdefault(str(logistics_id), {}).update(changes)
+        self.events += 1
+
+    def alerts_changed(self, alerts: Iterable[Dict[str, Any]]):
+        if not self.running:
+            return
+        for alert in alerts:
+            self._alerts.append(alert)
+            self.events += 1
+
+    def alerts_resolved(self, resolved: Iterable[Tuple[Any, int, str]]):
+        """Resolved alerts as (alert_id, silo_id, severity)"""
+        if not self.running:
+            return
+        for alert_id, silo_id, severity in resolved:
+            self._resolved[str(alert_id)] = (silo_id, severity)
+            self.events += 1
+
+    async def flush(self):
+        """Publish everything recorded since the previous flush"""
+        silos, self._silos = self._silos, {}
+        logistics, self._logistics = self._logistics, {}
+        alerts, self._alerts = self._alerts, []
+        resolved, self._resolved = self._resolved, {}
+
+        for alert in alerts:
+            await websocket_manager.broadcast_alert(_jsonable(alert))
+        if resolved:
+            by_silo: Dict[str, int] = {}
+            by_severity: Dict[str, int] = {}
+            for silo_id, severity in resolved.values():
+                by_silo[str(silo_id)] = by_silo.get(str(silo_id), 0) + 1
+                by_severity[severity] = by_severity.get(severity, 0) + 1
+            await websocket_manager.broadcast_alerts_resolved({
+                "count": len(resolved),
+                "alert_ids": list(resolved),
+                "by_silo": by_silo,
+                "by_severity": by_severity
+            })
+        for silo_id, delta in silos.items():
+            await websocket_manager.broadcast_silo_update(silo_id, _jsonable(delta))
+        for logistics_id, changes in logistics.items():
+            await websocket_manager.broadcast_logistics_update(logistics_id, _jsonable(changes))
+
+        self.frames += len(alerts) + bool(resolved) + len(silos) + len(logistics)
+
+    def start(self):
+        """Start the tick loop"""
+        self._loop.start()
+
+    async def stop(self):
+        await self._loop.stop()
+
+# Global publisher, ticking when REALTIME_ENABLED is set
+realtime_publisher = RealtimePublisher()
@@ -0,0 +1,248 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.config import settings
+from app.models.silo import SiloReading, SiloReadingRollup, SiloLatestReading
+from app.services.reading_rollups import as_utc, bucket_start
+
+logger = structlog.get_logger()
+
+# Value columns of the sample ring, in order
+RING_COLUMNS = ("temperature", "humidity", "volume_percent", "volume_tons")
+
+# Metrics summed per hour for the 24 h statistics
+HOURLY_METRICS = ("temperature", "humidity", "volume_percent")
+
+# The current partial hour, the 24 before it and one slot of slack
+HOURLY_SLOTS = 26
+
+def to_ms(moment: datetime) -> int:
+    return int(as_utc(moment).timestamp() * 1000)
+
+def _as_float(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+class SiloRing:
+    """
+    Recent readings of one silo: a fixed-size ring of samples (int64 epoch
+    milliseconds, float32 values) kept in time order, hourly sums for the
+    24 h statistics, and the latest reading as a full record.
+
+    covered_since is the epoch millisecond from which the ring is known to
+    hold every reading; windows starting earlier must go to the database.
+    """
+
+    __slots__ = (
+        "capacity", "timestamps", "values", "size", "head", "covered_since",
+        "latest", "hours", "hour_counts", "hour_sums"
+    )
+
+    def __init__(self, capacity: int, covered_since: int):
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full((capacity, len(RING_COLUMNS)), np.nan, dtype=np.float32)
+        self.size = 0
+        self.head = 0
+        self.covered_since = covered_since
+        self.latest: Optional[Dict[str, Any]] = None
+        self.hours = np.full(HOURLY_SLOTS, -1, dtype=np.int64)
+        self.hour_counts = np.zeros(HOURLY_SLOTS, dtype=np.int64)
+        self.hour_sums = np.zeros((HOURLY_SLOTS, len(HOURLY_METRICS)), dtype=np.float64)
+
+    def newest_ms(self) -> Optional[int]:
+        return int(self.timestamps[self.head - 1]) if self.size else None
+
+    def append(self, timestamp_ms: int, values: Tuple[float, ...]):
+        newest = self.newest_ms()
+        if newest is not None and timestamp_ms < newest:
+            # Out-of-order reading: keep the ring sorted and stop claiming
+            # coverage of the time it belongs to
+            self.covered_since = max(self.covered_since, timestamp_ms + 1)
+            return
+
+        if self.size == self.capacity:
+            # Overwriting the oldest sample moves coverage past it
+            self.covered_since = max(self.covered_since, int(self.timestamps[self.head]) + 1)
+        self.timestamps[self.head] = timestamp_ms
+        self.values[self.head] = values
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def add_hourly(self, hour: int, count: int, sums: Tuple[float, ...]):
+        slot = hour % HOURLY_SLOTS
+        if self.hours[slot] != hour:
+            if self.hours[slot] > hour:
+                # Slot already holds a later hour, this one is too old to matter
+                return
+            self.hours[slot] = hour
+            self.hour_counts[slot] = 0
+            self.hour_sums[slot] = 0
+        self.hour_counts[slot] += count
+        self.hour_sums[slot] += sums
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples oldest first"""
+        if self.size < self.capacity:
+            return self.timestamps[:self.size], self.values[:self.size]
+        return np.roll(self.timestamps, -self.head), np.roll(self.values, -self.head, axis=0)
+
+    def window(self, start_ms: int, end_ms: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if start_ms < self.covered_since:
+            return None
+        timestamps, values = self.ordered()
+        low = int(np.searchsorted(timestamps, start_ms, side="left"))
+        high = int(np.searchsorted(timestamps, end_ms, side="right"))
+        return timestamps[low:high], values[low:high]
+
+    def hourly_stats(self, since_hour: int) -> Tuple[int, Optional[float], Optional[float]]:
+        mask = self.hours >= since_hour
+        count = int(self.hour_counts[mask].sum())
+        if not count:
+            return 0, None, None
+        sums = self.hour_sums[mask].sum(axis=0)
+        return count, float(sums[0] / count), float(sums[1] / count)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.values.nbytes + self.hours.nbytes + self.hour_counts.nbytes + self.hour_sums.nbytes
+
+class RecentReadings:
+    """
+    In-memory recent readings for every silo, fed with committed ingest rows.
+
+    Serves the latest reading and the 24 h averages of the silo list and
+    short chart windows without touching the database. It is warmed from the
+    database at startup and only sees readings committed by this process, so
+    it is off by default and should only be enabled
+    (RECENT_READINGS_ENABLED=true) on single-worker deployments.
+    """
+
+    def __init__(self, capacity: int = settings.RECENT_READINGS_CAPACITY):
+        self.capacity = capacity
+        self._rings: Dict[int, SiloRing] = {}
+        self._tracked_since = 0
+        self.ready = False
+
+    def _ring(self, silo_id: int) -> SiloRing:
+        ring = self._rings.get(silo_id)
+        if ring is None:
+            ring = self._rings[silo_id] = SiloRing(self.capacity, self._tracked_since)
+        return ring
+
+    async def warm(self, db: AsyncSession):
+        """Load recent samples, hourly sums and latest readings of every silo"""
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(hours=settings.RECENT_READINGS_WARM_HOURS)
+        self._rings = {}
+        self._tracked_since = to_ms(since)
+
+        # Newest capacity readings per silo within the warm window
+        ranked = select(
+            *[SiloReading.__table__.c[column] for column in ("silo_id", "timestamp") + RING_COLUMNS],
+            func.row_number().over(
+                partition_by=SiloReading.silo_id,
+                order_by=SiloReading.timestamp.desc()
+            ).label("rank")
+        ).where(SiloReading.timestamp >= since).subquery()
+        samples = await db.execute(
+            select(ranked).where(ranked.c.rank <= self.capacity).order_by(ranked.c.silo_id, ranked.c.timestamp)
+        )
+        for row in samples:
+            self._ring(row.silo_id).append(
+                to_ms(row.timestamp),
+                tuple(_as_float(getattr(row, column)) for column in RING_COLUMNS)
+            )
+        for ring in self._rings.values():
+            if ring.size == ring.capacity:
+                # Older readings of the window may have been cut off
+                ring.covered_since = int(ring.ordered()[0][0]) + 1
+
+        rollups = await db.execute(
+            select(SiloReadingRollup).where(
+                and_(
+                    SiloReadingRollup.resolution == "hour",
+                    SiloReadingRollup.bucket_start >= bucket_start(now - timedelta(hours=HOURLY_SLOTS - 1), "hour")
+                )
+            )
+        )
+        for rollup in rollups.scalars():
+            self._ring(rollup.silo_id).add_hourly(
+                to_ms(rollup.bucket_start) // 3_600_000,
+                rollup.readings_count,
+                tuple(float(getattr(rollup, f"{metric}_sum")) for metric in HOURLY_METRICS)
+            )
+
+        latest = await db.execute(select(SiloLatestReading))
+        for reading in latest.scalars():
+            self._ring(reading.silo_id).latest = {
+                "id": reading.reading_id,
+                "silo_id": reading.silo_id,
+                "temperature": reading.temperature,
+                "humidity": reading.humidity,
+                "volume_percent": reading.volume_percent,
+                "volume_tons": reading.volume_tons,
+                "timestamp": reading.timestamp,
+                "created_at": reading.created_at
+            }
+
+        self.ready = True
+        logger.info("Recent readings warmed", silos=len(self._rings), **self.stats())
+
+    def extend(self, rows: List[Dict[str, Any]]):
+        """Add committed reading rows (as built by build_reading_row)"""
+        committed_at = datetime.now(timezone.utc)
+        for row in sorted(rows, key=lambda row: as_utc(row["timestamp"])):
+            ring = self._ring(row["silo_id"])
+            timestamp_ms = to_ms(row["timestamp"])
+            ring.append(timestamp_ms, tuple(_as_float(row[column]) for column in RING_COLUMNS))
+            ring.add_hourly(timestamp_ms // 3_600_000, 1, tuple(float(row[metric]) for metric in HOURLY_METRICS))
+
+            if ring.latest is None or as_utc(row["timestamp"]) >= as_utc(ring.latest["timestamp"]):
+                ring.latest = {**row, "created_at": committed_at}
+
+    def latest(self, silo_id: int) -> Optional[Dict[str, Any]]:
+        ring = self._rings.get(silo_id)
+        return ring.latest if ring else None
+
+    def stats_24h(self, silo_id: int) -> Tuple[int, Optional[float], Optional[float]]:
+        """readings_count, average temperature and humidity over the hourly buckets of the last 24 h"""
+        ring = self._rings.get(silo_id)
+        if ring is None:
+            return 0, None, None
+        since_hour = to_ms(bucket_start(datetime.now(timezone.utc) - timedelta(days=1), "hour")) // 3_600_000
+        return ring.hourly_stats(since_hour)
+
+    def window(
+        self,
+        silo_id: int,
+        metric: str,
+        start: datetime,
+        end: datetime
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Timestamps (epoch ms) and values of metric between start and end, or
+        None when the ring does not hold the whole window
+        """
+        if not self.ready:
+            return None
+        ring = self._rings.get(silo_id)
+        if ring is None:
+            return None
+        window = ring.window(to_ms(start), to_ms(end))
+        if window is None:
+            return None
+        timestamps, values = window
+        return timestamps, values[:, RING_COLUMNS.index(metric)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "samples": sum(ring.size for ring in self._rings.values()),
+            "memory_bytes": sum(ring.nbytes for ring in self._rings.values())
+        }
+
+# Global recent readings store, warmed at startup when RECENT_READINGS_ENABLED is set
+recent_readings = RecentReadings()
@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+import asyncio
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+
+from app.core.config import settings
+from app.models.silo import Silo
+
+logger = structlog.get_logger()
+
+@dataclass(frozen=True)
+class SiloInfo:
+    """Immutable snapshot of a silo row held by the registry"""
+    id: int
+    name: str
+    location: str
+    latitude: Optional[Decimal]
+    longitude: Optional[Decimal]
+    capacity_tons: int
+    max_temperature: Optional[Decimal]
+    max_humidity: Optional[Decimal]
+    status: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, silo: Silo) -> "SiloInfo":
+        return cls(
+            id=silo.id,
+            name=silo.name,
+            location=silo.location,
+            latitude=silo.latitude,
+            longitude=silo.longitude,
+            capacity_tons=silo.capacity_tons,
+            max_temperature=silo.max_temperature,
+            max_humidity=silo.max_humidity,
+            status=silo.status,
+            created_at=silo.created_at,
+            updated_at=silo.updated_at
+        )
+
+    def weather_data(self) -> Dict[str, Any]:
+        """Location payload expected by the weather service"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "location": self.location,
+            "latitude": float(self.latitude) if self.latitude else None,
+            "longitude": float(self.longitude) if self.longitude else None
+        }
+
+class SiloRegistry:
+    """
+    In-process cache of silo metadata.
+
+    Silo rows change a few times a week but are read on every ingest call, so
+    the whole table is kept in memory. Writes through the silos API call
+    invalidate(), which bumps the version and forces a reload on next access;
+    a load that was running meanwhile discards its rows, which may predate
+    the write. Concurrent callers share one load. The TTL bounds staleness
+    for changes made by other worker processes.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.SILO_REGISTRY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._silos: Dict[int, SiloInfo] = {}
+        self._loaded_at: Optional[float] = None
+        self._loading: Optional[asyncio.Future] = None
+
+    async def load(self, db: AsyncSession) -> bool:
+        """
+        Load every silo into the registry. Returns False when the registry
+        was invalidated while the query ran and the rows were discarded.
+        """
+        version = self.version
+        result = await db.execute(select(Silo).order_by(Silo.id))
+        silos = result.scalars().all()
+        if version != self.version:
+            logger.info("Silo registry load discarded, invalidated meanwhile")
+            return False
+        self._silos = {silo.id: SiloInfo.from_model(silo) for silo in silos}
+        self._loaded_at = time.monotonic()
+        logger.info("Silo registry loaded", silos=len(self._silos), version=self.version)
+        return True
+
+    def invalidate(self):
+        """Mark the registry stale after a silo write"""
+        self._loaded_at = None
+        self.version += 1
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at <= self.ttl_seconds
+
+    async def _ensure_loaded(self, db: AsyncSession):
+        while not self._is_fresh():
+            if self._loading is not None:
+                # Wait for the load in flight, then check again: it may have
+                # been discarded or failed
+                await asyncio.shield(self._loading)
+                continue
+            self._loading = asyncio.get_running_loop().create_future()
+            try:
+                await self.load(db)
+            finally:
+                self._loading.set_result(None)
+                self._loading = None
+
+    async def get(self, db: AsyncSession, silo_id: int) -> Optional[SiloInfo]:
+        """Get a silo by ID"""
+        await self._ensure_loaded(db)
+        return self._silos.get(silo_id)
+
+    async def get_many(self, db: AsyncSession, silo_ids) -> Dict[int, SiloInfo]:
+        """Get the known silos among silo_ids"""
+        await self._ensure_loaded(db)
+        return {silo_id: self._silos[silo_id] for silo_id in silo_ids if silo_id in self._silos}
+
+    async def all(self, db: AsyncSession) -> List[SiloInfo]:
+        """Get all silos ordered by ID"""
+        await self._ensure_loaded(db)
+        return list(self._silos.values())
+
+    async def active(self, db: AsyncSession) -> List[SiloInfo]:
+        """Get silos with status 'active'"""
+        return [silo for silo in await self.all(db) if silo.status == 'active']
+
+# Global registry instance
+silo_registry = SiloRegistry()
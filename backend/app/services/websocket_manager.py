@@ -1,73 +1,343 @@
-from typing import List, Dict, Any
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Set
+from collections import deque
 from fastapi import WebSocket
+import asyncio
 import json
+import re
 import structlog
 
+from app.core.config import settings
+
 logger = structlog.get_logger()
 
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+# Close code sent to clients dropped for not keeping up (RFC 6455: try again later)
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+# Subscription topics: one silo, one shipment, one alert severity, dashboard
+# KPIs, or "*" for everything. New clients start subscribed to "*".
+WILDCARD_TOPIC = "*"
+DASHBOARD_TOPIC = "dashboard"
+TOPIC_RE = re.compile(
+    r"^(silo:\d+|logistics:[0-9a-fA-F-]{36}|alerts:(low|medium|high|critical)|dashboard|\*)$"
+)
+MAX_TOPICS_PER_CLIENT = 256
+
+def silo_topic(silo_id: int) -> str:
+    return f"silo:{silo_id}"
+
+def logistics_topic(logistics_id: Any) -> str:
+    return f"logistics:{str(logistics_id).lower()}"
+
+def alerts_topic(severity: str) -> str:
+    return f"alerts:{severity}"
+
+def merge_update(queued: Dict[str, Any], latest: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold a newer update into a queued one for the same entity. Silo deltas
+    add their sample counts and merge their changed fields, shipment updates
+    merge their fields, anything else (dashboard KPIs) is a full snapshot.
+    """
+    if latest.get("type") == "silo_update":
+        old, new = queued["data"], latest["data"]
+        merged = {**latest, "data": {
+            **old,
+            **new,
+            "reading": new.get("reading") or old.get("reading"),
+            "samples": old.get("samples", 0) + new.get("samples", 0),
+            "changes": {**old.get("changes", {}), **new.get("changes", {})}
+        }}
+        if not new.get("reading"):
+            merged["timestamp"] = queued.get("timestamp")
+        return merged
+    if latest.get("type") == "logistics_update":
+        return {**latest, "data": {**queued["data"], **latest["data"]}}
+    return latest
+
+class ClientConnection:
+    """
+    One WebSocket client: a bounded queue of serialized messages drained by
+    its own writer task, so a slow client only ever delays itself.
+
+    Queue entries are [key, text, data] lists. Under the coalesce policy a
+    message arriving while the queue is full is merged (merge_update) into
+    the newest queued message with the same key instead of evicting the
+    oldest one, so a client that falls behind still receives every change,
+    folded into fewer frames.
+    """
+
+    __slots__ = ("websocket", "manager", "queue", "pending", "wakeup", "task", "closing", "dropped", "topics")
+
+    def __init__(self, websocket: WebSocket, manager: "WebSocketManager"):
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: Deque[List[Any]] = deque()
+        self.pending: Dict[Hashable, List[Any]] = {}
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.closing = False
+        self.dropped = 0
+        self.topics: Set[str] = set()
+
+    def start(self):
+        self.task = asyncio.create_task(self._writer())
+
+    def enqueue(
+        self,
+        message: str,
+        key: Optional[Hashable] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Queue a message without waiting; False when the client has to be dropped"""
+        if self.closing:
+            return True
+
+        policy = self.manager.overflow_policy
+        if len(self.queue) >= self.manager.queue_size:
+            if policy == "disconnect":
+                self.close()
+                return False
+            entry = self.pending.get(key) if key is not None else None
+            if entry is not None and entry[2] is not None and data is not None:
+                entry[2] = merge_update(entry[2], data)
+                entry[1] = json.dumps(entry[2], default=str)
+                return True
+            oldest = self.queue.popleft()
+            if oldest[0] is not None and self.pending.get(oldest[0]) is oldest:
+                del self.pending[oldest[0]]
+            self.dropped += 1
+
+        entry = [key, message, data if policy == "coalesce" else None]
+        self.queue.append(entry)
+        if key is not None and policy == "coalesce":
+            self.pending[key] = entry
+        self.wakeup.set()
+        return True
+
+    def close(self):
+        """Stop accepting messages and let the writer close the socket"""
+        self.closing = True
+        self.queue.clear()
+        self.pending.clear()
+        self.wakeup.set()
+
+    async def _writer(self):
+        try:
+            while True:
+                while not self.queue and not self.closing:
+                    self.wakeup.clear()
+                    await self.wakeup.wait()
+                if self.closing:
+                    await asyncio.wait_for(
+                        self.websocket.close(code=SLOW_CLIENT_CLOSE_CODE),
+                        timeout=settings.WEBSOCKET_SEND_TIMEOUT_SECONDS
+                    )
+                    break
+
+                entry = self.queue.popleft()
+                key, message, _ = entry
+                if key is not None and self.pending.get(key) is entry:
+                    del self.pending[key]
+                await asyncio.wait_for(
+                    self.websocket.send_text(message),
+                    timeout=settings.WEBSOCKET_SEND_TIMEOUT_SECONDS
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("WebSocket send failed", error=str(e), dropped=self.dropped)
+        self.manager.disconnect(self.websocket)
+
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        
+    """
+    Registry of WebSocket clients and fan-out of published messages.
+
+    Clients subscribe to topics by sending
+    {"action": "subscribe" | "unsubscribe", "topics": [...]}; a topic ->
+    clients index routes each message only to the clients interested in one
+    of its topics. A message is serialized once and handed to every
+    recipient's send queue without awaiting any socket, so delivery to fast
+    clients does not wait on slow ones. When a client's queue is full the overflow policy
+    decides: drop_oldest discards its oldest message, coalesce merges the
+    message into a queued update of the same silo or shipment (dropping the
+    oldest only when there is none), disconnect closes the client.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.WEBSOCKET_SEND_QUEUE_SIZE,
+        overflow_policy: str = settings.WEBSOCKET_OVERFLOW_POLICY
+    ):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported WebSocket overflow policy: {overflow_policy}")
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.connections)
+
     async def connect(self, websocket: WebSocket):
         """Accept a new WebSocket connection"""
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info("WebSocket connection established", total_connections=len(self.active_connections))
-        
+        client = ClientConnection(websocket, self)
+        self.connections[websocket] = client
+        self._subscribe(client, [WILDCARD_TOPIC])
+        client.start()
+        logger.info("WebSocket connection established", total_connections=len(self.connections))
+
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info("WebSocket connection closed", total_connections=len(self.active_connections))
-    
+        client = self.connections.pop(websocket, None)
+        if client is None:
+            return
+        client.closing = True
+        self._unsubscribe(client, list(client.topics))
+        if client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
+        logger.info("WebSocket connection closed", total_connections=len(self.connections))
+
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send a message to a specific connection"""
+        client = self.connections.get(websocket)
+        if client:
+            client.enqueue(message)
+
+    def _subscribe(self, client: ClientConnection, topics: Iterable[str]):
+        for topic in topics:
+            if topic not in client.topics:
+                client.topics.add(topic)
+                self.subscribers.setdefault(topic, set()).add(client)
+
+    def _unsubscribe(self, client: ClientConnection, topics: Iterable[str]):
+        for topic in topics:
+            client.topics.discard(topic)
+            clients = self.subscribers.get(topic)
+            if clients is not None:
+                clients.discard(client)
+                if not clients:
+                    del self.subscribers[topic]
+
+    async def handle_message(self, websocket: WebSocket, text: str):
+        """Apply a subscribe/unsubscribe request from a client and acknowledge it"""
+        client = self.connections.get(websocket)
+        if client is None:
+            return
+
         try:
-            await websocket.send_text(message)
-        except Exception as e:
-            logger.error("Failed to send personal message", error=str(e))
-            self.disconnect(websocket)
-    
-    async def broadcast(self, data: Dict[str, Any]):
-        """Broadcast a message to all connected clients"""
-        if not self.active_connections:
+            request = json.loads(text)
+            action = request.get("action")
+            topics = request.get("topics")
+            if isinstance(topics, str):
+                topics = [topics]
+            if action not in ("subscribe", "unsubscribe") or not isinstance(topics, list):
+                raise ValueError("Expected {\"action\": \"subscribe\" | \"unsubscribe\", \"topics\": [...]}")
+            invalid = [topic for topic in topics if not isinstance(topic, str) or not TOPIC_RE.match(topic)]
+            if invalid:
+                raise ValueError(f"Unknown topics: {invalid}")
+        except (ValueError, AttributeError) as e:
+            client.enqueue(json.dumps({"type": "error", "detail": str(e)}))
             return
-            
-        message = json.dumps(data)
-        disconnected = []
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error("Failed to broadcast message", error=str(e))
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection)
-    
-    async def broadcast_silo_update(self, silo_id: int, reading_data: Dict[str, Any]):
-        """Broadcast silo reading update"""
-        await self.broadcast({
-            "type": "silo_reading",
+
+        topics = [topic.lower() for topic in topics]
+        if action == "subscribe":
+            if len(client.topics | set(topics)) > MAX_TOPICS_PER_CLIENT:
+                client.enqueue(json.dumps({
+                    "type": "error",
+                    "detail": f"At most {MAX_TOPICS_PER_CLIENT} topics per connection"
+                }))
+                return
+            self._subscribe(client, topics)
+        else:
+            self._unsubscribe(client, topics)
+
+        client.enqueue(json.dumps({"type": "subscriptions", "topics": sorted(client.topics)}))
+
+    async def publish(self, topics: Iterable[str], data: Dict[str, Any], key: Optional[Hashable] = None):
+        """
+        Send a message to the clients subscribed to any of its topics (or to
+        "*"). Messages sharing a key describe the same entity and may be
+        coalesced for slow clients.
+        """
+        recipients = set(self.subscribers.get(WILDCARD_TOPIC, ()))
+        for topic in topics:
+            recipients.update(self.subscribers.get(topic, ()))
+        self._send(recipients, data, key)
+
+    async def broadcast(self, data: Dict[str, Any], key: Optional[Hashable] = None):
+        """Send a message to every connected client, whatever its subscriptions"""
+        self._send(self.connections.values(), data, key)
+
+    def _send(self, clients: Iterable[ClientConnection], data: Dict[str, Any], key: Optional[Hashable]):
+        clients = list(clients)
+        if not clients:
+            return
+
+        message = json.dumps(data, default=str)
+        overflowed = 0
+        for client in clients:
+            if not client.enqueue(message, key, data):
+                overflowed += 1
+
+        if overflowed:
+            logger.warning("WebSocket clients dropped for falling behind", clients=overflowed)
+
+    async def close_all(self):
+        """Stop every writer task (shutdown)"""
+        clients = list(self.connections.values())
+        self.connections.clear()
+        self.subscribers.clear()
+        for client in clients:
+            if client.task:
+                client.task.cancel()
+        await asyncio.gather(*[client.task for client in clients if client.task], return_exceptions=True)
+
+    async def broadcast_silo_update(self, silo_id: int, update_data: Dict[str, Any]):
+        """Publish a silo delta: newest reading, sample count and changed fields"""
+        reading = update_data.get("reading") or {}
+        await self.publish([silo_topic(silo_id)], {
+            "type": "silo_update",
             "silo_id": silo_id,
-            "data": reading_data,
-            "timestamp": reading_data.get("timestamp")
-        })
-    
+            "data": update_data,
+            "timestamp": reading.get("timestamp")
+        }, key=("silo_update", silo_id))
+
     async def broadcast_alert(self, alert_data: Dict[str, Any]):
-        """Broadcast new alert"""
-        await self.broadcast({
+        """Publish new alert to its severity and silo topics"""
+        topics = [alerts_topic(alert_data.get("severity"))]
+        if alert_data.get("silo_id") is not None:
+            topics.append(silo_topic(alert_data["silo_id"]))
+        await self.publish(topics, {
             "type": "alert",
             "data": alert_data
         })
-    
+
     async def broadcast_logistics_update(self, logistics_id: str, update_data: Dict[str, Any]):
-        """Broadcast logistics update"""
-        await self.broadcast({
+        """Publish logistics update"""
+        await self.publish([logistics_topic(logistics_id)], {
             "type": "logistics_update",
             "logistics_id": logistics_id,
             "data": update_data
-        }) 
\ No newline at end of file
+        }, key=("logistics_update", str(logistics_id)))
+
+    async def broadcast_alerts_resolved(self, resolved_data: Dict[str, Any]):
+        """Publish a batch of resolved alerts as one event"""
+        topics = [alerts_topic(severity) for severity in resolved_data.get("by_severity", {})]
+        topics += [silo_topic(silo_id) for silo_id in resolved_data.get("by_silo", {})]
+        await self.publish(topics, {
+            "type": "alerts_resolved",
+            "data": resolved_data
+        })
+    
+    async def broadcast_dashboard_kpis(self, kpis: Dict[str, Any]):
+        """Publish a new dashboard KPI snapshot"""
+        await self.publish([DASHBOARD_TOPIC], {
+            "type": "dashboard_kpis",
+            "data": kpis
+        }, key=("dashboard_kpis",))
+
+# Global WebSocket manager for real-time updates
+websocket_manager = WebSocketManager()
@@ -0,0 +1,161 @@
+"""Concurrent-request throughput, blocking sync sessions vs async sessions
+
+Two modes, both printing requests/s, p50/p99 latency and the worst
+event-loop stall observed while the load ran:
+
+- db: in-process against DATABASE_URL / ASYNC_DATABASE_URL. Each simulated
+  request authenticates (user lookup by email) and lists silos, either
+  through the blocking SessionLocal called from a coroutine (how endpoints
+  and auth ran before) or through AsyncSessionLocal (how they run now).
+
+      python -m benchmarks.concurrent_requests db --requests 2000 --concurrency 100
+
+- http: against running servers, e.g. one on the previous release and one
+  on this tree. GET requests with a bearer token; every --url is measured
+  in turn with the same load.
+
+      python -m benchmarks.concurrent_requests http --token $TOKEN \\
+          --url http://before:8000/api/v1/silos/ --url http://after:8000/api/v1/silos/
+
+Run from backend/.
+"""
+from typing import Awaitable, Callable, List
+import argparse
+import asyncio
+import statistics
+import time
+
+
+class LoopLagProbe:
+    """Measures how late a periodic tick wakes up, i.e. event-loop stalls"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.worst = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.worst = max(self.worst, time.perf_counter() - started - self.interval)
+
+    async def __aenter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        # Let a tick that was due during the last stall record it
+        await asyncio.sleep(0)
+        self._task.cancel()
+
+
+async def run_load(request: Callable[[], Awaitable[None]], requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                # Waiting for the loop is part of a request's latency
+                await asyncio.sleep(0)
+                await request()
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    async with LoopLagProbe() as probe:
+        started = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests/s": requests / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max loop stall ms": probe.worst * 1000,
+        "errors": errors,
+    }
+
+
+def report(label: str, result: dict):
+    print(f"{label:>12}: " + ", ".join(
+        f"{name} {value:.1f}" if isinstance(value, float) else f"{name} {value}"
+        for name, value in result.items()
+    ))
+
+
+async def bench_db(args):
+    from sqlalchemy import select
+
+    from app.core.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+    from app.models.silo import Silo
+    from app.models.user import User
+
+    def sync_request():
+        # Blocking driver calls made straight from the coroutine, as before
+        db = SessionLocal()
+        try:
+            db.query(User).filter(User.email == args.email).first()
+            db.query(Silo).order_by(Silo.id).limit(100).all()
+        finally:
+            db.close()
+
+    async def blocking_request():
+        sync_request()
+
+    async def async_request():
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(User).where(User.email == args.email))
+            (await db.execute(select(Silo).order_by(Silo.id).limit(100))).scalars().all()
+
+    for label, request in (("sync", blocking_request), ("async", async_request)):
+        await run_load(request, min(args.requests, args.concurrency), args.concurrency)  # warm the pool
+        report(label, await run_load(request, args.requests, args.concurrency))
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+async def bench_http(args):
+    import httpx
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=args.timeout) as client:
+        for url in args.url:
+            async def request():
+                response = await client.get(url)
+                response.raise_for_status()
+
+            await run_load(request, min(args.requests, args.concurrency), args.concurrency)
+            report(url, await run_load(request, args.requests, args.concurrency))
+
+
+def main():
+    load = argparse.ArgumentParser(add_help=False)
+    load.add_argument("--requests", type=int, default=2000)
+    load.add_argument("--concurrency", type=int, default=100)
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    db = modes.add_parser("db", parents=[load], help="sync vs async sessions in-process")
+    db.add_argument("--email", default="admin@agrotrack.com", help="user looked up by the auth step")
+
+    http = modes.add_parser("http", parents=[load], help="GET load against running servers")
+    http.add_argument("--url", action="append", required=True)
+    http.add_argument("--token")
+    http.add_argument("--timeout", type=float, default=30.0)
+
+    args = parser.parse_args()
+    asyncio.run(bench_db(args) if args.mode == "db" else bench_http(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool, text
+
+from app.core.config import settings
+from app.core.database import Base
+from app.services.partition_manager import DEFAULT_PARTITION, PARTITION_NAME_RE
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+# A URL set by the caller (e.g. tests migrating a scratch database) wins
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Serializes upgrades when several containers start at once
+MIGRATION_LOCK_ID = 740_120_003
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Readings partitions are owned by the partition manager, not the models
+    if type_ == "table" and (name == DEFAULT_PARTITION or PARTITION_NAME_RE.match(name)):
+        return False
+    return True
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without a database connection"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    with connectable.connect() as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                include_object=include_object,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,199 @@
+"""Initial schema
+
+Tables, partitioned readings, indexes and updated_at triggers as previously
+created by database/init.sql. Every statement is idempotent so databases
+initialized from that script can be upgraded in place; a silo_readings
+table predating partitioning is left for revision 0004 to convert.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = """
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    email VARCHAR(255) UNIQUE NOT NULL,
+    hashed_password VARCHAR(255) NOT NULL,
+    full_name VARCHAR(255) NOT NULL,
+    role VARCHAR(50) NOT NULL CHECK (role IN ('admin', 'operator', 'logistics')),
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS silos (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    location VARCHAR(255) NOT NULL,
+    latitude DECIMAL(10, 8),
+    longitude DECIMAL(11, 8),
+    capacity_tons INTEGER NOT NULL,
+    max_temperature DECIMAL(5, 2) DEFAULT 30.0,
+    max_humidity DECIMAL(5, 2) DEFAULT 75.0,
+    status VARCHAR(50) DEFAULT 'active' CHECK (status IN ('active', 'inactive', 'maintenance')),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Range partitioned by reading time. Time partitions
+-- (silo_readings_pYYYYMMDD_YYYYMMDD) are created and expired by the backend
+-- partition manager; the default partition only catches stragglers.
+CREATE TABLE IF NOT EXISTS silo_readings (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    silo_id INTEGER REFERENCES silos(id) ON DELETE CASCADE,
+    temperature DECIMAL(5, 2) NOT NULL,
+    humidity DECIMAL(5, 2) NOT NULL,
+    volume_percent DECIMAL(5, 2) NOT NULL,
+    volume_tons DECIMAL(10, 2),
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Databases created before partitioning hold a plain silo_readings table;
+-- revision 0004 converts it, partitions included
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'silo_readings'::regclass) = 'p' THEN
+        CREATE TABLE IF NOT EXISTS silo_readings_default PARTITION OF silo_readings DEFAULT;
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS silo_reading_rollups (
+    silo_id INTEGER REFERENCES silos(id) ON DELETE CASCADE,
+    resolution VARCHAR(10) NOT NULL CHECK (resolution IN ('minute', 'hour', 'day')),
+    bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    readings_count INTEGER NOT NULL,
+    temperature_sum DECIMAL(16, 2) NOT NULL,
+    temperature_min DECIMAL(5, 2) NOT NULL,
+    temperature_max DECIMAL(5, 2) NOT NULL,
+    humidity_sum DECIMAL(16, 2) NOT NULL,
+    humidity_min DECIMAL(5, 2) NOT NULL,
+    humidity_max DECIMAL(5, 2) NOT NULL,
+    volume_percent_sum DECIMAL(16, 2) NOT NULL,
+    volume_percent_min DECIMAL(5, 2) NOT NULL,
+    volume_percent_max DECIMAL(5, 2) NOT NULL,
+    last_temperature DECIMAL(5, 2) NOT NULL,
+    last_humidity DECIMAL(5, 2) NOT NULL,
+    last_volume_percent DECIMAL(5, 2) NOT NULL,
+    last_volume_tons DECIMAL(10, 2),
+    last_timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (silo_id, resolution, bucket_start)
+);
+
+CREATE TABLE IF NOT EXISTS silo_latest_reading (
+    silo_id INTEGER PRIMARY KEY REFERENCES silos(id) ON DELETE CASCADE,
+    reading_id UUID NOT NULL,
+    temperature DECIMAL(5, 2) NOT NULL,
+    humidity DECIMAL(5, 2) NOT NULL,
+    volume_percent DECIMAL(5, 2) NOT NULL,
+    volume_tons DECIMAL(10, 2),
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    silo_id INTEGER REFERENCES silos(id) ON DELETE CASCADE,
+    alert_type VARCHAR(100) NOT NULL,
+    severity VARCHAR(50) NOT NULL CHECK (severity IN ('low', 'medium', 'high', 'critical')),
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    value DECIMAL(10, 2),
+    threshold DECIMAL(10, 2),
+    last_seen TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    occurrence_count INTEGER NOT NULL DEFAULT 1,
+    peak_value DECIMAL(10, 2),
+    is_resolved BOOLEAN DEFAULT FALSE,
+    resolved_at TIMESTAMP WITH TIME ZONE,
+    resolved_by UUID REFERENCES users(id),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Databases created before alerts were coalesced lack these columns
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS last_seen TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS occurrence_count INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS peak_value DECIMAL(10, 2);
+
+CREATE TABLE IF NOT EXISTS logistics (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    truck_id VARCHAR(100) NOT NULL,
+    driver_name VARCHAR(255) NOT NULL,
+    route VARCHAR(255) NOT NULL,
+    origin VARCHAR(255) NOT NULL,
+    destination VARCHAR(255) NOT NULL,
+    status VARCHAR(50) DEFAULT 'pending' CHECK (status IN ('pending', 'in_transit', 'delivered', 'cancelled')),
+    estimated_arrival TIMESTAMP WITH TIME ZONE,
+    actual_arrival TIMESTAMP WITH TIME ZONE,
+    cargo_weight DECIMAL(10, 2),
+    silo_id INTEGER REFERENCES silos(id),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS logistics_tracking (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    logistics_id UUID REFERENCES logistics(id) ON DELETE CASCADE,
+    latitude DECIMAL(10, 8) NOT NULL,
+    longitude DECIMAL(11, 8) NOT NULL,
+    speed DECIMAL(5, 2),
+    heading DECIMAL(5, 2),
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_silo_readings_silo_id ON silo_readings(silo_id);
+CREATE INDEX IF NOT EXISTS idx_silo_readings_timestamp ON silo_readings(timestamp);
+CREATE INDEX IF NOT EXISTS idx_silo_reading_rollups_bucket ON silo_reading_rollups(resolution, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_alerts_silo_id ON alerts(silo_id);
+CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts(created_at);
+CREATE INDEX IF NOT EXISTS idx_alerts_is_resolved ON alerts(is_resolved);
+CREATE INDEX IF NOT EXISTS idx_logistics_status ON logistics(status);
+CREATE INDEX IF NOT EXISTS idx_logistics_tracking_logistics_id ON logistics_tracking(logistics_id);
+CREATE INDEX IF NOT EXISTS idx_logistics_tracking_timestamp ON logistics_tracking(timestamp);
+"""
+
+TRIGGERS = """
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE OR REPLACE TRIGGER update_users_updated_at BEFORE UPDATE ON users FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE OR REPLACE TRIGGER update_silos_updated_at BEFORE UPDATE ON silos FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+CREATE OR REPLACE TRIGGER update_logistics_updated_at BEFORE UPDATE ON logistics FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+"""
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    op.execute(TABLES)
+    op.execute(INDEXES)
+    op.execute(TRIGGERS)
+
+
+def downgrade() -> None:
+    # Dropping silo_readings drops every partition with it
+    for table in (
+        "logistics_tracking", "logistics", "alerts", "silo_latest_reading",
+        "silo_reading_rollups", "silo_readings", "silos", "users"
+    ):
+        op.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS update_updated_at_column()")
@@ -0,0 +1,72 @@
+"""Seed default users, sample silos and logistics
+
+Inserted only into empty tables, so existing data is never duplicated.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-01 00:00:01
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Passwords: admin123, operator123, logistics123 respectively
+USERS = """
+INSERT INTO users (email, hashed_password, full_name, role) VALUES
+('admin@agrotrack.com', '$2b$12$uDdbMavoOzt6kv0U2ecOt.0naMwzUOLB96N5iVpGITXZagmW.HOZe', 'System Administrator', 'admin'),
+('operator@agrotrack.com', '$2b$12$s8hIyK9hbSyKjahnubaDo.PvW2BgMg7nmvm9Jy1J.PET7rR9adKA2', 'Field Operator', 'operator'),
+('logistics@agrotrack.com', '$2b$12$YvhpWFf/79Ie4TmkjGP.SOpGnPzdxbAc1u2IvtMcd2MO5kAa57xJu', 'Logistics Manager', 'logistics')
+ON CONFLICT (email) DO NOTHING;
+"""
+
+SILOS = """
+INSERT INTO silos (name, location, latitude, longitude, capacity_tons)
+SELECT * FROM (VALUES
+    ('Silo Central A', 'Asunción, Paraguay', -25.2637, -57.5759, 1000),
+    ('Silo Norte B', 'San Lorenzo, Paraguay', -25.3416, -57.5085, 800),
+    ('Silo Sur C', 'Luque, Paraguay', -25.2662, -57.4950, 1200),
+    ('Silo Este D', 'Capiatá, Paraguay', -25.3551, -57.4456, 900),
+    ('Silo Oeste E', 'Mariano Roque Alonso, Paraguay', -25.2018, -57.5330, 750)
+) AS seed (name, location, latitude, longitude, capacity_tons)
+WHERE NOT EXISTS (SELECT 1 FROM silos);
+"""
+
+# Linked to the seeded silos by name
+LOGISTICS = """
+INSERT INTO logistics (truck_id, driver_name, route, origin, destination, status, cargo_weight, silo_id)
+SELECT seed.truck_id, seed.driver_name, seed.route, seed.origin, seed.destination, seed.status, seed.cargo_weight, silos.id
+FROM (VALUES
+    ('TRK001', 'Carlos Mendoza', 'Ruta 1 - Puerto', 'Silo Central A', 'Puerto de Asunción', 'in_transit', 45.5),
+    ('TRK002', 'Maria Gonzalez', 'Ruta 2 - Aeropuerto', 'Silo Norte B', 'Aeropuerto Silvio Pettirossi', 'pending', 32.8),
+    ('TRK003', 'Juan Pereira', 'Ruta 3 - Frontera', 'Silo Sur C', 'Ciudad del Este', 'delivered', 55.2)
+) AS seed (truck_id, driver_name, route, origin, destination, status, cargo_weight)
+JOIN silos ON silos.name = seed.origin
+WHERE NOT EXISTS (SELECT 1 FROM logistics);
+"""
+
+
+def upgrade() -> None:
+    op.execute(USERS)
+    op.execute(SILOS)
+    op.execute(LOGISTICS)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM logistics WHERE truck_id IN ('TRK001', 'TRK002', 'TRK003')")
+    op.execute(
+        "DELETE FROM silos WHERE name IN "
+        "('Silo Central A', 'Silo Norte B', 'Silo Sur C', 'Silo Este D', 'Silo Oeste E') "
+        "AND NOT EXISTS (SELECT 1 FROM silo_readings WHERE silo_readings.silo_id = silos.id)"
+    )
+    op.execute(
+        "DELETE FROM users WHERE email IN "
+        "('admin@agrotrack.com', 'operator@agrotrack.com', 'logistics@agrotrack.com')"
+    )
@@ -0,0 +1,91 @@
+"""Composite, partial and BRIN indexes for the hot queries
+
+- silo_readings (silo_id, timestamp DESC, id DESC): per-silo history pages,
+  downsampling, exports and archiving all filter on silo_id and walk time
+  in keyset order; replaces the silo_id-only index.
+- silo_readings BRIN (timestamp): cross-silo time range scans (recent
+  readings warm-up, archive cutoff). Readings arrive in time order, so the
+  block ranges stay tight at a fraction of the btree's size; replaces the
+  timestamp btree.
+- logistics_tracking (logistics_id, timestamp DESC, id DESC): latest
+  position per shipment and tracking history pages.
+- alerts (silo_id, created_at DESC, id DESC): per-silo alert pages.
+- alerts partial WHERE NOT is_resolved on (severity, created_at) and
+  (silo_id, alert_type, severity): open alert counts by severity and the
+  open-alert index load only touch unresolved rows; replaces the low
+  selectivity is_resolved index.
+
+silo_readings is partitioned and cannot be indexed concurrently; the
+index is built on every partition in the migration transaction.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-01-01 00:00:02
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Plain tables, built without blocking writes
+CONCURRENT_INDEXES = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_logistics_tracking_logistics_id_timestamp "
+    "ON logistics_tracking (logistics_id, timestamp DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_silo_id_created_at "
+    "ON alerts (silo_id, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_open_severity "
+    "ON alerts (severity, created_at) WHERE NOT is_resolved",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_open_key "
+    "ON alerts (silo_id, alert_type, severity) WHERE NOT is_resolved",
+)
+
+SUPERSEDED_INDEXES = (
+    "idx_silo_readings_silo_id",
+    "idx_silo_readings_timestamp",
+    "idx_logistics_tracking_logistics_id",
+    "idx_alerts_silo_id",
+    "idx_alerts_is_resolved",
+)
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_silo_readings_silo_id_timestamp "
+        "ON silo_readings (silo_id, timestamp DESC, id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_silo_readings_timestamp_brin "
+        "ON silo_readings USING brin (timestamp) WITH (pages_per_range = 32)"
+    )
+
+    with op.get_context().autocommit_block():
+        for statement in CONCURRENT_INDEXES:
+            op.execute(statement)
+
+    for name in SUPERSEDED_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_silo_readings_silo_id ON silo_readings(silo_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_silo_readings_timestamp ON silo_readings(timestamp)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_logistics_tracking_logistics_id ON logistics_tracking(logistics_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_silo_id ON alerts(silo_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_is_resolved ON alerts(is_resolved)")
+
+    for name in (
+        "idx_silo_readings_silo_id_timestamp",
+        "idx_silo_readings_timestamp_brin",
+        "idx_logistics_tracking_logistics_id_timestamp",
+        "idx_alerts_silo_id_created_at",
+        "idx_alerts_open_severity",
+        "idx_alerts_open_key",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,104 @@
+"""Convert a pre-partitioning silo_readings table into the partitioned layout
+
+Databases initialized before readings were partitioned hold silo_readings
+as a plain table, which the partition manager cannot maintain. The table
+is renamed aside, the partitioned parent is created with its default
+partition, a time partition is created for every interval holding legacy
+readings, the rows are copied across and the legacy table is dropped.
+Databases that are already partitioned are left untouched.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-01-01 00:00:03
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services.partition_manager import floor_to_interval, next_interval, partition_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARENT = """
+CREATE TABLE silo_readings (
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    silo_id INTEGER REFERENCES silos(id) ON DELETE CASCADE,
+    temperature DECIMAL(5, 2) NOT NULL,
+    humidity DECIMAL(5, 2) NOT NULL,
+    volume_percent DECIMAL(5, 2) NOT NULL,
+    volume_tons DECIMAL(10, 2),
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp)
+"""
+
+# Index names the legacy table may carry (init.sql and revision 0003)
+LEGACY_INDEXES = (
+    "idx_silo_readings_silo_id",
+    "idx_silo_readings_timestamp",
+    "idx_silo_readings_silo_id_timestamp",
+    "idx_silo_readings_timestamp_brin",
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    relkind = conn.scalar(text("SELECT relkind FROM pg_class WHERE oid = to_regclass('silo_readings')"))
+    if relkind != "r":
+        return
+
+    op.execute("ALTER TABLE silo_readings RENAME TO silo_readings_legacy")
+    # Index-backed names are schema wide; free them for the new parent
+    op.execute("ALTER TABLE silo_readings_legacy RENAME CONSTRAINT silo_readings_pkey TO silo_readings_legacy_pkey")
+    for name in LEGACY_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute(PARENT)
+    op.execute("CREATE TABLE silo_readings_default PARTITION OF silo_readings DEFAULT")
+
+    # Legacy rows may lack a timestamp; they are filed under their creation time
+    reading_time = "COALESCE(timestamp, created_at, CURRENT_TIMESTAMP)"
+    first, last = conn.execute(text(
+        f"SELECT min({reading_time}), max({reading_time}) FROM silo_readings_legacy"
+    )).one()
+    if first is not None:
+        interval = settings.READINGS_PARTITION_INTERVAL
+        start = floor_to_interval(first, interval)
+        while start <= last:
+            end = next_interval(start, interval)
+            op.execute(
+                f"CREATE TABLE {partition_name(start, end)} PARTITION OF silo_readings "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            start = end
+
+    op.execute(
+        "INSERT INTO silo_readings "
+        "(id, silo_id, temperature, humidity, volume_percent, volume_tons, timestamp, created_at) "
+        f"SELECT id, silo_id, temperature, humidity, volume_percent, volume_tons, {reading_time}, created_at "
+        "FROM silo_readings_legacy"
+    )
+    op.execute("DROP TABLE silo_readings_legacy")
+
+    op.execute(
+        "CREATE INDEX idx_silo_readings_silo_id_timestamp "
+        "ON silo_readings (silo_id, timestamp DESC, id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX idx_silo_readings_timestamp_brin "
+        "ON silo_readings USING brin (timestamp) WITH (pages_per_range = 32)"
+    )
+
+
+def downgrade() -> None:
+    # The partitioned layout is what every later revision and the models expect
+    pass
@@ -0,0 +1,53 @@
+"""Enforce one open alert per (silo_id, alert_type, severity)
+
+Reading alerts are coalesced into the open alert of their key with
+INSERT ... ON CONFLICT, which needs a unique index to arbitrate on. Open
+duplicates left by concurrent writers are resolved first, keeping the
+newest alert of every key open; the partial unique index then replaces
+idx_alerts_open_key.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-01-01 00:00:04
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE alerts SET is_resolved = TRUE, resolved_at = CURRENT_TIMESTAMP
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY silo_id, alert_type, severity
+                    ORDER BY created_at DESC, id DESC
+                ) AS position
+                FROM alerts
+                WHERE NOT is_resolved
+            ) AS open_alerts
+            WHERE position > 1
+        )
+    """)
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_alerts_open_key "
+        "ON alerts (silo_id, alert_type, severity) WHERE NOT is_resolved"
+    )
+    op.execute("DROP INDEX IF EXISTS idx_alerts_open_key")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_alerts_open_key "
+        "ON alerts (silo_id, alert_type, severity) WHERE NOT is_resolved"
+    )
+    op.execute("DROP INDEX IF EXISTS uq_alerts_open_key")
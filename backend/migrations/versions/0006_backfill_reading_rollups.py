@@ -0,0 +1,72 @@
+"""Backfill silo_reading_rollups from the stored readings
+
+Rollups are maintained as readings are ingested, so databases holding
+readings from before rollups existed showed empty downsampled history for
+that period. Every (silo, resolution, bucket) is aggregated from
+silo_readings in one INSERT ... SELECT ... GROUP BY per resolution. A
+bucket already present is only replaced when the readings cover more
+samples than it counts, so re-running the backfill, or buckets whose
+readings were partly archived, keep the fuller rollup.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-01-01 00:00:05
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.services.reading_rollups import METRICS, ROLLUP_RESOLUTIONS
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Newest value of a column within the bucket, ties broken like the ingest path
+LAST = "(array_agg({column} ORDER BY timestamp DESC, id DESC))[1]"
+
+ROLLUP_COLUMNS = (
+    ["readings_count", "last_timestamp", "last_volume_tons"]
+    + [f"{metric}_{stat}" for metric in METRICS for stat in ("sum", "min", "max")]
+    + [f"last_{metric}" for metric in METRICS]
+)
+
+
+def backfill_statement(resolution: str) -> str:
+    expressions = {
+        "readings_count": "count(*)",
+        "last_timestamp": "max(timestamp)",
+        "last_volume_tons": LAST.format(column="volume_tons"),
+    }
+    for metric in METRICS:
+        expressions[f"{metric}_sum"] = f"sum({metric})"
+        expressions[f"{metric}_min"] = f"min({metric})"
+        expressions[f"{metric}_max"] = f"max({metric})"
+        expressions[f"last_{metric}"] = LAST.format(column=metric)
+
+    # Buckets are UTC aligned, as bucket_start() computes them
+    bucket = f"date_trunc('{resolution}', timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+    return (
+        f"INSERT INTO silo_reading_rollups (silo_id, resolution, bucket_start, {', '.join(ROLLUP_COLUMNS)}) "
+        f"SELECT silo_id, '{resolution}', {bucket}, "
+        + ", ".join(expressions[column] for column in ROLLUP_COLUMNS)
+        + " FROM silo_readings WHERE silo_id IS NOT NULL "
+        f"GROUP BY silo_id, {bucket} "
+        "ON CONFLICT (silo_id, resolution, bucket_start) DO UPDATE SET "
+        + ", ".join(f"{column} = excluded.{column}" for column in ROLLUP_COLUMNS)
+        + " WHERE silo_reading_rollups.readings_count < excluded.readings_count"
+    )
+
+
+def upgrade() -> None:
+    for resolution in ROLLUP_RESOLUTIONS:
+        op.execute(backfill_statement(resolution))
+
+
+def downgrade() -> None:
+    # Rollups are derived data; the ingest path keeps maintaining them
+    pass
@@ -0,0 +1,49 @@
+"""Backfill silo_latest_reading from the stored readings
+
+The latest-reading table is maintained as readings are ingested, so silos
+that stopped reporting before it existed had no latest reading. The
+newest reading per silo is copied with one INSERT ... SELECT DISTINCT ON,
+walking idx_silo_readings_silo_id_timestamp. An existing row is only
+replaced by a newer reading.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-01-01 00:00:06
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        INSERT INTO silo_latest_reading
+            (silo_id, reading_id, temperature, humidity, volume_percent, volume_tons, timestamp, created_at)
+        SELECT DISTINCT ON (silo_id)
+            silo_id, id, temperature, humidity, volume_percent, volume_tons, timestamp, created_at
+        FROM silo_readings
+        WHERE silo_id IS NOT NULL
+        ORDER BY silo_id, timestamp DESC, id DESC
+        ON CONFLICT (silo_id) DO UPDATE SET
+            reading_id = excluded.reading_id,
+            temperature = excluded.temperature,
+            humidity = excluded.humidity,
+            volume_percent = excluded.volume_percent,
+            volume_tons = excluded.volume_tons,
+            timestamp = excluded.timestamp,
+            created_at = excluded.created_at
+        WHERE silo_latest_reading.timestamp < excluded.timestamp
+    """)
+
+
+def downgrade() -> None:
+    # Derived data; the ingest path keeps maintaining it
+    pass
@@ -0,0 +1,47 @@
+"""Index for the cross-silo alert listing queries
+
+alerts (created_at DESC, id DESC): the alert list without a silo filter and
+recent activity walk alerts newest first by (created_at, id), and the trends
+and KPI counts filter on a created_at range. It replaces 0001's single
+column idx_alerts_created_at under the same name: the new index is built
+concurrently under a temporary name, the old one dropped, and the new one
+renamed.
+
+Dashboard trends and KPIs over one rollup resolution are already served by
+0001's idx_silo_reading_rollups_bucket (resolution, bucket_start).
+
+Found by the EXPLAIN checks in tests/test_query_plans.py.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-01-01 00:00:07
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_alerts_created_at_new "
+            "ON alerts (created_at DESC, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_alerts_created_at")
+        op.execute("ALTER INDEX idx_alerts_created_at_new RENAME TO idx_alerts_created_at")
+        # Duplicate of idx_silo_reading_rollups_bucket left by an earlier
+        # version of this revision
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_silo_reading_rollups_resolution_bucket")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_alerts_created_at")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts (created_at)")
@@ -0,0 +1,199 @@
+"""
+Shared fixtures.
+
+Database tests run against a scratch PostgreSQL database, TEST_POSTGRES_DB
+(default agrotrack_test), on the server configured by the usual POSTGRES_*
+variables. It is created when missing, migrated, and seeded with enough
+rows for the planner to behave as it does in production. When the server
+cannot be reached those tests are skipped.
+
+    pip install -r requirements-dev.txt
+    POSTGRES_SERVER=localhost python -m pytest
+"""
+import os
+
+# Settings read the environment on import
+os.environ["POSTGRES_DB"] = os.getenv("TEST_POSTGRES_DB", "agrotrack_test")
+
+from typing import Any, List, Tuple
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+import httpx
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import async_engine, engine
+from app.core.security import create_access_token
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Revision before the rollup and latest-reading backfills: the seed writes
+# raw rows there and upgrading to head derives the rest
+SEED_REVISION = "0005"
+
+SEED_SILOS = 50
+SEED_READINGS_PER_SILO = 2000  # every 30 minutes, ~6 weeks
+SEED_ALERTS_PER_SILO = 400  # every 6 hours, the newest 3 open
+SEED_SHIPMENTS = 200
+SEED_TRACKING_PER_SHIPMENT = 500
+
+SEED_STATEMENTS = (
+    "TRUNCATE silos, logistics, alerts RESTART IDENTITY CASCADE",
+    f"""
+    INSERT INTO silos (name, location, latitude, longitude, capacity_tons, max_temperature, max_humidity, status)
+    SELECT 'Test Silo ' || n, 'Zone ' || (n % 5), -34 + n * 0.01, -58 - n * 0.01, 1000 + n * 10, 30.0, 75.0,
+           CASE WHEN n % 10 = 0 THEN 'maintenance' ELSE 'active' END
+    FROM generate_series(1, {SEED_SILOS}) AS n
+    """,
+    f"""
+    INSERT INTO silo_readings (silo_id, temperature, humidity, volume_percent, volume_tons, timestamp)
+    SELECT s.id,
+           round((18 + random() * 14)::numeric, 2),
+           round((55 + random() * 25)::numeric, 2),
+           round((5 + random() * 90)::numeric, 2),
+           round((s.capacity_tons * random())::numeric, 2),
+           now() - n * interval '30 minutes'
+    FROM silos s CROSS JOIN generate_series(0, {SEED_READINGS_PER_SILO - 1}) AS n
+    """,
+    f"""
+    INSERT INTO alerts (silo_id, alert_type, severity, title, value, threshold, peak_value, last_seen,
+                        is_resolved, resolved_at, created_at)
+    SELECT s.id,
+           (ARRAY['temperature', 'humidity', 'volume'])[n % 3 + 1],
+           (ARRAY['medium', 'high', 'critical'])[(n / 3) % 3 + 1],
+           'Seeded alert', 40, 30, 40,
+           now() - n * interval '6 hours',
+           n >= 3,
+           CASE WHEN n >= 3 THEN now() - n * interval '6 hours' + interval '1 hour' END,
+           now() - n * interval '6 hours'
+    FROM silos s CROSS JOIN generate_series(0, {SEED_ALERTS_PER_SILO - 1}) AS n
+    """,
+    f"""
+    INSERT INTO logistics (truck_id, driver_name, route, origin, destination, status, cargo_weight, silo_id,
+                           created_at, updated_at)
+    SELECT 'TRK-' || n, 'Driver ' || n, 'Route ' || (n % 10), 'Origin', 'Destination',
+           (ARRAY['pending', 'in_transit', 'delivered', 'cancelled'])[n % 4 + 1],
+           20 + n % 10, n % {SEED_SILOS} + 1,
+           now() - n * interval '1 day', now() - n * interval '1 hour'
+    FROM generate_series(1, {SEED_SHIPMENTS}) AS n
+    """,
+    f"""
+    INSERT INTO logistics_tracking (logistics_id, latitude, longitude, speed, heading, timestamp)
+    SELECT l.id, -34 + random(), -58 + random(), round((random() * 90)::numeric, 2),
+           round((random() * 359)::numeric, 2), now() - n * interval '5 minutes'
+    FROM logistics l CROSS JOIN generate_series(0, {SEED_TRACKING_PER_SHIPMENT - 1}) AS n
+    """,
+)
+
+@dataclass
+class SeedData:
+    silo_id: int
+    logistics_id: UUID
+    token: str
+
+def _alembic_config() -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return config
+
+def _create_database():
+    server_url = settings.DATABASE_URL.rsplit("/", 1)[0] + "/postgres"
+    server = create_engine(server_url, isolation_level="AUTOCOMMIT")
+    try:
+        with server.connect() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": settings.POSTGRES_DB}
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{settings.POSTGRES_DB}"'))
+    finally:
+        server.dispose()
+
+    with engine.begin() as connection:
+        connection.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+
+@pytest.fixture(scope="session")
+def database() -> SeedData:
+    """Migrated and seeded test database (session wide)"""
+    try:
+        _create_database()
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e.orig}")
+
+    config = _alembic_config()
+    command.upgrade(config, "head")
+    command.downgrade(config, SEED_REVISION)
+    with engine.begin() as connection:
+        for statement in SEED_STATEMENTS:
+            connection.execute(text(statement))
+    command.upgrade(config, "head")
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("ANALYZE"))
+        silo_id = connection.execute(text("SELECT id FROM silos WHERE status = 'active' ORDER BY id LIMIT 1")).scalar()
+        logistics_id = connection.execute(text("SELECT id FROM logistics ORDER BY id LIMIT 1")).scalar()
+    engine.dispose()
+
+    return SeedData(
+        silo_id=silo_id,
+        logistics_id=logistics_id,
+        token=create_access_token(subject="admin@agrotrack.com")
+    )
+
+@pytest.fixture
+async def client(database: SeedData):
+    """HTTP client calling the app in-process as the seeded admin"""
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Authorization": f"Bearer {database.token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+        yield client
+    # Pooled asyncpg connections belong to this test's event loop
+    await async_engine.dispose()
+
+@pytest.fixture
+async def scratch_silo(database: SeedData):
+    """An empty silo (max 30 °C, 75 % humidity) deleted with its rows afterwards"""
+    from app.services.silo_registry import silo_registry
+
+    async with async_engine.begin() as connection:
+        silo_id = await connection.scalar(text(
+            "INSERT INTO silos (name, location, capacity_tons, max_temperature, max_humidity) "
+            "VALUES ('Scratch Silo', 'Test', 1000, 30, 75) RETURNING id"
+        ))
+    silo_registry.invalidate()
+    yield silo_id
+    async with async_engine.begin() as connection:
+        await connection.execute(text("DELETE FROM silos WHERE id = :silo_id"), {"silo_id": silo_id})
+    silo_registry.invalidate()
+    await async_engine.dispose()
+
+class StatementRecorder:
+    """Collects the statements the app sends through the async engine"""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, Any]] = []
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self) -> "StatementRecorder":
+        self.statements = []
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(async_engine.sync_engine, "before_cursor_execute", self._record)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+@pytest.fixture
+def recorder() -> StatementRecorder:
+    return StatementRecorder()
@@ -0,0 +1,148 @@
+"""
+Reading alert rules: the vectorized engine raises exactly what the IoT
+simulator's per-reading rules raised, boundaries included; repeat breaches
+coalesce into one open alert per key even when ingests race; and an alert is
+auto-resolved only after ALERT_AUTO_RESOLVE_SAMPLES clear readings of its type.
+"""
+from typing import List, Set, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import random
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.alert_rules import evaluate_alert_rules
+from app.services.reading_ingest import build_reading_row, insert_readings
+from app.services.silo_registry import SiloInfo
+
+SILO = SiloInfo(
+    id=1, name="Rule Silo", location="Test", latitude=None, longitude=None, capacity_tons=1000,
+    max_temperature=None, max_humidity=None, status="active", created_at=None, updated_at=None
+)
+NOW = datetime(2025, 1, 1)
+
+def simulator_alerts(temperature: float, humidity: float, volume: float) -> Set[Tuple[str, str]]:
+    """The simulator's check_and_create_alerts, reduced to (alert_type, severity)"""
+    max_temp, max_humidity = 30.0, 75.0
+    alerts = set()
+    if temperature > max_temp:
+        alerts.add(("temperature", "critical" if temperature > max_temp + 5 else "high"))
+    if humidity > max_humidity:
+        alerts.add(("humidity", "critical" if humidity > max_humidity + 10 else "high"))
+    if volume < 10:
+        alerts.add(("volume", "critical" if volume < 5 else "medium"))
+    elif volume >= 90:
+        alerts.add(("volume", "critical" if volume >= 95 else "high"))
+    elif volume >= 75:
+        alerts.add(("volume", "medium"))
+    return alerts
+
+def _row(temperature: float = 20.0, humidity: float = 50.0, volume: float = 50.0, silo_id: int = SILO.id,
+         timestamp: datetime = NOW):
+    reading = {"temperature": temperature, "humidity": humidity, "volume_percent": volume}
+    return build_reading_row(silo_id, reading, 1000, timestamp)
+
+def _raised(rows) -> List[Set[Tuple[str, str]]]:
+    alerts = evaluate_alert_rules(rows, {SILO.id: SILO})
+    by_reading = [set() for _ in rows]
+    for alert in alerts:
+        index = next(i for i, row in enumerate(rows) if row["timestamp"] == alert["last_seen"])
+        by_reading[index].add((alert["alert_type"], alert["severity"]))
+    return by_reading
+
+@pytest.mark.parametrize("temperature, expected", [
+    (30.0, set()),
+    (30.01, {("temperature", "high")}),
+    (35.0, {("temperature", "high")}),
+    (35.01, {("temperature", "critical")}),
+])
+def test_temperature_boundaries(temperature, expected):
+    assert _raised([_row(temperature=temperature)]) == [expected]
+
+@pytest.mark.parametrize("humidity, expected", [
+    (75.0, set()),
+    (75.01, {("humidity", "high")}),
+    (85.0, {("humidity", "high")}),
+    (85.01, {("humidity", "critical")}),
+])
+def test_humidity_boundaries(humidity, expected):
+    assert _raised([_row(humidity=humidity)]) == [expected]
+
+@pytest.mark.parametrize("volume, expected", [
+    (4.99, {("volume", "critical")}),
+    (5.0, {("volume", "medium")}),
+    (9.99, {("volume", "medium")}),
+    (10.0, set()),
+    (74.99, set()),
+    (75.0, {("volume", "medium")}),
+    (89.99, {("volume", "medium")}),
+    (90.0, {("volume", "high")}),
+    (94.99, {("volume", "high")}),
+    (95.0, {("volume", "critical")}),
+])
+def test_volume_boundaries(volume, expected):
+    assert _raised([_row(volume=volume)]) == [expected]
+
+def test_chunk_matches_the_simulator_rules():
+    rng = random.Random(7)
+    readings = [
+        (round(rng.uniform(15, 45), 2), round(rng.uniform(40, 95), 2), round(rng.uniform(0, 100), 2))
+        for _ in range(2000)
+    ]
+    rows = [
+        _row(temperature, humidity, volume, timestamp=NOW + timedelta(seconds=i))
+        for i, (temperature, humidity, volume) in enumerate(readings)
+    ]
+
+    assert _raised(rows) == [simulator_alerts(*reading) for reading in readings]
+
+def test_unknown_silos_raise_nothing():
+    assert evaluate_alert_rules([_row(temperature=50, silo_id=999)], {SILO.id: SILO}) == []
+
+async def _ingest(silo_id: int, timestamp: datetime, temperature: float = 20.0):
+    async with AsyncSessionLocal() as db:
+        await insert_readings(db, [_row(temperature=temperature, silo_id=silo_id, timestamp=timestamp)])
+        await db.commit()
+
+async def _open_alerts(silo_id: int):
+    async with async_engine.connect() as connection:
+        return (await connection.execute(text(
+            "SELECT alert_type, severity, occurrence_count, peak_value FROM alerts "
+            "WHERE silo_id = :silo_id AND NOT is_resolved ORDER BY alert_type, severity"
+        ), {"silo_id": silo_id})).all()
+
+async def test_concurrent_breaches_keep_one_open_alert_per_key(scratch_silo):
+    started = datetime.utcnow()
+    await asyncio.gather(*[
+        _ingest(scratch_silo, started + timedelta(seconds=i), temperature=31 + i * 0.1)
+        for i in range(20)
+    ])
+
+    [alert] = await _open_alerts(scratch_silo)
+    assert (alert.alert_type, alert.severity) == ("temperature", "high")
+    assert alert.occurrence_count == 20
+    assert float(alert.peak_value) == pytest.approx(32.9)
+
+async def test_auto_resolve_needs_consecutive_clear_readings(scratch_silo, monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_AUTO_RESOLVE_SAMPLES", 3)
+    started = datetime.utcnow()
+    steps = iter(range(100))
+
+    async def ingest(temperature: float = 20.0):
+        await _ingest(scratch_silo, started + timedelta(seconds=next(steps)), temperature)
+
+    await ingest(33)  # high
+    await ingest()
+    await ingest()
+    # A breach at another severity of the same type is not a clear reading
+    await ingest(36)  # critical
+    await ingest()
+    await ingest()
+    assert [(alert.alert_type, alert.severity) for alert in await _open_alerts(scratch_silo)] == [
+        ("temperature", "critical"), ("temperature", "high")
+    ]
+
+    await ingest()
+    assert await _open_alerts(scratch_silo) == []
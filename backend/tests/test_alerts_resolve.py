@@ -0,0 +1,84 @@
+"""
+POST /alerts/resolve resolves the matching open alerts in one statement,
+reports exactly those, and announces them in a single alerts_resolved frame.
+"""
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.reading_ingest import build_reading_row, insert_readings
+from app.services.realtime import realtime_publisher
+from app.services.websocket_manager import websocket_manager
+
+@pytest.fixture
+async def open_alerts(scratch_silo):
+    """Three open alerts on the scratch silo: temperature, humidity and volume"""
+    reading = {"temperature": 33, "humidity": 80, "volume_percent": 3}
+    async with AsyncSessionLocal() as db:
+        await insert_readings(db, [build_reading_row(scratch_silo, reading, 1000, datetime.utcnow())])
+        await db.commit()
+    async with async_engine.connect() as connection:
+        ids = (await connection.execute(
+            text("SELECT id FROM alerts WHERE silo_id = :silo_id AND NOT is_resolved"), {"silo_id": scratch_silo}
+        )).scalars().all()
+    assert len(ids) == 3
+    return ids
+
+@pytest.fixture
+async def published(monkeypatch):
+    """alerts_resolved frames the realtime publisher sends while the test runs"""
+    frames = []
+
+    async def capture(data):
+        frames.append(data)
+
+    monkeypatch.setattr(websocket_manager, "broadcast_alerts_resolved", capture)
+    realtime_publisher.start()
+    yield frames
+    await realtime_publisher.stop()
+
+async def test_resolve_reports_counts_and_publishes_once(client, scratch_silo, open_alerts, published):
+    response = await client.post("/api/v1/alerts/resolve", json={"silo_id": scratch_silo})
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert body["resolved"] == 3
+    assert sorted(body["alert_ids"]) == sorted(str(alert_id) for alert_id in open_alerts)
+    assert body["resolved_at"] is not None
+
+    await realtime_publisher.flush()
+    [frame] = published
+    assert frame["count"] == 3
+    assert sorted(frame["alert_ids"]) == sorted(body["alert_ids"])
+    assert frame["by_silo"] == {str(scratch_silo): 3}
+    assert sum(frame["by_severity"].values()) == 3
+
+    # Already resolved: nothing matches and nothing is announced
+    response = await client.post("/api/v1/alerts/resolve", json={"silo_id": scratch_silo})
+    assert response.json()["resolved"] == 0
+    await realtime_publisher.flush()
+    assert len(published) == 1
+
+async def test_resolve_combines_ids_and_filters(client, scratch_silo, open_alerts, published):
+    response = await client.post("/api/v1/alerts/resolve", json={
+        "ids": [str(alert_id) for alert_id in open_alerts],
+        "alert_type": "humidity",
+        "created_before": (datetime.utcnow() + timedelta(minutes=1)).isoformat()
+    })
+    body = response.json()
+
+    assert body["resolved"] == 1
+    async with async_engine.connect() as connection:
+        remaining = (await connection.execute(
+            text("SELECT alert_type FROM alerts WHERE silo_id = :silo_id AND NOT is_resolved ORDER BY 1"),
+            {"silo_id": scratch_silo}
+        )).scalars().all()
+    assert remaining == ["temperature", "volume"]
+
+async def test_resolve_requires_ids_or_a_filter(client, database):
+    assert (await client.post("/api/v1/alerts/resolve", json={})).status_code == 400
+
+    response = await client.post("/api/v1/alerts/resolve", json={"ids": []})
+    assert response.status_code == 200
+    assert response.json()["resolved"] == 0
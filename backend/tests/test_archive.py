@@ -0,0 +1,80 @@
+"""
+Archiving a month moves exactly the rows it writes to Parquet: a failed
+write leaves the database untouched, and the archived file holds every
+deleted row.
+"""
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import text
+
+from app.core.database import async_engine
+from app.services.archive import ReadingArchive
+
+MONTH = datetime(2020, 3, 1, tzinfo=timezone.utc)
+
+@pytest.fixture
+async def archive_silo(database):
+    """A silo with 100 readings in MONTH, removed afterwards"""
+    async with async_engine.begin() as conn:
+        silo_id = await conn.scalar(text(
+            "INSERT INTO silos (name, location, capacity_tons) VALUES ('Archive Silo', 'Test', 1000) RETURNING id"
+        ))
+        await conn.execute(text(
+            "INSERT INTO silo_readings (silo_id, temperature, humidity, volume_percent, timestamp) "
+            "SELECT :silo_id, 20, 60, 50, CAST(:month AS timestamptz) + n * interval '1 hour' FROM generate_series(0, 99) AS n"
+        ), {"silo_id": silo_id, "month": MONTH})
+    yield silo_id
+    async with async_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM silos WHERE id = :silo_id"), {"silo_id": silo_id})
+    await async_engine.dispose()
+
+async def _count_readings(silo_id: int) -> int:
+    async with async_engine.connect() as conn:
+        return await conn.scalar(
+            text("SELECT count(*) FROM silo_readings WHERE silo_id = :silo_id"), {"silo_id": silo_id}
+        )
+
+async def test_archived_rows_are_the_deleted_rows(archive_silo, tmp_path):
+    archive = ReadingArchive(root=tmp_path)
+
+    async with async_engine.connect() as conn:
+        await archive._archive_month(conn, archive_silo, MONTH)
+
+    assert await _count_readings(archive_silo) == 0
+    archived = archive.read_newest(archive_silo, 1000)
+    assert len(archived) == 100
+    assert archive.archived_rows == 100
+
+async def test_failed_write_keeps_the_rows(archive_silo, tmp_path, monkeypatch):
+    archive = ReadingArchive(root=tmp_path)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive, "_write_month", fail)
+    async with async_engine.connect() as conn:
+        with pytest.raises(OSError):
+            await archive._archive_month(conn, archive_silo, MONTH)
+
+    assert await _count_readings(archive_silo) == 100
+    assert not archive.month_path(archive_silo, MONTH).exists()
+
+async def test_archived_months_come_from_the_index(archive_silo, tmp_path, monkeypatch):
+    archive = ReadingArchive(root=tmp_path)
+    async with async_engine.connect() as conn:
+        await archive._archive_month(conn, archive_silo, MONTH)
+    assert archive.covers(archive_silo, None)
+
+    # Another worker's process learns about the month on its next refresh
+    other = ReadingArchive(root=tmp_path)
+    assert not other.covers(archive_silo, None)
+    await other.refresh_index()
+    assert other.archived_months(archive_silo) == [MONTH]
+
+    # Lookups on request paths never scan the directory
+    def scan(*args):
+        raise AssertionError("archive directory scanned on a request path")
+
+    monkeypatch.setattr(type(tmp_path), "glob", scan)
+    assert other.covers(archive_silo, MONTH)
+    assert len(other.read_newest(archive_silo, 1000)) == 100
@@ -0,0 +1,38 @@
+"""
+Downsampling bucket sizing: epoch-aligned buckets never exceed the point
+budget, whatever the window's alignment and after rounding to a rollup.
+"""
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+
+from app.services.downsampling import _rollup_resolution, bucket_width, envelope_from_samples
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _aligned_buckets(start: datetime, end: datetime, width: int) -> int:
+    return int(end.timestamp() // width - start.timestamp() // width) + 1
+
+def test_unaligned_start_stays_within_max_points():
+    start = EPOCH + timedelta(seconds=50)
+    end = start + timedelta(seconds=1000)
+    width = bucket_width(start, end, 10)
+
+    timestamps_ms = np.arange(int(start.timestamp()), int(end.timestamp()) + 1) * 1000
+    points = envelope_from_samples(timestamps_ms, np.ones(len(timestamps_ms)), width)
+
+    assert len(points) <= 10
+    assert sum(point["count"] for point in points) == len(timestamps_ms)
+
+@pytest.mark.parametrize("max_points", [3, 10, 1500])
+@pytest.mark.parametrize("span", [timedelta(seconds=1000), timedelta(hours=7), timedelta(days=30), timedelta(days=400)])
+def test_aligned_buckets_never_exceed_max_points(max_points, span):
+    rng = np.random.default_rng(0)
+    for offset in rng.integers(0, 86400 * 7, size=50):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=int(offset), microseconds=250)
+        end = start + span
+        width = bucket_width(start, end, max_points)
+        _, rollup_width = _rollup_resolution(width)
+
+        assert _aligned_buckets(start, end, width) <= max_points
+        assert _aligned_buckets(start, end, rollup_width) <= max_points
@@ -0,0 +1,64 @@
+"""
+Write-behind buffer flush failures, without a database: a transient error is
+retried, a persistent one falls back to row-by-row writes that only lose the
+bad rows, and last_flushed_sequence never passes an unwritten row.
+"""
+from typing import Any, Dict, List
+
+from app.services.ingest_buffer import ReadingIngestBuffer
+
+def _buffer(monkeypatch, write) -> ReadingIngestBuffer:
+    buffer = ReadingIngestBuffer(name="test", flush_retries=2, retry_backoff_ms=1)
+    monkeypatch.setattr(buffer, "_write", write)
+    return buffer
+
+def _batch(count: int):
+    return [(sequence, {"silo_id": sequence}) for sequence in range(1, count + 1)]
+
+async def test_transient_failure_is_retried(monkeypatch):
+    calls: List[int] = []
+
+    async def write(rows: List[Dict[str, Any]]):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise ConnectionError("connection reset")
+
+    buffer = _buffer(monkeypatch, write)
+    await buffer._flush(_batch(5))
+
+    assert calls == [5, 5]
+    assert buffer.retried_flushes == 1
+    assert buffer.flushed_rows == 5
+    assert buffer.failed_rows == 0
+    assert buffer.last_flushed_sequence == 5
+
+async def test_persistent_failure_writes_rows_one_by_one(monkeypatch):
+    written: List[int] = []
+
+    async def write(rows: List[Dict[str, Any]]):
+        if any(row["silo_id"] == 3 for row in rows):
+            raise ValueError("bad row")
+        written.extend(row["silo_id"] for row in rows)
+
+    buffer = _buffer(monkeypatch, write)
+    await buffer._flush(_batch(5))
+
+    assert written == [1, 2, 4, 5]
+    assert buffer.retried_flushes == 2
+    assert buffer.flushed_rows == 4
+    assert buffer.failed_rows == 1
+    assert buffer.last_failed_sequence == 3
+    assert buffer.last_flushed_sequence == 5
+
+async def test_sequence_does_not_advance_past_unwritten_rows(monkeypatch):
+    async def write(rows: List[Dict[str, Any]]):
+        if any(row["silo_id"] > 3 for row in rows):
+            raise ValueError("bad row")
+
+    buffer = _buffer(monkeypatch, write)
+    await buffer._flush(_batch(3))
+    await buffer._flush([(4, {"silo_id": 4}), (5, {"silo_id": 5})])
+
+    assert buffer.last_flushed_sequence == 3
+    assert buffer.failed_rows == 2
+    assert buffer.last_failed_sequence == 5
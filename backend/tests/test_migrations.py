@@ -0,0 +1,86 @@
+"""
+A database built by one straight `alembic upgrade head` carries the indexes
+the models declare, with the same definitions, and no duplicates. The shared
+database fixture downgrades and upgrades again, which can mask indexes that
+only a re-run creates, so this migrates a scratch database of its own.
+"""
+from collections import Counter
+import re
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import Index, create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.database import Base
+from tests.conftest import _alembic_config
+
+SCRATCH_DB = f"{settings.POSTGRES_DB}_migrations"
+
+@pytest.fixture(scope="module")
+def migrated_engine():
+    """Fresh scratch database upgraded straight to head"""
+    server_url = settings.DATABASE_URL.rsplit("/", 1)[0]
+    server = create_engine(f"{server_url}/postgres", isolation_level="AUTOCOMMIT")
+    try:
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"'))
+            connection.execute(text(f'CREATE DATABASE "{SCRATCH_DB}"'))
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e.orig}")
+
+    engine = create_engine(f"{server_url}/{SCRATCH_DB}")
+    with engine.begin() as connection:
+        connection.execute(text('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"'))
+    config = _alembic_config()
+    config.set_main_option("sqlalchemy.url", f"{server_url}/{SCRATCH_DB}".replace("%", "%%"))
+    command.upgrade(config, "head")
+
+    yield engine
+
+    engine.dispose()
+    with server.connect() as connection:
+        connection.execute(text(f'DROP DATABASE IF EXISTS "{SCRATCH_DB}"'))
+    server.dispose()
+
+def _index_diffs(diffs):
+    for diff in diffs:
+        # Column changes come as lists of operations, index changes as tuples
+        if isinstance(diff, tuple) and diff[0] in ("add_index", "remove_index"):
+            yield diff[0], diff[1].name
+
+def test_model_indexes_match_the_migrated_schema(migrated_engine):
+    declared = {
+        index.name
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+        # Column(index=True) indexes, e.g. users.email, are unique
+        # constraints in 0001 rather than indexes
+        if isinstance(index, Index) and index.name and not index._column_flag
+    }
+    with migrated_engine.connect() as connection:
+        diffs = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+
+    # A changed definition shows up as a remove and an add of the same name
+    assert [diff for diff in _index_diffs(diffs) if diff[1] in declared] == []
+
+def test_alerts_created_at_index_is_composite(migrated_engine):
+    with migrated_engine.connect() as connection:
+        definition = connection.execute(
+            text("SELECT indexdef FROM pg_indexes WHERE indexname = 'idx_alerts_created_at'")
+        ).scalar()
+    assert definition.endswith("(created_at DESC, id DESC)")
+
+def test_no_duplicate_indexes(migrated_engine):
+    with migrated_engine.connect() as connection:
+        definitions = connection.execute(
+            text("SELECT tablename, indexdef FROM pg_indexes WHERE schemaname = 'public'")
+        ).all()
+    # Same table, method, columns and predicate under different names
+    shapes = Counter(
+        (table, re.sub(r"^CREATE (UNIQUE )?INDEX \S+ ON ", "", definition))
+        for table, definition in definitions
+    )
+    assert [shape for shape, count in shapes.items() if count > 1] == []
@@ -0,0 +1,71 @@
+"""
+MQTT ingest worker resilience, without a broker: a failing message is
+skipped, a full message queue drops instead of growing, and a crashing
+connection loop restarts and reports itself disconnected meanwhile.
+"""
+import asyncio
+
+from app.core.config import settings
+from app.services import mqtt_ingest
+from app.services.mqtt_ingest import MQTTIngestWorker
+
+async def test_failed_message_does_not_stop_the_handler(monkeypatch):
+    worker = MQTTIngestWorker(message_queue_size=10)
+    handled = []
+
+    async def handle_message(topic, payload):
+        if payload == b"boom":
+            raise RuntimeError("boom")
+        handled.append(payload)
+
+    monkeypatch.setattr(worker, "_handle_message", handle_message)
+    handler = asyncio.create_task(worker._handle_messages())
+    try:
+        for payload in (b"1", b"boom", b"2"):
+            worker._enqueue("agrotrack/silos/1/readings", payload)
+        await asyncio.sleep(0.01)
+    finally:
+        handler.cancel()
+
+    assert handled == [b"1", b"2"]
+    assert worker.failed_messages == 1
+    assert worker.messages_received == 3
+
+async def test_full_message_queue_drops_and_counts():
+    worker = MQTTIngestWorker(message_queue_size=5)
+
+    for i in range(8):
+        worker._enqueue("agrotrack/silos/1/readings", str(i).encode())
+
+    stats = worker.stats()
+    assert stats["queued_messages"] == 5
+    assert stats["dropped_messages"] == 3
+    assert stats["messages_received"] == 8
+
+async def test_connection_loop_restarts_after_unexpected_errors(monkeypatch):
+    attempts = 0
+
+    class BrokenClient:
+        def __init__(self, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            nonlocal attempts
+            attempts += 1
+            raise RuntimeError("unexpected")
+
+        async def __aexit__(self, *exc):
+            pass
+
+    monkeypatch.setattr(mqtt_ingest, "Client", BrokenClient)
+    monkeypatch.setattr(settings, "MQTT_RECONNECT_INTERVAL_SECONDS", 0)
+    worker = MQTTIngestWorker()
+    task = asyncio.create_task(worker._run())
+    try:
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        assert attempts > 1
+        assert worker.reconnects >= attempts - 1
+        assert worker.stats()["connected"] is False
+    finally:
+        task.cancel()
@@ -0,0 +1,59 @@
+"""
+Keyset cursors: tokens round-trip, malformed ones are a 400, and paging
+through readings that share a timestamp visits every row exactly once in
+(timestamp, id) order, even when newer rows arrive between pages.
+"""
+from datetime import datetime, timezone
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.core.database import async_engine
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+TIED = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+def test_cursor_round_trip():
+    timestamp = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    assert decode_cursor(encode_cursor(timestamp, row_id)) == (timestamp, row_id)
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(TIED, "not-a-uuid"), "WzFd"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+async def _insert_readings(silo_id: int, count: int, timestamp: datetime):
+    async with async_engine.begin() as connection:
+        await connection.execute(text(
+            "INSERT INTO silo_readings (silo_id, temperature, humidity, volume_percent, timestamp) "
+            "SELECT :silo_id, 20, 60, 50, :timestamp FROM generate_series(1, :count)"
+        ), {"silo_id": silo_id, "timestamp": timestamp, "count": count})
+
+async def test_pages_are_stable_when_timestamps_tie(client, scratch_silo):
+    await _insert_readings(scratch_silo, 25, TIED)
+    path = f"/api/v1/silos/{scratch_silo}/readings"
+
+    pages = []
+    params = {"limit": 10}
+    while True:
+        response = await client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        if len(pages) == 1:
+            # Newer rows arriving mid-walk must not shift the later pages
+            await _insert_readings(scratch_silo, 5, datetime.now(timezone.utc))
+        params = {"limit": 10, "cursor": cursor}
+
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert len({row["id"] for row in rows}) == 25
+    assert all(datetime.fromisoformat(row["timestamp"]) == TIED for row in rows)
+    # Ties are broken by id, descending, so the order is total
+    assert [row["id"] for row in rows] == sorted((row["id"] for row in rows), reverse=True)
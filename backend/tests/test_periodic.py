@@ -0,0 +1,40 @@
+"""
+The shared background loop: a failing run is counted and the loop keeps
+going, and stop() ends it.
+"""
+import asyncio
+
+from app.services.periodic import PeriodicTask
+
+async def test_failing_run_does_not_stop_the_loop():
+    runs = 0
+
+    async def run():
+        nonlocal runs
+        runs += 1
+        if runs == 1:
+            raise RuntimeError("boom")
+
+    loop = PeriodicTask("Test job", run, interval=0.001)
+    loop.start()
+    await asyncio.sleep(0.05)
+    await loop.stop()
+
+    assert runs > 2
+    assert loop.failures == 1
+    assert not loop.running
+
+async def test_delay_first_waits_one_interval():
+    runs = 0
+
+    async def run():
+        nonlocal runs
+        runs += 1
+
+    loop = PeriodicTask("Test job", run, interval=10, delay_first=True)
+    loop.start()
+    await asyncio.sleep(0.01)
+    assert loop.running
+    await loop.stop()
+
+    assert runs == 0
@@ -0,0 +1,87 @@
+"""
+Every read endpoint's queries must be served by an index on the large
+tables. Each endpoint is called against the seeded database, the statements
+it sent are replayed under EXPLAIN, and the test fails if a plan reads one
+of the hot tables with a sequential scan.
+"""
+from typing import Any, Dict, Iterator, List
+from datetime import datetime, timedelta
+import json
+import pytest
+
+from app.core.database import async_engine
+from app.services.kpi_snapshot import kpi_snapshot
+
+# Tables that grow with readings, alerts or tracking points; silos, users,
+# logistics and silo_latest_reading stay small enough to scan
+HOT_TABLES = ("silo_readings", "silo_reading_rollups", "alerts", "logistics_tracking")
+
+def _ago(**delta) -> str:
+    return (datetime.utcnow() - timedelta(**delta)).isoformat()
+
+ENDPOINTS = [
+    ("/api/v1/silos/", {}),
+    ("/api/v1/silos/{silo_id}", {}),
+    ("/api/v1/silos/{silo_id}/readings", {}),
+    ("/api/v1/silos/{silo_id}/readings", {"start_date": _ago(days=2)}),
+    ("/api/v1/silos/{silo_id}/readings/downsampled", {}),
+    ("/api/v1/silos/{silo_id}/readings/downsampled", {"start_date": _ago(days=30), "method": "envelope"}),
+    ("/api/v1/silos/{silo_id}/readings/export", {}),
+    ("/api/v1/silos/readings/export", {"silo_ids": "{silo_id}", "format": "ndjson"}),
+    ("/api/v1/alerts/", {}),
+    ("/api/v1/alerts/", {"is_resolved": "false"}),
+    ("/api/v1/alerts/", {"is_resolved": "false", "severity": "critical"}),
+    ("/api/v1/alerts/silo/{silo_id}", {}),
+    ("/api/v1/logistics/", {}),
+    ("/api/v1/logistics/{logistics_id}", {}),
+    ("/api/v1/logistics/{logistics_id}/tracking", {}),
+    ("/api/v1/dashboard/trends", {}),
+    ("/api/v1/dashboard/silo-status", {}),
+    ("/api/v1/dashboard/recent-activity", {}),
+]
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+def _is_hot(relation: str) -> bool:
+    # Readings partitions are named silo_readings_*
+    return any(relation == table or relation.startswith(f"{table}_") for table in HOT_TABLES)
+
+async def _sequential_scans(statements) -> List[str]:
+    """Hot-table sequential scans in the plans of the recorded SELECTs"""
+    found = []
+    async with async_engine.connect() as connection:
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                continue
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            for node in _plan_nodes(plan[0]["Plan"]):
+                relation = node.get("Relation Name", "")
+                if "Seq Scan" in node["Node Type"] and _is_hot(relation):
+                    found.append(f"{relation}: {' '.join(statement.split())}")
+    return found
+
+@pytest.mark.parametrize("path, params", ENDPOINTS)
+async def test_endpoint_queries_use_indexes(client, database, recorder, path, params):
+    seed = {"silo_id": database.silo_id, "logistics_id": database.logistics_id}
+    with recorder:
+        response = await client.get(
+            path.format(**seed),
+            params={name: value.format(**seed) for name, value in params.items()}
+        )
+    assert response.status_code == 200, response.text
+    assert len(recorder), "endpoint sent no statements"
+
+    assert await _sequential_scans(recorder.statements) == []
+
+async def test_kpi_snapshot_queries_use_indexes(client, recorder):
+    with recorder:
+        await kpi_snapshot.refresh()
+    assert len(recorder)
+
+    assert await _sequential_scans(recorder.statements) == []
@@ -0,0 +1,41 @@
+"""
+Listing silos costs a fixed number of statements however many silos the
+page holds, and a single silo goes through the same code path.
+"""
+from app.services.recent_readings import recent_readings
+
+async def _count_statements(client, recorder, path: str, **params) -> int:
+    with recorder:
+        response = await client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    return len(recorder)
+
+async def test_silo_list_query_count_is_constant(client, recorder):
+    assert not recent_readings.ready, "the in-memory path sends no statements"
+    await client.get("/api/v1/silos/", params={"limit": 1})
+
+    one = await _count_statements(client, recorder, "/api/v1/silos/", limit=1)
+    few = await _count_statements(client, recorder, "/api/v1/silos/", limit=5)
+    many = await _count_statements(client, recorder, "/api/v1/silos/", limit=50)
+
+    assert one == few == many
+    # Authentication, silos with their latest reading, 24 h rollup stats
+    assert many <= 3
+
+async def test_single_silo_shares_the_list_query_count(client, database, recorder):
+    await client.get(f"/api/v1/silos/{database.silo_id}")
+
+    single = await _count_statements(client, recorder, f"/api/v1/silos/{database.silo_id}")
+    listed = await _count_statements(client, recorder, "/api/v1/silos/", limit=50)
+
+    assert single == listed
+
+async def test_silo_list_returns_every_seeded_silo(client):
+    response = await client.get("/api/v1/silos/", params={"limit": 500})
+    assert response.status_code == 200
+
+    silos = response.json()
+    assert len(silos) == 50
+    # Filled by the latest-reading backfill, not by ingest
+    assert all(silo["latest_reading"] is not None for silo in silos)
+    assert all(silo["readings_count"] > 0 for silo in silos)
@@ -0,0 +1,55 @@
+"""
+Silo registry loading, without a database: concurrent cold reads share one
+query, and a load overtaken by invalidate() never publishes its rows.
+"""
+from types import SimpleNamespace
+import asyncio
+
+from app.services.silo_registry import SiloRegistry
+
+def _silo(silo_id: int, name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=silo_id, name=name, location="Test", latitude=None, longitude=None, capacity_tons=1000,
+        max_temperature=None, max_humidity=None, status="active", created_at=None, updated_at=None
+    )
+
+class FakeSession:
+    """Answers the registry's SELECT with the current rows once released"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.release = asyncio.Event()
+
+    async def execute(self, statement):
+        self.queries += 1
+        rows = list(self.rows)
+        await self.release.wait()
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+async def test_concurrent_cold_reads_share_one_query():
+    registry = SiloRegistry(ttl_seconds=60)
+    db = FakeSession([_silo(1, "A"), _silo(2, "B")])
+
+    readers = asyncio.gather(*[registry.get(db, 1) for _ in range(20)])
+    await asyncio.sleep(0)
+    db.release.set()
+    silos = await readers
+
+    assert db.queries == 1
+    assert {silo.name for silo in silos} == {"A"}
+
+async def test_load_overtaken_by_invalidate_is_discarded():
+    registry = SiloRegistry(ttl_seconds=60)
+    db = FakeSession([_silo(1, "Old name")])
+
+    reader = asyncio.create_task(registry.get(db, 1))
+    await asyncio.sleep(0)
+    # A silo update commits and invalidates while the first query runs
+    db.rows = [_silo(1, "New name")]
+    registry.invalidate()
+    db.release.set()
+    silo = await reader
+
+    assert db.queries == 2
+    assert silo.name == "New name"
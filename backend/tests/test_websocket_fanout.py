@@ -0,0 +1,168 @@
+"""
+WebSocket fan-out to 10k simulated clients: publishing never waits on a
+socket, and a stalled client neither delays the others nor grows without
+bound. Fan-out latencies are printed (run with -s to see them).
+"""
+from typing import List, Optional
+import asyncio
+import json
+import time
+import pytest
+
+from app.services.websocket_manager import WebSocketManager
+
+CLIENTS = 10_000
+
+class FakeWebSocket:
+    """Records delivery times; a stalled socket never completes a send"""
+
+    def __init__(self, stalled: bool = False):
+        self.stalled = stalled
+        self.received: List[float] = []
+        self.closed_with: Optional[int] = None
+        self.delivered = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.stalled:
+            await asyncio.Event().wait()
+        await asyncio.sleep(0)
+        self.received.append(time.perf_counter())
+        self.delivered.set()
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+async def _connect(manager: WebSocketManager, count: int, stalled: int = 0) -> List[FakeWebSocket]:
+    sockets = [FakeWebSocket(stalled=i < stalled) for i in range(count)]
+    for websocket in sockets:
+        await manager.connect(websocket)
+    return sockets
+
+def _percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[max(int(len(values) * fraction) - 1, 0)]
+
+@pytest.fixture
+async def manager():
+    manager = WebSocketManager(queue_size=16, overflow_policy="drop_oldest")
+    yield manager
+    await manager.close_all()
+
+async def test_fanout_to_10k_clients(manager):
+    sockets = await _connect(manager, CLIENTS, stalled=100)
+    healthy = sockets[100:]
+
+    started = time.perf_counter()
+    await manager.broadcast_silo_update(1, {"reading": {"timestamp": "2025-01-01T00:00:00"}, "samples": 1})
+    enqueued = time.perf_counter() - started
+    await asyncio.wait_for(asyncio.gather(*[ws.delivered.wait() for ws in healthy]), timeout=30)
+
+    latencies = [ws.received[0] - started for ws in healthy]
+    print(
+        f"\n{CLIENTS} clients (100 stalled): publish {enqueued * 1000:.1f} ms, "
+        f"delivery p50 {_percentile(latencies, 0.5) * 1000:.1f} ms, "
+        f"p99 {_percentile(latencies, 0.99) * 1000:.1f} ms, "
+        f"max {max(latencies) * 1000:.1f} ms"
+    )
+
+    # Publishing only enqueues, it never awaits a socket
+    assert enqueued < 2.0
+    assert all(len(ws.received) == 1 for ws in healthy)
+    assert all(not ws.received for ws in sockets[:100])
+
+async def test_stalled_client_queue_stays_bounded(manager):
+    stalled, fast = await _connect(manager, 2, stalled=1)
+
+    for i in range(200):
+        await manager.broadcast({"type": "tick", "n": i})
+        # Give the fast writer its turn
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.05)
+
+    assert len(fast.received) == 200
+    client = manager.connections[stalled]
+    # The first message is stuck in send_text, the queue holds the newest
+    assert len(client.queue) <= manager.queue_size
+    assert client.dropped >= 200 - manager.queue_size - 1
+    assert json.loads(client.queue[-1][1])["n"] == 199
+
+async def test_disconnect_policy_drops_slow_clients():
+    manager = WebSocketManager(queue_size=4, overflow_policy="disconnect")
+    stalled, fast = await _connect(manager, 2, stalled=1)
+    try:
+        for i in range(10):
+            await manager.broadcast({"type": "tick", "n": i})
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.05)
+
+        # Closed without waiting for its stuck send to time out
+        assert manager.connections[stalled].closing
+        assert not manager.connections[fast].closing
+        assert len(fast.received) == 10
+    finally:
+        await manager.close_all()
+
+async def test_coalesce_policy_merges_deltas_on_overflow():
+    manager = WebSocketManager(queue_size=4, overflow_policy="coalesce")
+    stalled, _ = await _connect(manager, 2, stalled=1)
+    try:
+        for i in range(50):
+            changes = {"status": "maintenance"} if i == 10 else {}
+            await manager.broadcast_silo_update(1, {
+                "reading": {"timestamp": f"2025-01-01T00:00:{i:02d}"}, "samples": 1, "changes": changes
+            })
+        client = manager.connections[stalled]
+        queued = [json.loads(entry[1]) for entry in client.queue]
+
+        # Updates fill the queue, later ones are folded into the newest
+        # queued update, losing nothing
+        assert len(queued) == manager.queue_size
+        assert client.dropped == 0
+        assert sum(message["data"]["samples"] for message in queued) == 50
+        assert queued[-1]["data"]["changes"] == {"status": "maintenance"}
+        assert queued[-1]["data"]["reading"]["timestamp"] == "2025-01-01T00:00:49"
+        assert queued[-1]["timestamp"] == "2025-01-01T00:00:49"
+    finally:
+        await manager.close_all()
+
+async def test_coalesce_policy_keeps_every_message_below_the_limit():
+    manager = WebSocketManager(queue_size=4, overflow_policy="coalesce")
+    stalled, _ = await _connect(manager, 2, stalled=1)
+    try:
+        for i in range(4):
+            await manager.broadcast_silo_update(1, {"reading": None, "samples": i, "changes": {}})
+        client = manager.connections[stalled]
+
+        assert [json.loads(entry[1])["data"]["samples"] for entry in client.queue] == [0, 1, 2, 3]
+    finally:
+        await manager.close_all()
+
+async def test_disconnect_is_constant_time(manager):
+    sockets = await _connect(manager, CLIENTS)
+
+    started = time.perf_counter()
+    for websocket in sockets:
+        manager.disconnect(websocket)
+    elapsed = time.perf_counter() - started
+    print(f"\n{CLIENTS} disconnects: {elapsed * 1000:.1f} ms")
+
+    assert not manager.connections
+    assert not manager.subscribers
+    await asyncio.sleep(0)
+
+async def test_endpoint_unregisters_client_on_errors():
+    from app.main import websocket_endpoint
+    from app.services.websocket_manager import websocket_manager
+
+    class ClosedWebSocket(FakeWebSocket):
+        async def receive_text(self):
+            raise RuntimeError('Cannot call "receive" once a close message has been sent.')
+
+    websocket = ClosedWebSocket()
+    with pytest.raises(RuntimeError):
+        await websocket_endpoint(websocket)
+
+    assert websocket not in websocket_manager.connections
@@ -202,104 +202,6 @@ class AgroTrackIoTSimulator:
             print(f"❌ Error sending reading for Silo {silo_id}: {e}")
             return False
 
-    async def check_and_create_alerts(self, reading: Dict, silo_id: int):
-        """Check conditions and create alerts if necessary"""
-        if not self.auth_token:
-            return
-            
-        headers = {
-            "Authorization": f"Bearer {self.auth_token}",
-            "Content-Type": "application/json"
-        }
-        
-        # Get silo info for thresholds
-        silo_info = next((s for s in self.silos if s['id'] == silo_id), None)
-        if not silo_info:
-            return
-        
-        max_temp = float(silo_info.get('max_temperature', 30.0))
-        max_humidity = float(silo_info.get('max_humidity', 75.0))
-        
-        alerts_to_create = []
-        
-        # Temperature alert
-        if reading['temperature'] > max_temp:
-            severity = "critical" if reading['temperature'] > max_temp + 5 else "high"
-            alerts_to_create.append({
-                "silo_id": silo_id,
-                "alert_type": "temperature",
-                "severity": severity,
-                "title": f"High Temperature in {silo_info['name']}",
-                "description": f"Temperature {reading['temperature']}°C exceeds threshold {max_temp}°C",
-                "value": reading['temperature'],
-                "threshold": max_temp
-            })
-        
-        # Humidity alert
-        if reading['humidity'] > max_humidity:
-            severity = "critical" if reading['humidity'] > max_humidity + 10 else "high"
-            alerts_to_create.append({
-                "silo_id": silo_id,
-                "alert_type": "humidity",
-                "severity": severity,
-                "title": f"High Humidity in {silo_info['name']}",
-                "description": f"Humidity {reading['humidity']}% exceeds threshold {max_humidity}%",
-                "value": reading['humidity'],
-                "threshold": max_humidity
-            })
-        
-        # Volume alerts - both low and high capacity
-        if reading['volume_percent'] < 10:
-            # Low volume alert (empty silo)
-            severity = "critical" if reading['volume_percent'] < 5 else "medium"
-            alerts_to_create.append({
-                "silo_id": silo_id,
-                "alert_type": "volume",
-                "severity": severity,
-                "title": f"Low Volume in {silo_info['name']}",
-                "description": f"Volume {reading['volume_percent']}% is critically low - refill needed",
-                "value": reading['volume_percent'],
-                "threshold": 10.0
-            })
-        elif reading['volume_percent'] >= 90:
-            # High volume alert (full silo)
-            severity = "critical" if reading['volume_percent'] >= 95 else "high"
-            alerts_to_create.append({
-                "silo_id": silo_id,
-                "alert_type": "volume",
-                "severity": severity,
-                "title": f"High Capacity in {silo_info['name']}",
-                "description": f"Volume {reading['volume_percent']}% is very high - shipment needed",
-                "value": reading['volume_percent'],
-                "threshold": 90.0
-            })
-        elif reading['volume_percent'] >= 75:
-            # Medium-high volume alert (getting full)
-            alerts_to_create.append({
-                "silo_id": silo_id,
-                "alert_type": "volume",
-                "severity": "medium",
-                "title": f"High Capacity Warning in {silo_info['name']}",
-                "description": f"Volume {reading['volume_percent']}% is getting high - plan shipments",
-                "value": reading['volume_percent'],
-                "threshold": 75.0
-            })
-        
-        # Send alerts
-        for alert in alerts_to_create:
-            try:
-                response = requests.post(
-                    f"{self.base_url}/alerts",
-                    json=alert,
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    print(f"🚨 Alert created: {alert['title']} ({alert['severity']})")
-                
-            except Exception as e:
-                print(f"❌ Error creating alert: {e}")
-
     async def simulate_reading_cycle(self):
         """Simulate one cycle of readings for all silos"""
         if not self.silos:
@@ -312,13 +214,8 @@ class AgroTrackIoTSimulator:
             if silo['status'] == 'active':
                 reading = self.generate_realistic_reading(silo['id'])
                 
-                # Send reading
-                reading_copy = reading.copy()  # Make a copy since send_reading modifies it
-                success = await self.send_reading(reading)
-                
-                if success:
-                    # Check for alerts
-                    await self.check_and_create_alerts(reading_copy, silo['id'])
+                # Send reading (the backend evaluates alert rules on ingest)
+                await self.send_reading(reading)
                 
                 # Small delay between readings
                 await asyncio.sleep(0.5)